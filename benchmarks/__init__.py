@@ -0,0 +1 @@
+"""Benchmarks for the QwikSwitch API client library."""
@@ -0,0 +1,247 @@
+"""
+Benchmark QSClient end to end against a local stand-in for the QwikSwitch API.
+
+Measures serial and parallel control throughput, status polling latency and the cost
+of parsing status responses, for each requested device count.  The stand-in server
+adds a configurable latency and error rate to every request.
+
+Run with ``python -m benchmarks.bench_client``; pass ``--output results.json`` to save
+results for comparison across versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from importlib import metadata
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.entities import DeviceStatuses
+from qwikswitchapi.exceptions import QSError
+from qwikswitchapi.testing import MockQSServer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+DEVICE_COUNTS = (10, 100, 1000)
+
+
+def package_version() -> str:
+    """Return the installed version of qwikswitch-api, if known."""
+    try:
+        return metadata.version("qwikswitch_api")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def percentiles(samples: Sequence[float]) -> dict[str, float]:
+    """Summarize latencies in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    cuts = statistics.quantiles(ordered, n=100) if len(ordered) > 1 else ordered * 99
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+        "p50_ms": cuts[49] * 1e3,
+        "p95_ms": cuts[94] * 1e3,
+        "p99_ms": cuts[98] * 1e3,
+        "max_ms": ordered[-1] * 1e3,
+    }
+
+
+def timed_calls(call: Callable[[], object], count: int) -> tuple[list[float], int]:
+    """Make ``count`` calls, returning the latency of each and the number of failures."""
+    latencies = []
+    errors = 0
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            call()
+        except QSError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def authenticate(client: QSClient, attempts: int = 10) -> None:
+    """Generate API keys up front, so that no measured call includes authentication."""
+    for attempt in range(attempts):
+        try:
+            client.generate_api_keys()
+        except QSError:
+            if attempt == attempts - 1:
+                raise
+        else:
+            return
+
+
+def bench_serial_control(
+    client: QSClient, device_ids: list[str], count: int
+) -> dict[str, Any]:
+    """Control devices one after another."""
+    levels = iter(range(count))
+
+    def control() -> None:
+        level = next(levels)
+        client.control_device(device_ids[level % len(device_ids)], level % 101)
+
+    start = time.perf_counter()
+    latencies, errors = timed_calls(control, count)
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": (count - errors) / elapsed,
+        **percentiles(latencies),
+    }
+
+
+def bench_parallel_control(
+    client: QSClient, device_ids: list[str], count: int, workers: int
+) -> dict[str, Any]:
+    """Issue ``count`` control requests from one pool of ``workers`` threads."""
+
+    def control(level: int) -> bool:
+        try:
+            client.control_device(device_ids[level % len(device_ids)], level % 101)
+        except QSError:
+            return False
+        return True
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = list(executor.map(control, range(count)))
+    elapsed = time.perf_counter() - start
+    errors = outcomes.count(False)
+    return {
+        "requests": count,
+        "errors": errors,
+        "workers": workers,
+        "throughput_rps": (count - errors) / elapsed,
+    }
+
+
+def bench_polling(client: QSClient, count: int) -> dict[str, Any]:
+    """Poll get_all_device_status repeatedly."""
+    latencies, errors = timed_calls(client.get_all_device_status, count)
+    return {"requests": count, "errors": errors, **percentiles(latencies)}
+
+
+def bench_parse(server: MockQSServer) -> dict[str, float]:
+    """Time parsing of the server's status response, without the network."""
+    content = json.dumps({"success": True, **server.devices}).encode()
+    resp = SimpleNamespace(
+        status_code=200,
+        content=content,
+        text=content.decode(),
+        json=lambda: json.loads(content),
+    )
+    number = max(10, 20_000 // max(len(server.devices), 1))
+    results = {"response_bytes": len(content)}
+    for name, lazy in (("eager", False), ("lazy", True)):
+        best = min(
+            timeit.repeat(
+                lambda lazy=lazy: DeviceStatuses.from_resp(resp, lazy=lazy),
+                number=number,
+                repeat=5,
+            )
+        )
+        results[f"{name}_us"] = best / number * 1e6
+    return results
+
+
+def run(  # noqa: PLR0913
+    device_counts: Sequence[int] = DEVICE_COUNTS,
+    *,
+    latency: float = 0.005,
+    error_rate: float = 0.0,
+    requests: int = 200,
+    workers: int = 8,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run every benchmark, returning the results and the configuration used."""
+    results = {}
+    for device_count in device_counts:
+        server = MockQSServer(
+            device_count=device_count, latency=latency, error_rate=error_rate, seed=seed
+        )
+        with server, QSClient("email", "master", server.base_uri) as client:
+            device_ids = list(server.devices)
+            authenticate(client)
+            results[str(device_count)] = {
+                "serial_control": bench_serial_control(client, device_ids, requests),
+                "parallel_control": bench_parallel_control(
+                    client, device_ids, requests, workers
+                ),
+                "polling": bench_polling(client, max(requests // 10, 10)),
+                "parse": bench_parse(server),
+            }
+    return {
+        "version": package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "config": {
+            "device_counts": list(device_counts),
+            "latency": latency,
+            "error_rate": error_rate,
+            "requests": requests,
+            "workers": workers,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the benchmarks, printing a summary and optionally saving JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=list(DEVICE_COUNTS))
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.devices,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        requests=args.requests,
+        workers=args.workers,
+        seed=args.seed,
+    )
+
+    print(
+        f"{'devices':>8}{'serial rps':>12}{'parallel rps':>14}"
+        f"{'poll p50 ms':>13}{'poll p95 ms':>13}{'parse us':>12}"
+    )
+    for count, result in report["results"].items():
+        print(
+            f"{count:>8}"
+            f"{result['serial_control']['throughput_rps']:>12.1f}"
+            f"{result['parallel_control']['throughput_rps']:>14.1f}"
+            f"{result['polling'].get('p50_ms', 0):>13.2f}"
+            f"{result['polling'].get('p95_ms', 0):>13.2f}"
+            f"{result['parse']['eager_us']:>12.1f}"
+        )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
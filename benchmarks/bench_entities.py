@@ -0,0 +1,97 @@
+"""
+Benchmark memory use and construction time of the entities.
+
+Compares the slotted DeviceStatus with the previous ``__dict__``-backed layout.
+
+Run with ``python -m benchmarks.bench_entities``.
+"""
+
+from __future__ import annotations
+
+import gc
+import timeit
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from qwikswitchapi.entities import DeviceStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+INSTANCES = 50_000
+
+
+class DictDeviceStatus:
+    """The ``__dict__``-backed DeviceStatus layout, before slots were introduced."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        device_id: str,
+        device_type: str,
+        firmware: str,
+        *,
+        epoch: int,
+        rssi: int,
+        value: int,
+    ) -> None:
+        """Initialize the status."""
+        self._device_id = device_id
+        self._device_type = device_type
+        self._firmware = firmware
+        self._epoch = epoch
+        self._rssi = rssi
+        self._value = value
+
+
+def _args(i: int) -> tuple[tuple, dict]:
+    # Both layouts are called the same way, so the keywords cost them equally.
+    args = (f"@{i:06x}", "RELAY QS-D-S5", "v3.3")
+    return args, {"epoch": 1736018165 + i, "rssi": 59, "value": i % 101}
+
+
+def bytes_per_instance(factory: Callable[..., object]) -> float:
+    """Measure the memory allocated per instance, excluding the shared argument values."""
+    args = [_args(i) for i in range(INSTANCES)]
+    gc.collect()
+    tracemalloc.start()
+    instances = [factory(*a, **kw) for a, kw in args]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size / INSTANCES
+
+
+def construction_ns(factory: Callable[..., object]) -> float:
+    """Measure the time taken to construct one instance, in nanoseconds."""
+    args, kwargs = _args(1)
+    number = 200_000
+    best = min(timeit.repeat(lambda: factory(*args, **kwargs), number=number, repeat=5))
+    return best / number * 1e9
+
+
+def run() -> dict[str, dict[str, float]]:
+    """Run the benchmark, returning the results per layout."""
+    return {
+        name: {
+            "bytes_per_instance": bytes_per_instance(factory),
+            "construction_ns": construction_ns(factory),
+        }
+        for name, factory in (
+            ("dict (before)", DictDeviceStatus),
+            ("slots (after)", DeviceStatus),
+        )
+    }
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    print(f"{'layout':<16}{'bytes/instance':>16}{'ns/construction':>18}")
+    for name, result in run().items():
+        print(
+            f"{name:<16}{result['bytes_per_instance']:>16.1f}"
+            f"{result['construction_ns']:>18.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
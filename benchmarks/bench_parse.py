@@ -0,0 +1,116 @@
+"""
+Benchmark parsing of 'Get all device status' responses.
+
+Compares DeviceStatuses.from_json with the previous parser, which built a one-entry
+mapping per device, and JSON decoding with the standard library and with orjson (when
+installed).
+
+Run with ``python -m benchmarks.bench_parse``.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from qwikswitchapi.constants import JsonKeys
+from qwikswitchapi.entities import DeviceStatus, DeviceStatuses
+from qwikswitchapi.utility import ResponseParser
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEVICE_COUNTS = (10, 100, 1000)
+
+
+def make_payload(count: int) -> dict:
+    """Build a 'Get all device status' response with ``count`` devices."""
+    payload: dict = {"success": True}
+    for i in range(count):
+        payload[f"@{i:06x}"] = {
+            "type": "RELAY QS-D-S5",
+            "hardware": "0x81",
+            "firmware": "v3.3",
+            "epoch": str(1736018165 + i),
+            "rssi": f"{i % 100}%",
+            "value": i % 101,
+        }
+    return payload
+
+
+def make_response(payload: dict) -> SimpleNamespace:
+    """Wrap an encoded payload in a minimal stand-in for ``requests.Response``."""
+    content = json.dumps(payload).encode()
+    return SimpleNamespace(
+        status_code=200,
+        content=content,
+        text=content.decode(),
+        json=lambda: json.loads(content),
+    )
+
+
+def legacy_from_json(json_data: dict) -> DeviceStatuses:
+    """Parse device statuses the way DeviceStatuses.from_resp did before."""
+    statuses = []
+    for key in json_data:  # noqa: PLC0206
+        if key == JsonKeys.SUCCESS:
+            continue
+        one = {key: json_data[key]}
+        if len(one) > 1:
+            raise ValueError
+        device_id = next(iter(one))
+        state = one[device_id]
+        statuses.append(
+            DeviceStatus(
+                device_id,
+                state[JsonKeys.TYPE],
+                state[JsonKeys.FIRMWARE],
+                state[JsonKeys.EPOCH],
+                int(state[JsonKeys.RSSI].replace("%", "")),
+                state[JsonKeys.VALUE],
+            )
+        )
+    return DeviceStatuses(statuses)
+
+
+def best_us(func: Callable[[], object], number: int) -> float:
+    """Return the best time per call over several repeats, in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def run() -> dict[str, dict[str, float]]:
+    """Run the benchmark, returning timings in microseconds per device count."""
+    results = {}
+    for count in DEVICE_COUNTS:
+        payload = make_payload(count)
+        resp = make_response(payload)
+        number = max(10, 20_000 // count)
+        results[str(count)] = {
+            "legacy_entities_us": best_us(
+                lambda p=payload: legacy_from_json(p), number
+            ),
+            "from_json_entities_us": best_us(
+                lambda p=payload: DeviceStatuses.from_json(p), number
+            ),
+            "stdlib_json_us": best_us(lambda r=resp: r.json(), number),
+            "parse_json_us": best_us(
+                lambda r=resp: ResponseParser.parse_json(r), number
+            ),
+            "from_resp_us": best_us(lambda r=resp: DeviceStatuses.from_resp(r), number),
+        }
+    return results
+
+
+def main() -> None:
+    """Print the benchmark results."""
+    results = run()
+    columns = list(next(iter(results.values())))
+    print(f"{'devices':>8}" + "".join(f"{c:>26}" for c in columns))
+    for count, timings in results.items():
+        print(f"{count:>8}" + "".join(f"{timings[c]:>26.1f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
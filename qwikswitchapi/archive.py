@@ -0,0 +1,520 @@
+"""Compact binary archives of device status snapshots, replayed through a memory map."""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Self
+
+from .devices import DEFAULT_REGISTRY
+from .entities import DeviceStatus, DeviceStatuses
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is not installed
+    np = None
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .devices import DeviceRegistry
+
+# An archive is the file magic followed by one block per snapshot.  A block is a header,
+# the device identifiers and labels (types and firmware versions) first seen in the
+# snapshot, then one fixed-width record per device referring to those tables by index.
+_FILE_MAGIC = b"QSARCH01"
+_BLOCK_MAGIC = b"QSB1"
+_HEADER = struct.Struct("<4sdIHI")  # magic, timestamp, new ids, new labels, records
+_STRING_LENGTH = struct.Struct("<H")
+_RECORD = struct.Struct("<qiIHHb")  # epoch, value, device, type, firmware, rssi
+_DEVICE_OFFSET = 12  # of the device index within a record
+
+_MAX_LABELS = 0xFFFF
+_COLUMNS = {"epoch": "q", "rssi": "b", "value": "i", "timestamp": "d"}
+
+if np is not None:
+    _DTYPE = np.dtype(
+        [
+            ("epoch", "<i8"),
+            ("value", "<i4"),
+            ("device", "<u4"),
+            ("type", "<u2"),
+            ("firmware", "<u2"),
+            ("rssi", "i1"),
+        ]
+    )
+
+
+class _Index:
+    """The string tables and block positions read from an archive."""
+
+    def __init__(self) -> None:
+        self.device_ids: list[str] = []
+        self.labels: list[str] = []
+        self.timestamps = array("d")
+        self.offsets = array("q")
+        self.counts = array("I")
+        self.end = len(_FILE_MAGIC)
+
+
+def _read_strings(
+    buffer: Any, offset: int, count: int, end: int
+) -> tuple[list[str], int] | None:
+    strings = []
+    for _ in range(count):
+        if offset + _STRING_LENGTH.size > end:
+            return None
+        (length,) = _STRING_LENGTH.unpack_from(buffer, offset)
+        offset += _STRING_LENGTH.size
+        if offset + length > end:
+            return None
+        strings.append(bytes(buffer[offset : offset + length]).decode())
+        offset += length
+    return strings, offset
+
+
+def _scan(buffer: Any, size: int) -> _Index:
+    """Index the complete blocks of an archive, stopping at a truncated or corrupt one."""
+    if bytes(buffer[: len(_FILE_MAGIC)]) != _FILE_MAGIC:
+        msg = "Not a device status archive"
+        raise ValueError(msg)
+
+    index = _Index()
+    offset = index.end
+    while offset + _HEADER.size <= size:
+        magic, timestamp, new_ids, new_labels, records = _HEADER.unpack_from(
+            buffer, offset
+        )
+        if magic != _BLOCK_MAGIC:
+            break
+        ids = _read_strings(buffer, offset + _HEADER.size, new_ids, size)
+        if ids is None:
+            break
+        labels = _read_strings(buffer, ids[1], new_labels, size)
+        if labels is None:
+            break
+        start = labels[1]
+        end = start + records * _RECORD.size
+        if end > size:
+            break
+
+        index.device_ids.extend(ids[0])
+        index.labels.extend(labels[0])
+        index.timestamps.append(timestamp)
+        index.offsets.append(start)
+        index.counts.append(records)
+        index.end = offset = end
+    return index
+
+
+def _pack_strings(strings: list[str]) -> bytes:
+    parts = []
+    for string in strings:
+        encoded = string.encode()
+        parts.append(_STRING_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+
+class ArchiveWriter:
+    """
+    Appends device status snapshots to a compact binary archive.
+
+    Each device is stored as a fixed-width record of packed epoch, value and RSSI, and
+    indexes into tables of device identifiers, types and firmware versions, which are
+    written once per archive as they are first seen.  Each snapshot is written as one
+    block, so a snapshot cut short by a crash is ignored by readers and overwritten
+    when appending.  Pass ``write`` as the ``on_snapshot`` callback of an AdaptivePoller
+    to archive every poll.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        append: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize an ArchiveWriter, opening the file.
+
+        :param path: the path of the archive
+        :param append: whether to append to an existing archive, rather than replace it
+        :param clock: the clock used to timestamp snapshots, in seconds
+        :raises ValueError: if appending to a file that is not an archive
+        """
+        self._path = Path(path)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._device_refs: dict[str, int] = {}
+        self._label_refs: dict[str, int] = {}
+        self._last_timestamp = float("-inf")
+        self._snapshots = 0
+        self._records = 0
+        self._file: IO[bytes] = self._open(append=append)
+
+    @property
+    def path(self) -> Path:
+        """
+        The path of the archive.
+
+        :return: the path of the archive
+        """
+        return self._path
+
+    @property
+    def snapshots_written(self) -> int:
+        """
+        The number of snapshots written by this writer.
+
+        :return: the number of snapshots written
+        """
+        return self._snapshots
+
+    @property
+    def records_written(self) -> int:
+        """
+        The number of device records written by this writer.
+
+        :return: the number of records written
+        """
+        return self._records
+
+    def write(
+        self,
+        statuses: DeviceStatuses | Iterable[DeviceStatus],
+        timestamp: float | None = None,
+    ) -> int:
+        """
+        Append a snapshot.
+
+        Epochs are stored as integers.
+
+        :param statuses: the snapshot, typically the result of get_all_device_status
+        :param timestamp: the time of the snapshot, in seconds.  Defaults to now.
+        :return: the number of records written
+        :raises ValueError: if the timestamp precedes that of the previous snapshot, or a value does not fit its field
+        :raises QSResponseParseError: if the status of a device in a lazy snapshot is invalid
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+        if isinstance(statuses, DeviceStatuses):
+            statuses = statuses.stream()
+
+        with self._lock:
+            if timestamp < self._last_timestamp:
+                msg = f"Snapshot at {timestamp} precedes the previous snapshot"
+                raise ValueError(msg)
+
+            # Strings are only added to the tables once the whole block is written.
+            device_refs, label_refs = self._device_refs, self._label_refs
+            new_ids: dict[str, int] = {}
+            new_labels: dict[str, int] = {}
+
+            def label_ref(label: str) -> int:
+                ref = label_refs.get(label)
+                if ref is None:
+                    ref = new_labels.get(label)
+                    if ref is None:
+                        ref = new_labels[label] = len(label_refs) + len(new_labels)
+                return ref
+
+            records = bytearray()
+            pack = _RECORD.pack
+            count = 0
+            for status in statuses:
+                device_id = status.device_id
+                device_ref = device_refs.get(device_id)
+                if device_ref is None:
+                    device_ref = new_ids.get(device_id)
+                    if device_ref is None:
+                        device_ref = new_ids[device_id] = len(device_refs) + len(
+                            new_ids
+                        )
+                try:
+                    records += pack(
+                        int(status.epoch),
+                        status.value,
+                        device_ref,
+                        label_ref(status.device_type),
+                        label_ref(status.firmware),
+                        status.rssi,
+                    )
+                except struct.error as ex:
+                    msg = f"Status of device {device_id} cannot be archived: {ex}"
+                    raise ValueError(msg) from ex
+                count += 1
+
+            if len(label_refs) + len(new_labels) > _MAX_LABELS:
+                msg = "Too many distinct device types and firmware versions to archive"
+                raise ValueError(msg)
+
+            self._file.write(
+                b"".join(
+                    (
+                        _HEADER.pack(
+                            _BLOCK_MAGIC,
+                            timestamp,
+                            len(new_ids),
+                            len(new_labels),
+                            count,
+                        ),
+                        _pack_strings(list(new_ids)),
+                        _pack_strings(list(new_labels)),
+                        records,
+                    )
+                )
+            )
+            self._file.flush()
+
+            device_refs.update(new_ids)
+            label_refs.update(new_labels)
+            self._last_timestamp = timestamp
+            self._snapshots += 1
+            self._records += count
+        return count
+
+    def close(self) -> None:
+        """Close the archive."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context, returning the writer."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, closing the archive."""
+        self.close()
+
+    def _open(self, *, append: bool) -> IO[bytes]:
+        if not append or not self._path.exists() or self._path.stat().st_size == 0:
+            file = self._path.open("wb")
+            file.write(_FILE_MAGIC)
+            file.flush()
+            return file
+
+        file = self._path.open("r+b")
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                index = _scan(buffer, len(buffer))
+        except ValueError:
+            file.close()
+            raise
+
+        self._device_refs = {d: i for i, d in enumerate(index.device_ids)}
+        self._label_refs = {label: i for i, label in enumerate(index.labels)}
+        if index.timestamps:
+            self._last_timestamp = index.timestamps[-1]
+        # Drop a block left incomplete by a crash before appending after it.
+        file.truncate(index.end)
+        file.seek(index.end)
+        return file
+
+
+class ArchiveReader:
+    """
+    Reads an archive written by ArchiveWriter through a memory map.
+
+    Opening an archive only reads the block headers and string tables; records are
+    decoded from the mapped file as they are scanned, so time ranges and single devices
+    can be replayed without loading the whole archive.  Snapshots appended after the
+    reader was opened are not visible to it.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        registry: DeviceRegistry = DEFAULT_REGISTRY,
+    ) -> None:
+        """
+        Initialize an ArchiveReader, mapping the file into memory.
+
+        :param path: the path of the archive
+        :param registry: the registry resolving the classes of devices read, optional
+        :raises ValueError: if the file is not an archive
+        """
+        self._path = Path(path)
+        self._registry = registry
+        with self._path.open("rb") as file:
+            size = self._path.stat().st_size
+            if size < len(_FILE_MAGIC):
+                msg = "Not a device status archive"
+                raise ValueError(msg)
+            self._buffer = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+        try:
+            self._index = _scan(self._buffer, size)
+        except ValueError:
+            self._buffer.close()
+            raise
+        self._device_refs = {d: i for i, d in enumerate(self._index.device_ids)}
+
+    @property
+    def timestamps(self) -> list[float]:
+        """
+        The times of the snapshots in the archive.
+
+        :return: the timestamp of each snapshot, in order
+        """
+        return list(self._index.timestamps)
+
+    @property
+    def device_ids(self) -> list[str]:
+        """
+        The devices recorded in the archive.
+
+        :return: the identifiers of the devices, in order of first appearance
+        """
+        return list(self._index.device_ids)
+
+    @property
+    def records(self) -> int:
+        """
+        The number of device records in the archive.
+
+        :return: the number of records
+        """
+        return sum(self._index.counts)
+
+    def __len__(self) -> int:
+        """Return the number of snapshots in the archive."""
+        return len(self._index.timestamps)
+
+    def snapshot(self, index: int) -> DeviceStatuses:
+        """
+        Read one snapshot.
+
+        :param index: the position of the snapshot in the archive
+        :return: the device statuses of the snapshot
+        :raises IndexError: if there is no snapshot at the position
+        """
+        offset = self._index.offsets[index]
+        count = self._index.counts[index]
+        return DeviceStatuses(
+            [self._status(offset + i * _RECORD.size) for i in range(count)]
+        )
+
+    def scan(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        device_id: str | None = None,
+    ) -> Iterator[tuple[float, DeviceStatus]]:
+        """
+        Iterate over the records of a time range, optionally of a single device.
+
+        :param start: only include snapshots taken at or after this time, optional
+        :param end: only include snapshots taken before this time, optional
+        :param device_id: only include records of this device, optional
+        :return: an iterator of (snapshot timestamp, device status)
+        """
+        device_ref = None
+        if device_id is not None:
+            device_ref = self._device_refs.get(device_id)
+            if device_ref is None:
+                return
+
+        buffer, size = self._buffer, _RECORD.size
+        unpack_device = struct.Struct("<I").unpack_from
+        for block in self._blocks(start, end):
+            timestamp = self._index.timestamps[block]
+            offset = self._index.offsets[block]
+            for position in range(
+                offset, offset + self._index.counts[block] * size, size
+            ):
+                if (
+                    device_ref is not None
+                    and unpack_device(buffer, position + _DEVICE_OFFSET)[0]
+                    != device_ref
+                ):
+                    continue
+                yield timestamp, self._status(position)
+
+    def column(
+        self,
+        device_id: str,
+        name: str,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> Any:
+        """
+        Return one column for a device over a time range, oldest record first.
+
+        :param device_id: the unique identifier of the device
+        :param name: one of 'timestamp', 'epoch', 'rssi' or 'value'
+        :param start: only include snapshots taken at or after this time, optional
+        :param end: only include snapshots taken before this time, optional
+        :return: a NumPy array when NumPy is installed, or an ``array`` otherwise
+        :raises KeyError: if the device or column is unknown
+        """
+        typecode = _COLUMNS[name]
+        device_ref = self._device_refs[device_id]
+        blocks = self._blocks(start, end)
+
+        if np is not None:
+            parts = []
+            for block in blocks:
+                records = np.frombuffer(
+                    self._buffer,
+                    dtype=_DTYPE,
+                    count=self._index.counts[block],
+                    offset=self._index.offsets[block],
+                )
+                mask = records["device"] == device_ref
+                if name == "timestamp":
+                    parts.append(
+                        np.full(
+                            int(mask.sum()), self._index.timestamps[block], dtype="d"
+                        )
+                    )
+                else:
+                    parts.append(records[name][mask])
+                del records
+            if not parts:
+                return np.zeros(0, dtype=typecode)
+            return np.concatenate(parts)
+
+        values = array(typecode)
+        for timestamp, status in self.scan(start, end, device_id):
+            values.append(timestamp if name == "timestamp" else getattr(status, name))
+        return values
+
+    def close(self) -> None:
+        """Unmap the archive."""
+        self._buffer.close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context, returning the reader."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, unmapping the archive."""
+        self.close()
+
+    def _blocks(self, start: float | None, end: float | None) -> range:
+        timestamps = self._index.timestamps
+        first = bisect_left(timestamps, start) if start is not None else 0
+        last = bisect_left(timestamps, end) if end is not None else len(timestamps)
+        return range(first, last)
+
+    def _status(self, position: int) -> DeviceStatus:
+        epoch, value, device_ref, type_ref, firmware_ref, rssi = _RECORD.unpack_from(
+            self._buffer, position
+        )
+        labels = self._index.labels
+        return DeviceStatus(
+            self._index.device_ids[device_ref],
+            labels[type_ref],
+            labels[firmware_ref],
+            epoch,
+            rssi,
+            value,
+            registry=self._registry,
+        )
@@ -0,0 +1,253 @@
+"""The asyncio QwikSwitch API client."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+from types import SimpleNamespace
+from typing import Any, Self
+
+try:
+    import aiohttp
+except ImportError as ex:  # pragma: no cover - exercised when aiohttp is not installed
+    msg = "AsyncQSClient requires aiohttp; install it with 'pip install qwikswitch_api[async]'"
+    raise ImportError(msg) from ex
+
+from .constants import (
+    DEFAULT_BASE_URI,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+    JsonKeys,
+)
+from .devices import DEFAULT_REGISTRY, DeviceRegistry
+from .entities import ApiKeys, ControlResult, DeviceStatuses
+from .utility import ResponseParser, UrlBuilder
+
+
+class _BufferedResponse:
+    """A fully read aiohttp response, exposing the parts of the requests API the entities use."""
+
+    def __init__(
+        self, url: str, status_code: int, content: bytes, headers: Any = None
+    ) -> None:
+        self.request = SimpleNamespace(url=url)
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        try:
+            return json.loads(self.content)
+        except ValueError as ex:
+            # requests raises a RequestException here, which QSClient reports as a failed request.
+            ResponseParser.raise_request_failure(self.request.url, ex)  # type: ignore
+
+    @classmethod
+    async def read(cls, resp: aiohttp.ClientResponse) -> _BufferedResponse:
+        return cls(str(resp.url), resp.status, await resp.read(), resp.headers)
+
+
+class AsyncQSClient:
+    """The asyncio QwikSwitch API client."""
+
+    def _ensure_authenticated(func):  # type: ignore # noqa: N805
+        @functools.wraps(func)  # type: ignore
+        async def authenticate_if_needed(self: Any, *args: Any, **kwargs: Any):
+            if self._api_keys is None:
+                async with self._auth_lock:
+                    if self._api_keys is None:
+                        await self.generate_api_keys()
+            return await func(self, *args, **kwargs)  # type: ignore
+
+        return authenticate_if_needed
+
+    def _handle_request_failure(func):  # type: ignore  # noqa: N805
+        @functools.wraps(func)  # type: ignore
+        async def catch_failure(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN001
+            try:
+                return await func(self, *args, **kwargs)  # type: ignore
+            except aiohttp.ClientResponseError as ex:
+                ResponseParser.raise_request_failure(ex.request_info.real_url, ex)  # type: ignore
+            except (aiohttp.ClientError, TimeoutError) as ex:
+                ResponseParser.raise_request_failure("Unknown", ex)  # type: ignore
+
+        return catch_failure
+
+    def __init__(  # noqa: PLR0913
+        self,
+        email: str,
+        master_key: str,
+        base_uri: str = DEFAULT_BASE_URI,
+        session: aiohttp.ClientSession | None = None,
+        max_connections: int = DEFAULT_POOL_MAXSIZE,
+        *,
+        lazy_parsing: bool = False,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        device_registry: DeviceRegistry = DEFAULT_REGISTRY,
+    ) -> None:
+        """
+        Initialize a new instance of the AsyncQSClient class.
+
+        :param email: your email address registered on https://qwikswitch.com
+        :param master_key: 12 character key found under your CloudHub.  This should be your device id of your Qwikswitch Wi-Fi bridge.
+        :param base_uri: the base URI of the Qwikswitch API, optional.  Defaults to 'https://qwikswitch.com/api/v1/'
+        :param session: the aiohttp session to use, optional.  A session owned by the client is created on first use if not supplied.
+        :param max_connections: the maximum number of pooled connections of an owned session
+        :param lazy_parsing: whether device statuses returned by get_all_device_status are parsed on access rather than up front
+        :param connect_timeout: the time allowed to establish a connection of an owned session, in seconds
+        :param read_timeout: the time allowed between bytes received by an owned session, in seconds
+        :param device_registry: the registry resolving the classes of devices returned by get_all_device_status, optional
+        """
+        self._email = email
+        self._master_key = master_key
+        self._api_keys = None
+        self._auth_lock = asyncio.Lock()
+
+        if not base_uri.endswith("/"):
+            base_uri += "/"
+
+        self._base_uri = base_uri
+        self._owns_session = session is None
+        self._session = session
+        self._max_connections = max_connections
+        self._lazy_parsing = lazy_parsing
+        self._device_registry = device_registry
+        self._timeout = aiohttp.ClientTimeout(
+            connect=connect_timeout, sock_read=read_timeout
+        )
+
+    @property
+    def base_uri(self) -> str:
+        """
+        The base URI of the Qwikswitch API.
+
+        :returns: The base URI of the Qwikswitch API
+        """
+        return self._base_uri
+
+    @property
+    def api_keys(self) -> ApiKeys | None:
+        """
+        The API keys for the QwikSwitch API.
+
+        :returns: The API keys for the QwikSwitch API
+        """
+        return self._api_keys
+
+    @api_keys.setter
+    def api_keys(self, value: ApiKeys) -> None:
+        """Set the API keys for the QwikSwitch API."""
+        self._api_keys = value
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._max_connections),
+                timeout=self._timeout,
+            )
+        return self._session
+
+    async def _get(self, url: str) -> _BufferedResponse:
+        async with self._get_session().get(url) as resp:
+            return await _BufferedResponse.read(resp)
+
+    async def _post(self, url: str, req: Any) -> _BufferedResponse:
+        async with self._get_session().post(url, json=req) as resp:
+            return await _BufferedResponse.read(resp)
+
+    @_handle_request_failure  # type: ignore
+    async def generate_api_keys(self) -> ApiKeys:
+        """
+        Generate API keys for the given email and master key to be used in subsequent calls.
+
+        :returns: APIKeys, with an API key for read operations, and one for read-write operations.
+        :raises QSException: on failure to generate API keys
+        """
+        url = UrlBuilder.build_generate_api_keys_url(self._base_uri)
+        req = {JsonKeys.EMAIL: self._email, JsonKeys.MASTER_KEY: self._master_key}
+
+        resp = await self._post(url, req)
+        self._api_keys = ApiKeys.from_resp(resp)
+        return self._api_keys
+
+    @_handle_request_failure  # type: ignore
+    async def delete_api_keys(self) -> None:
+        """
+        Delete API keys generated for the given email and master key.
+
+        :returns: None
+        :raises QSException: on failure to delete API keys
+        """
+        url = UrlBuilder.build_delete_api_keys_url(self._base_uri)
+        req = {JsonKeys.EMAIL: self._email, JsonKeys.MASTER_KEY: self._master_key}
+
+        resp = await self._post(url, req)
+        _ = ApiKeys.from_resp(resp)
+
+    @_ensure_authenticated  # type: ignore
+    @_handle_request_failure  # type: ignore
+    async def control_device(self, device_id: str, level: int) -> ControlResult:
+        """
+        Control a device by setting the desired level.
+
+        :param device_id: the unique identifier of the device to control
+        :param level: the level to set the device to
+        :returns: ControlResult, with the device and level set
+        :raises QSException: when the request fails
+        """
+        url = UrlBuilder.build_control_url(
+            self._api_keys.read_write_key,  # type: ignore
+            device_id,
+            level,
+            self._base_uri,
+        )
+
+        resp = await self._get(url)
+        return ControlResult.from_resp(resp)
+
+    @_ensure_authenticated  # type: ignore
+    @_handle_request_failure  # type: ignore
+    async def get_all_device_status(self) -> DeviceStatuses:
+        """
+        Retrieve the status of all devices registered to the given API keys.
+
+        :returns: Array of DeviceStatus with device information
+        :raises QSException: when the request fails
+        """
+        url = UrlBuilder.build_get_all_device_status_url(
+            self._api_keys.read_write_key,  # type: ignore
+            self._base_uri,
+        )
+
+        resp = await self._get(url)
+        return DeviceStatuses.from_resp(
+            resp, lazy=self._lazy_parsing, registry=self._device_registry
+        )
+
+    async def close(self) -> None:
+        """
+        Release pooled connections.
+
+        A session supplied by the caller is left open, as it may be shared.
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> Self:
+        """Enter the runtime context, returning the client."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, closing the client."""
+        await self.close()
+
+    _ensure_authenticated = staticmethod(_ensure_authenticated)
+    _handle_request_failure = staticmethod(_handle_request_failure)
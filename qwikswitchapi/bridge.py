@@ -0,0 +1,225 @@
+"""Routing of device requests through a Wi-Fi bridge on the local network."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote_plus
+
+from requests.exceptions import RequestException
+
+from .constants import (
+    DEFAULT_BASE_URI,
+    DEFAULT_BRIDGE_RETRY_AFTER,
+    DEFAULT_BRIDGE_TIMEOUT,
+    DEFAULT_TIMEOUT,
+)
+from .transport import HttpTransport, Transport
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import requests
+
+    from .deadline import Deadline
+
+_LOGGER = logging.getLogger(__name__)
+
+# Endpoints the bridge serves; API keys are always generated and deleted in the cloud.
+_LOCAL_ENDPOINTS = frozenset({"state", "control"})
+
+
+def _shorter(timeout: Any, limit: tuple[float, float]) -> Any:
+    if timeout is None:
+        return limit
+    if isinstance(timeout, tuple):
+        return min(timeout[0], limit[0]), min(timeout[1], limit[1])
+    return min(timeout, limit[0]), min(timeout, limit[1])
+
+
+class BridgeTransport(Transport):
+    """
+    Sends device status and control requests to a bridge on the local network first.
+
+    Requests for the cloud API's state and control endpoints are rewritten to the bridge's
+    base URI, skipping the round trip through the cloud.  When the bridge cannot be
+    reached, or answers with a server error, the request is sent to the cloud instead,
+    and the bridge is bypassed for ``retry_after`` seconds.  Key generation and deletion
+    always go to the cloud.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        bridge_uri: str,
+        transport: Transport | None = None,
+        *,
+        cloud_base_uri: str = DEFAULT_BASE_URI,
+        bridge_key: str | None = None,
+        bridge_timeout: tuple[float, float] = DEFAULT_BRIDGE_TIMEOUT,
+        retry_after: float = DEFAULT_BRIDGE_RETRY_AFTER,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize a BridgeTransport.
+
+        :param bridge_uri: the base URI of the API served by the bridge, e.g. 'http://192.168.1.20/api/v1/'
+        :param transport: the transport sending both local and cloud requests, optional.  A pooled HttpTransport owned by this transport is created if not supplied.
+        :param cloud_base_uri: the base URI of the cloud API, as configured on the QSClient
+        :param bridge_key: the API key the bridge expects, optional.  Defaults to the key used for the cloud.
+        :param bridge_timeout: the upper bounds of the (connect, read) timeouts of bridge requests, in seconds
+        :param retry_after: the number of seconds to bypass the bridge after it fails
+        :param clock: the monotonic clock to use, in seconds
+        """
+        if not bridge_uri.endswith("/"):
+            bridge_uri += "/"
+        if not cloud_base_uri.endswith("/"):
+            cloud_base_uri += "/"
+
+        self._bridge_uri = bridge_uri
+        self._cloud_base_uri = cloud_base_uri
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else HttpTransport()
+        self._bridge_key = bridge_key
+        self._bridge_timeout = bridge_timeout
+        self._retry_after = retry_after
+        self._clock = clock
+        self._bypass_until = 0.0
+        self._lock = threading.Lock()
+        self._local_requests = 0
+        self._fallbacks = 0
+
+    @property
+    def bridge_uri(self) -> str:
+        """
+        The base URI of the API served by the bridge.
+
+        :return: the base URI of the bridge
+        """
+        return self._bridge_uri
+
+    @property
+    def bridge_available(self) -> bool:
+        """
+        Whether requests are currently routed to the bridge.
+
+        :return: False while the bridge is bypassed after a failure
+        """
+        return self._clock() >= self._bypass_until
+
+    @property
+    def local_requests(self) -> int:
+        """
+        The number of requests answered by the bridge.
+
+        :return: the number of requests answered by the bridge
+        """
+        return self._local_requests
+
+    @property
+    def fallbacks(self) -> int:
+        """
+        The number of requests sent to the cloud after the bridge failed.
+
+        :return: the number of fallbacks
+        """
+        return self._fallbacks
+
+    def local_url(self, url: str) -> str | None:
+        """
+        Rewrite a cloud API URL to the bridge.
+
+        :param url: the URL of a request to the cloud API
+        :return: the URL on the bridge, or None if the bridge does not serve the endpoint
+        """
+        if not url.startswith(self._cloud_base_uri):
+            return None
+        path = url[len(self._cloud_base_uri) :]
+        endpoint, _, rest = path.partition("/")
+        if endpoint not in _LOCAL_ENDPOINTS:
+            return None
+        if self._bridge_key is not None:
+            _, _, rest = rest.partition("/")
+            rest = f"{quote_plus(self._bridge_key)}/{rest}"
+        return f"{self._bridge_uri}{endpoint}/{rest}"
+
+    def get(
+        self,
+        url: str,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        """
+        Issue a GET request, through the bridge when it serves the endpoint.
+
+        :param url: the URL to request, on the cloud API
+        :param timeout: the request timeout, as accepted by ``requests``
+        :param deadline: the deadline of the call, which also bounds the fallback to the cloud, optional
+        :return: the response
+        :raises QSDeadlineExceededError: if the deadline passed while waiting for the bridge
+        """
+        local_url = self.local_url(url) if self.bridge_available else None
+        if local_url is not None:
+            try:
+                resp = self._transport.get(
+                    local_url,
+                    timeout=_shorter(timeout, self._bridge_timeout),
+                    deadline=deadline,
+                )
+            except RequestException as ex:
+                self._bypass(ex)
+            else:
+                if resp.status_code < HTTPStatus.INTERNAL_SERVER_ERROR:
+                    with self._lock:
+                        self._local_requests += 1
+                    return resp
+                self._bypass(resp.status_code)
+
+            if deadline is not None:
+                # The time spent on the bridge comes out of the cloud request's share.
+                deadline.check(url)
+                timeout = deadline.clamp(timeout)
+
+        return self._transport.get(url, timeout=timeout, deadline=deadline)
+
+    def post(
+        self,
+        url: str,
+        json: Any = None,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        """
+        Issue a POST request to the cloud.
+
+        :param url: the URL to request
+        :param json: the body to send, serialized as JSON
+        :param timeout: the request timeout, as accepted by ``requests``
+        :param deadline: the deadline of the call, optional
+        :return: the response
+        """
+        return self._transport.post(url, json=json, timeout=timeout, deadline=deadline)
+
+    def close(self) -> None:
+        """
+        Release pooled connections.
+
+        A transport supplied by the caller is left open, as it may be shared.
+        """
+        if self._owns_transport:
+            self._transport.close()
+
+    def _bypass(self, reason: object) -> None:
+        _LOGGER.debug(
+            "Bridge at %s failed (%s), falling back to the cloud for %ss",
+            self._bridge_uri,
+            reason,
+            self._retry_after,
+        )
+        with self._lock:
+            self._fallbacks += 1
+            self._bypass_until = self._clock() + self._retry_after
@@ -0,0 +1,152 @@
+"""Caching of device status snapshots."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from .exceptions import QSDeadlineExceededError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .deadline import Deadline
+    from .entities import DeviceStatuses
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StatusCache:
+    """
+    A TTL cache for the device status snapshot.
+
+    Concurrent refreshes are coalesced so that only one request is in flight at a time.
+    Once a snapshot is older than ``ttl`` but younger than ``ttl + stale_ttl``, it is
+    served as-is while a single background refresh replaces it.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize a StatusCache.
+
+        :param ttl: the number of seconds a snapshot is considered fresh
+        :param stale_ttl: the number of seconds after expiry during which a stale snapshot is served while revalidating
+        :param clock: the monotonic clock to use, in seconds
+        """
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._clock = clock
+        self._statuses: DeviceStatuses | None = None
+        self._fetched_at = 0.0
+        self._generation = 0
+        self._refreshing = False
+        self._condition = threading.Condition()
+
+    @property
+    def ttl(self) -> float:
+        """
+        The number of seconds a snapshot is considered fresh.
+
+        :return: the TTL in seconds
+        """
+        return self._ttl
+
+    @property
+    def stale_ttl(self) -> float:
+        """
+        The number of seconds after expiry during which a stale snapshot is served.
+
+        :return: the stale-while-revalidate window in seconds
+        """
+        return self._stale_ttl
+
+    def invalidate(self) -> None:
+        """
+        Discard the cached snapshot.
+
+        Refreshes already in flight are not stored, as they may predate the change that caused the invalidation.
+        """
+        with self._condition:
+            self._statuses = None
+            self._generation += 1
+
+    def get(
+        self, fetch: Callable[[], DeviceStatuses], deadline: Deadline | None = None
+    ) -> DeviceStatuses:
+        """
+        Return the cached snapshot, refreshing it with ``fetch`` if needed.
+
+        :param fetch: the function retrieving a fresh snapshot
+        :param deadline: the deadline bounding the wait for a refresh by another caller, optional
+        :return: the device statuses
+        :raises QSDeadlineExceededError: if the deadline passes while waiting for another refresh
+        :raises QSError: when a blocking refresh fails
+        """
+        with self._condition:
+            while True:
+                age = self._clock() - self._fetched_at
+                if self._statuses is not None and age < self._ttl:
+                    return self._statuses
+
+                if self._statuses is not None and age < self._ttl + self._stale_ttl:
+                    if not self._refreshing:
+                        self._refreshing = True
+                        threading.Thread(
+                            target=self._revalidate,
+                            args=(fetch, self._generation),
+                            daemon=True,
+                        ).start()
+                    return self._statuses
+
+                if not self._refreshing:
+                    break
+                if deadline is None:
+                    self._condition.wait()
+                elif not self._condition.wait(deadline.remaining):
+                    msg = (
+                        f"Deadline of {deadline.seconds}s passed while waiting for "
+                        "device statuses requested by another caller"
+                    )
+                    raise QSDeadlineExceededError(msg)
+
+            self._refreshing = True
+            generation = self._generation
+
+        try:
+            statuses = fetch()
+        except BaseException:
+            with self._condition:
+                self._refreshing = False
+                self._condition.notify_all()
+            raise
+
+        self._store(statuses, generation)
+        return statuses
+
+    def _revalidate(self, fetch: Callable[[], DeviceStatuses], generation: int) -> None:
+        try:
+            statuses = fetch()
+        except BaseException:
+            # Any failure must release the refresh, or later callers wait on it forever.
+            _LOGGER.warning("Failed to revalidate device statuses", exc_info=True)
+            with self._condition:
+                self._refreshing = False
+                self._condition.notify_all()
+            return
+
+        self._store(statuses, generation)
+
+    def _store(self, statuses: DeviceStatuses, generation: int) -> None:
+        with self._condition:
+            if generation == self._generation:
+                self._statuses = statuses
+                self._fetched_at = self._clock()
+            self._refreshing = False
+            self._condition.notify_all()
@@ -0,0 +1,202 @@
+"""Incremental change feed over successive device status snapshots."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any
+
+from .constants import DEFAULT_POLL_INTERVAL, ChangeType
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Iterator
+
+    from .entities import DeviceStatus, DeviceStatuses
+
+
+class DeviceChange:
+    """A change in the status of a single device between two snapshots."""
+
+    def __init__(
+        self,
+        change_type: ChangeType,
+        previous: DeviceStatus | None,
+        current: DeviceStatus | None,
+    ) -> None:
+        """
+        Initialize a DeviceChange object.
+
+        :param change_type: whether the device was added, removed or changed
+        :param previous: the status in the previous snapshot, None if the device was added
+        :param current: the status in the current snapshot, None if the device was removed
+        """
+        self._change_type = change_type
+        self._previous = previous
+        self._current = current
+
+    @property
+    def change_type(self) -> ChangeType:
+        """
+        The kind of change.
+
+        :return: whether the device was added, removed or changed
+        """
+        return self._change_type
+
+    @property
+    def device_id(self) -> str:
+        """
+        The unique identifier of the device.
+
+        :return: the unique identifier of the device
+        """
+        status = self._current if self._current is not None else self._previous
+        return status.device_id  # type: ignore
+
+    @property
+    def previous(self) -> DeviceStatus | None:
+        """
+        The status of the device in the previous snapshot.
+
+        :return: the previous status, or None if the device was added
+        """
+        return self._previous
+
+    @property
+    def current(self) -> DeviceStatus | None:
+        """
+        The status of the device in the current snapshot.
+
+        :return: the current status, or None if the device was removed
+        """
+        return self._current
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly representation of the change."""
+        return f"DeviceChange({self._change_type.name}, {self.device_id!r})"
+
+
+class StatusDiffer:
+    """Compares successive snapshots, keeping the previous one indexed by device id."""
+
+    def __init__(self) -> None:
+        """Initialize a StatusDiffer with no previous snapshot."""
+        self._previous: dict[str, DeviceStatus] | None = None
+
+    @property
+    def has_snapshot(self) -> bool:
+        """
+        Whether a snapshot has been seen yet.
+
+        :return: True once diff has been called at least once
+        """
+        return self._previous is not None
+
+    def reset(self) -> None:
+        """Forget the previous snapshot, so that every device is reported as added again."""
+        self._previous = None
+
+    def diff(
+        self, statuses: DeviceStatuses | Iterable[DeviceStatus]
+    ) -> list[DeviceChange]:
+        """
+        Compare a snapshot with the previous one, and remember it for the next call.
+
+        A device is considered changed when its epoch or value differs.
+
+        :param statuses: the current snapshot
+        :return: the added, removed and changed devices
+        """
+        current = {status.device_id: status for status in statuses}
+        previous = self._previous or {}
+        self._previous = current
+
+        changes = []
+        for device_id, status in current.items():
+            before = previous.get(device_id)
+            if before is None:
+                changes.append(DeviceChange(ChangeType.added, None, status))
+            elif before.epoch != status.epoch or before.value != status.value:
+                changes.append(DeviceChange(ChangeType.changed, before, status))
+
+        changes.extend(
+            DeviceChange(ChangeType.removed, status, None)
+            for device_id, status in previous.items()
+            if device_id not in current
+        )
+
+        return changes
+
+
+class ChangeFeed:
+    """
+    Polls get_all_device_status and yields only the devices that changed.
+
+    Iterate synchronously over a QSClient, or asynchronously over an AsyncQSClient.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        *,
+        emit_initial: bool = True,
+    ) -> None:
+        """
+        Initialize a ChangeFeed.
+
+        :param client: the QSClient or AsyncQSClient to poll
+        :param interval: the number of seconds to wait between polls
+        :param emit_initial: whether devices in the first snapshot are reported as added
+        """
+        self._client = client
+        self._interval = interval
+        self._emit_initial = emit_initial
+        self._differ = StatusDiffer()
+        self._stopped = threading.Event()
+
+    @property
+    def interval(self) -> float:
+        """
+        The number of seconds to wait between polls.
+
+        :return: the polling interval in seconds
+        """
+        return self._interval
+
+    def stop(self) -> None:
+        """Stop iteration after the current poll."""
+        self._stopped.set()
+
+    def process(self, statuses: DeviceStatuses) -> list[DeviceChange]:
+        """
+        Diff a snapshot against the previous one.
+
+        :param statuses: the current snapshot
+        :return: the changes since the previous snapshot
+        """
+        initial = not self._differ.has_snapshot
+        changes = self._differ.diff(statuses)
+        return changes if self._emit_initial or not initial else []
+
+    def poll(self) -> list[DeviceChange]:
+        """
+        Fetch one snapshot and diff it against the previous one.
+
+        :return: the changes since the previous poll
+        :raises QSException: when the request fails
+        """
+        return self.process(self._client.get_all_device_status())
+
+    def __iter__(self) -> Iterator[DeviceChange]:
+        """Poll until stopped, yielding each change as it is detected."""
+        while not self._stopped.is_set():
+            yield from self.poll()
+            self._stopped.wait(self._interval)
+
+    async def __aiter__(self) -> AsyncIterator[DeviceChange]:
+        """Poll an asyncio client until stopped, yielding each change as it is detected."""
+        while not self._stopped.is_set():
+            for change in self.process(await self._client.get_all_device_status()):
+                yield change
+            await asyncio.sleep(self._interval)
@@ -1,41 +1,187 @@
 """The QwikSwitch API client."""
 
 import functools
-from typing import Any
+import threading
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Self
 
-import requests
 from requests.exceptions import RequestException
 
-from .constants import DEFAULT_BASE_URI, DEFAULT_TIMEOUT, JsonKeys
-from .entities import ApiKeys, ControlResult, DeviceStatuses
+from .cache import StatusCache
+from .constants import (
+    DEFAULT_BASE_URI,
+    DEFAULT_BATCH_MAX_WORKERS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    JsonKeys,
+)
+from .deadline import Deadline
+from .devices import DEFAULT_REGISTRY, DeviceRegistry
+from .entities import ApiKeys, BatchControlResult, ControlResult, DeviceStatuses
+from .exceptions import (
+    QSApiKeyRejectedError,
+    QSCircuitOpenError,
+    QSDeadlineExceededError,
+    QSError,
+    QSRequestFailedError,
+    QSServerError,
+)
+from .keystore import KeyStore
+from .metrics import ClientMetrics
+from .ratelimit import RateLimiter
+from .retry import CircuitBreaker, RetryPolicy
+from .transport import HttpTransport, Transport
 from .utility import ResponseParser, UrlBuilder
 
 
 class QSClient:
     """The QwikSwitch API client."""
 
+    def _instrumented(func):  # type: ignore  # noqa: N805
+        endpoint = func.__name__  # type: ignore
+
+        @functools.wraps(func)  # type: ignore
+        def measure(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN001
+            metrics = self._metrics
+            if metrics is None:
+                return func(self, *args, **kwargs)  # type: ignore
+
+            start = time.perf_counter()
+            try:
+                result = func(self, *args, **kwargs)  # type: ignore
+            except Exception as ex:
+                metrics.observe_call(endpoint, time.perf_counter() - start, ex)
+                raise
+            metrics.observe_call(endpoint, time.perf_counter() - start)
+            return result
+
+        return measure
+
+    def _apply_deadline(func):  # type: ignore  # noqa: N805
+        @functools.wraps(func)  # type: ignore
+        def start_deadline(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN001
+            deadline = kwargs.get("deadline")
+            kwargs["deadline"] = Deadline.coerce(
+                deadline if deadline is not None else self._deadline
+            )
+            return func(self, *args, **kwargs)  # type: ignore
+
+        return start_deadline
+
     def _ensure_authenticated(func):  # type: ignore # noqa: N805
         @functools.wraps(func)  # type: ignore
         def authenticate_if_needed(self: Any, *args: Any, **kwargs: Any):
-            if self._api_keys is None:
-                self.generate_api_keys()
-            return func(self, *args, **kwargs)  # type: ignore
+            api_keys = self._api_keys
+            if api_keys is None:
+                api_keys = self._authenticate(deadline=kwargs.get("deadline"))
+
+            try:
+                return func(self, *args, **kwargs)  # type: ignore
+            except QSApiKeyRejectedError:
+                # Only keys loaded from the store, or replaced by another thread while
+                # this request was in flight, are worth retrying with fresh keys.
+                if api_keys is not self._stored_api_keys and api_keys is self._api_keys:
+                    raise
+                self._authenticate(rejected=api_keys, deadline=kwargs.get("deadline"))
+                return func(self, *args, **kwargs)  # type: ignore
 
         return authenticate_if_needed
 
     def _handle_request_failure(func):  # type: ignore  # noqa: N805
         @functools.wraps(func)  # type: ignore
         def catch_failure(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN001
+            breaker = self._circuit_breaker
+            if breaker is not None:
+                breaker.before_request(self._base_uri)
+
             try:
-                return func(self, *args, **kwargs)  # type: ignore
+                result = func(self, *args, **kwargs)  # type: ignore
             except RequestException as ex:
+                if breaker is not None:
+                    breaker.record_failure()
                 url = ex.request.url if ex.request is not None else "Unknown"
                 ResponseParser.raise_request_failure(url, ex)  # type: ignore
+            except QSServerError:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except Exception:
+                # The API was reached, even if it reported an error.
+                if breaker is not None:
+                    breaker.record_success()
+                raise
+
+            if breaker is not None:
+                breaker.record_success()
+            return result
 
         return catch_failure
 
-    def __init__(
-        self, email: str, master_key: str, base_uri: str = DEFAULT_BASE_URI
+    def _limit_rate(func):  # type: ignore  # noqa: N805
+        @functools.wraps(func)  # type: ignore
+        def wait_for_token(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN001
+            deadline = kwargs.get("deadline")
+            if deadline is not None:
+                deadline.check(self._base_uri)
+
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(
+                    deadline.remaining if deadline is not None else None
+                )
+            return func(self, *args, **kwargs)  # type: ignore
+
+        return wait_for_token
+
+    def _retry_idempotent(func):  # type: ignore  # noqa: N805
+        @functools.wraps(func)  # type: ignore
+        def retry(self, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN001
+            policy = self._retry_policy
+            if policy is None:
+                return func(self, *args, **kwargs)  # type: ignore
+
+            if policy.budget is not None:
+                policy.budget.deposit()
+
+            deadline = kwargs.get("deadline")
+            attempt = 1
+            while True:
+                try:
+                    return func(self, *args, **kwargs)  # type: ignore
+                except (QSCircuitOpenError, QSDeadlineExceededError):
+                    raise
+                except QSRequestFailedError as ex:
+                    remaining = deadline.remaining if deadline is not None else None
+                    retry_after = (
+                        ex.retry_after if isinstance(ex, QSServerError) else None
+                    )
+                    delay = policy.should_retry(attempt, remaining, retry_after)
+                    if delay is None:
+                        raise
+                policy.sleep(delay)
+                attempt += 1
+
+        return retry
+
+    def __init__(  # noqa: PLR0913
+        self,
+        email: str,
+        master_key: str,
+        base_uri: str = DEFAULT_BASE_URI,
+        transport: Transport | None = None,
+        status_cache: StatusCache | None = None,
+        *,
+        lazy_parsing: bool = False,
+        key_store: KeyStore | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        deadline: float | None = None,
+        rate_limiter: RateLimiter | None = None,
+        metrics: ClientMetrics | None = None,
+        device_registry: DeviceRegistry = DEFAULT_REGISTRY,
     ) -> None:
         """
         Initialize a new instance of the QSApi class.
@@ -43,15 +189,42 @@ class QSClient:
         :param email: the email address to generate API keys for:param email: your email address registered on https://qwikswitch.com
         :param master_key: 12 character key found under your CloudHub.  This should be your device id of your Qwikswitch Wi-Fi bridge.
         :param base_uri: the base URI of the Qwikswitch API, optional.  Defaults to 'https://qwikswitch.com/api/v1/'
+        :param transport: the transport to send requests through, optional.  A pooled HttpTransport owned by the client is created if not supplied.
+        :param status_cache: a cache for get_all_device_status, optional.  Statuses are fetched on every call if not supplied.
+        :param lazy_parsing: whether device statuses returned by get_all_device_status are parsed on access rather than up front
+        :param key_store: a store of previously generated API keys, optional.  Keys are loaded from it before generating new ones, and saved to it after generating them.
+        :param retry_policy: the policy for retrying control_device and get_all_device_status after request failures, optional.  Requests are not retried if not supplied.
+        :param circuit_breaker: a circuit breaker failing requests fast while the API is unreachable, optional
+        :param connect_timeout: the time allowed to establish a connection, in seconds
+        :param read_timeout: the time allowed between bytes received from the API, in seconds
+        :param deadline: the default time allowed for each call, including authentication and retries, in seconds, optional.  Calls are unbounded if not supplied.
+        :param rate_limiter: a rate limiter every request waits on, optional.  It may be shared by several clients.
+        :param metrics: where to record the latency, errors, bytes received and parse time of each call, optional
+        :param device_registry: the registry resolving the classes of devices returned by get_all_device_status, optional
         """
         self._email = email
         self._master_key = master_key
         self._api_keys = None
+        self._stored_api_keys = None
+        self._auth_lock = threading.Lock()
 
         if not base_uri.endswith("/"):
             base_uri += "/"
 
         self._base_uri = base_uri
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else HttpTransport()
+        self._status_cache = status_cache
+        self._lazy_parsing = lazy_parsing
+        self._key_store = key_store
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._timeout = (connect_timeout, read_timeout)
+        self._deadline = deadline
+        self._rate_limiter = rate_limiter
+        self._metrics = metrics
+        self._device_registry = device_registry
+        self._control_listeners: list[Callable[[ControlResult], None]] = []
 
     @property
     def base_uri(self) -> str:
@@ -62,6 +235,42 @@ class QSClient:
         """
         return self._base_uri
 
+    @property
+    def transport(self) -> Transport:
+        """
+        The HTTP transport shared by all API calls.
+
+        :returns: The HTTP transport shared by all API calls
+        """
+        return self._transport
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """
+        The default (connect, read) timeouts of each request.
+
+        :returns: The default (connect, read) timeouts, in seconds
+        """
+        return self._timeout
+
+    @property
+    def metrics(self) -> ClientMetrics | None:
+        """
+        The measurements recorded for calls made by the client, if any.
+
+        :returns: The measurements, or None if instrumentation is disabled
+        """
+        return self._metrics
+
+    @property
+    def status_cache(self) -> StatusCache | None:
+        """
+        The cache used for device statuses, if any.
+
+        :returns: The cache used for device statuses, or None if caching is disabled
+        """
+        return self._status_cache
+
     @property
     def api_keys(self) -> ApiKeys | None:
         """
@@ -76,43 +285,187 @@ class QSClient:
         """Set the API keys for the QwikSwitch API."""
         self._api_keys = value
 
+    def _authenticate(
+        self, rejected: ApiKeys | None = None, deadline: Deadline | None = None
+    ) -> ApiKeys:
+        """
+        Obtain API keys, coalescing concurrent callers into a single request.
+
+        Callers that find the keys already replaced while waiting on the lock use those.
+
+        :param rejected: keys that the API rejected, which must not be reused
+        :param deadline: the deadline of the call requiring the keys, optional.  It also bounds the wait for another caller's request.
+        :returns: the API keys to use
+        :raises QSDeadlineExceededError: if the deadline passes while waiting for another caller
+        """
+        if deadline is None:
+            self._auth_lock.acquire()
+        elif not self._auth_lock.acquire(timeout=deadline.remaining):
+            msg = (
+                f"Deadline of {deadline.seconds}s passed while waiting for API keys "
+                "requested by another caller"
+            )
+            raise QSDeadlineExceededError(msg)
+
+        try:
+            current = self._api_keys
+            if current is not None and current is not rejected:
+                return current
+
+            if self._key_store is not None:
+                stored = self._key_store.load(self._email, self._master_key)
+                if stored is not None and stored != rejected:
+                    self._api_keys = self._stored_api_keys = stored
+                    return stored
+                if stored is not None:
+                    self._key_store.delete(self._email, self._master_key)
+
+            return self.generate_api_keys(deadline=deadline)
+        finally:
+            self._auth_lock.release()
+
+    def _request_timeout(
+        self,
+        timeout: float | tuple[float, float] | None,
+        deadline: Deadline | None,
+    ) -> float | tuple[float, float]:
+        if timeout is None:
+            timeout = self._timeout
+        return deadline.clamp(timeout) if deadline is not None else timeout
+
+    def _send(
+        self, endpoint: str, method: Callable[..., Any], url: str, **kwargs: Any
+    ) -> Any:
+        if self._metrics is None:
+            return method(url, **kwargs)
+
+        start = time.perf_counter()
+        resp = method(url, **kwargs)
+        size = len(resp.content)
+        self._metrics.observe_request(endpoint, time.perf_counter() - start, size)
+        return resp
+
+    def _parse(self, endpoint: str, parse: Callable[..., Any], resp: Any) -> Any:
+        if self._metrics is None:
+            return parse(resp)
+
+        start = time.perf_counter()
+        try:
+            return parse(resp)
+        finally:
+            self._metrics.observe_parse(endpoint, time.perf_counter() - start)
+
+    def add_control_listener(self, listener: Callable[[ControlResult], None]) -> None:
+        """
+        Register a function to be called after every successful control_device.
+
+        :param listener: the function to call with the ControlResult
+        """
+        self._control_listeners.append(listener)
+
+    def remove_control_listener(
+        self, listener: Callable[[ControlResult], None]
+    ) -> None:
+        """
+        Unregister a function previously registered with add_control_listener.
+
+        :param listener: the function to unregister
+        """
+        self._control_listeners.remove(listener)
+
+    @_instrumented  # type: ignore
+    @_apply_deadline  # type: ignore
+    @_retry_idempotent  # type: ignore
+    @_limit_rate  # type: ignore
     @_handle_request_failure  # type: ignore
-    def generate_api_keys(self) -> ApiKeys:
+    def generate_api_keys(
+        self,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | Deadline | None = None,
+    ) -> ApiKeys:
         """
         Generate API keys for the given email and master key to be used in subsequent calls.
 
+        :param timeout: the timeout for this request, or a (connect, read) tuple of timeouts, in seconds, optional
+        :param deadline: the time allowed for this call in seconds, or a Deadline, optional
         :returns: APIKeys, with an API key for read operations, and one for read-write operations.
         :raises QSException: on failure to generate API keys
         """
         url = UrlBuilder.build_generate_api_keys_url(self._base_uri)
         req = {JsonKeys.EMAIL: self._email, JsonKeys.MASTER_KEY: self._master_key}
 
-        resp = requests.post(url, json=req, timeout=DEFAULT_TIMEOUT)
-        self._api_keys = ApiKeys.from_resp(resp)
+        resp = self._send(
+            "generate_api_keys",
+            self._transport.post,
+            url,
+            json=req,
+            timeout=self._request_timeout(timeout, deadline),  # type: ignore
+            deadline=deadline,
+        )
+        self._api_keys = self._parse("generate_api_keys", ApiKeys.from_resp, resp)
+        self._stored_api_keys = None
+
+        if self._key_store is not None:
+            self._key_store.save(self._email, self._master_key, self._api_keys)
+
         return self._api_keys
 
+    @_instrumented  # type: ignore
+    @_apply_deadline  # type: ignore
+    @_limit_rate  # type: ignore
     @_handle_request_failure  # type: ignore
-    def delete_api_keys(self) -> None:
+    def delete_api_keys(
+        self,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | Deadline | None = None,
+    ) -> None:
         """
         Delete API keys generated for the given email and master key.
 
+        :param timeout: the timeout for this request, or a (connect, read) tuple of timeouts, in seconds, optional
+        :param deadline: the time allowed for this call in seconds, or a Deadline, optional
         :returns: None
         :raises QSException: on failure to delete API keys
         """
         url = UrlBuilder.build_delete_api_keys_url(self._base_uri)
         req = {JsonKeys.EMAIL: self._email, JsonKeys.MASTER_KEY: self._master_key}
 
-        resp = requests.post(url, json=req, timeout=DEFAULT_TIMEOUT)
-        _ = ApiKeys.from_resp(resp)
+        resp = self._send(
+            "delete_api_keys",
+            self._transport.post,
+            url,
+            json=req,
+            timeout=self._request_timeout(timeout, deadline),  # type: ignore
+            deadline=deadline,
+        )
+        _ = self._parse("delete_api_keys", ApiKeys.from_resp, resp)
+
+        if self._key_store is not None:
+            self._key_store.delete(self._email, self._master_key)
 
+    @_instrumented  # type: ignore
+    @_apply_deadline  # type: ignore
     @_ensure_authenticated  # type: ignore
+    @_retry_idempotent  # type: ignore
+    @_limit_rate  # type: ignore
     @_handle_request_failure  # type: ignore
-    def control_device(self, device_id: str, level: int) -> ControlResult:
+    def control_device(
+        self,
+        device_id: str,
+        level: int,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | Deadline | None = None,
+    ) -> ControlResult:
         """
         Control a device by setting the desired level.
 
         :param device_id: the unique identifier of the device to control
         :param level: this is a description of what is returned
+        :param timeout: the timeout for each request, or a (connect, read) tuple of timeouts, in seconds, optional
+        :param deadline: the time allowed for the call, including authentication and retries, in seconds, or a Deadline, optional
         :returns: ControlResult, with the device and level set
         :raises QSException: when the request fails
         """
@@ -123,26 +476,152 @@ class QSClient:
             self._base_uri,
         )
 
-        resp = requests.get(url, timeout=DEFAULT_TIMEOUT)
-        return ControlResult.from_resp(resp)
+        resp = self._send(
+            "control_device",
+            self._transport.get,
+            url,
+            timeout=self._request_timeout(timeout, deadline),  # type: ignore
+            deadline=deadline,
+        )
+        result = self._parse("control_device", ControlResult.from_resp, resp)
+
+        if self._status_cache is not None:
+            self._status_cache.invalidate()
+
+        for listener in list(self._control_listeners):
+            listener(result)
 
+        return result
+
+    @_apply_deadline  # type: ignore
     @_ensure_authenticated  # type: ignore
-    @_handle_request_failure  # type: ignore
-    def get_all_device_status(self) -> DeviceStatuses:
+    def control_devices(
+        self,
+        levels: Mapping[str, int],
+        max_workers: int = DEFAULT_BATCH_MAX_WORKERS,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | Deadline | None = None,
+    ) -> BatchControlResult:
+        """
+        Control multiple devices concurrently.
+
+        Requests are fanned out over a bounded pool of worker threads sharing the
+        client's connection pool.  A failure for one device does not abort the batch.
+
+        :param levels: the desired level for each device, keyed by device identifier
+        :param max_workers: the maximum number of control requests in flight at once
+        :param timeout: the timeout for each request, or a (connect, read) tuple of timeouts, in seconds, optional
+        :param deadline: the time allowed for the whole batch in seconds, or a Deadline, optional
+        :returns: BatchControlResult, with a result or error for every device
+        """
+
+        def control(device_id: str, level: int) -> ControlResult | QSError:
+            try:
+                return self.control_device(
+                    device_id, level, timeout=timeout, deadline=deadline
+                )
+            except QSError as ex:
+                return ex
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            outcomes = list(executor.map(control, levels.keys(), levels.values()))
+        elapsed = time.perf_counter() - start
+
+        results = {}
+        errors = {}
+        for device_id, outcome in zip(levels, outcomes, strict=True):
+            if isinstance(outcome, QSError):
+                errors[device_id] = outcome
+            else:
+                results[device_id] = outcome
+
+        return BatchControlResult(results, errors, elapsed)
+
+    @_instrumented  # type: ignore
+    def get_all_device_status(
+        self,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: float | Deadline | None = None,
+    ) -> DeviceStatuses:
         """
         Retrieve the status of all devices registered to the given API keys.
 
-        :param auth: authentication keys generated by generate_api_keys
+        When a status cache is configured, a cached snapshot may be returned.
+
+        :param timeout: the timeout for each request, or a (connect, read) tuple of timeouts, in seconds, optional
+        :param deadline: the time allowed for the call, including authentication and retries, in seconds, or a Deadline, optional
         :returns: Array of DeviceStatus with device information
         :raises QSException: when the request fails
         """
+        if self._status_cache is not None:
+            # Start the deadline now, so that it covers waiting on another refresh.
+            deadline = Deadline.coerce(
+                deadline if deadline is not None else self._deadline
+            )
+            return self._status_cache.get(
+                functools.partial(
+                    self._fetch_all_device_status, timeout=timeout, deadline=deadline
+                ),
+                deadline,
+            )
+        return self._fetch_all_device_status(timeout=timeout, deadline=deadline)
+
+    @_apply_deadline  # type: ignore
+    @_ensure_authenticated  # type: ignore
+    @_retry_idempotent  # type: ignore
+    @_limit_rate  # type: ignore
+    @_handle_request_failure  # type: ignore
+    def _fetch_all_device_status(
+        self,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        deadline: Deadline | None = None,
+    ) -> DeviceStatuses:
         url = UrlBuilder.build_get_all_device_status_url(
             self._api_keys.read_write_key,  # type: ignore
             self._base_uri,
         )
 
-        resp = requests.get(url, timeout=DEFAULT_TIMEOUT)
-        return DeviceStatuses.from_resp(resp)
+        resp = self._send(
+            "get_all_device_status",
+            self._transport.get,
+            url,
+            timeout=self._request_timeout(timeout, deadline),  # type: ignore
+            deadline=deadline,
+        )
+        return self._parse(
+            "get_all_device_status",
+            functools.partial(
+                DeviceStatuses.from_resp,
+                lazy=self._lazy_parsing,
+                registry=self._device_registry,
+            ),
+            resp,
+        )
+
+    def close(self) -> None:
+        """
+        Release pooled connections.
+
+        A transport supplied by the caller is left open, as it may be shared.
+        """
+        if self._owns_transport:
+            self._transport.close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context, returning the client."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, closing the client."""
+        self.close()
 
+    _instrumented = staticmethod(_instrumented)
+    _apply_deadline = staticmethod(_apply_deadline)
     _ensure_authenticated = staticmethod(_ensure_authenticated)
+    _limit_rate = staticmethod(_limit_rate)
     _handle_request_failure = staticmethod(_handle_request_failure)
+    _retry_idempotent = staticmethod(_retry_idempotent)
@@ -4,7 +4,54 @@ from enum import Enum
 from typing import Final
 
 DEFAULT_BASE_URI: Final = "https://qwikswitch.com/api/v1/"
-DEFAULT_TIMEOUT: Final = 10000
+DEFAULT_CONNECT_TIMEOUT: Final = 5.0
+DEFAULT_READ_TIMEOUT: Final = 15.0
+DEFAULT_TIMEOUT: Final = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+DEFAULT_POOL_CONNECTIONS: Final = 10
+DEFAULT_POOL_MAXSIZE: Final = 10
+DEFAULT_MAX_RETRIES: Final = 0
+DEFAULT_BATCH_MAX_WORKERS: Final = 8
+DEFAULT_MAX_IN_FLIGHT_PER_DEVICE: Final = 1
+DEFAULT_MAX_CONCURRENT_PER_ACCOUNT: Final = 2
+DEFAULT_POLL_INTERVAL: Final = 1.0
+DEFAULT_MAX_POLL_INTERVAL: Final = 60.0
+DEFAULT_POLL_BACKOFF_FACTOR: Final = 2.0
+DEFAULT_HISTORY_CAPACITY: Final = 3600
+DEFAULT_EXPORT_BACKUP_COUNT: Final = 5
+DEFAULT_RETRY_ATTEMPTS: Final = 3
+DEFAULT_RETRY_BASE_DELAY: Final = 0.2
+DEFAULT_RETRY_MAX_DELAY: Final = 5.0
+DEFAULT_RETRY_BUDGET_RATIO: Final = 0.2
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD: Final = 5
+DEFAULT_CIRCUIT_RESET_TIMEOUT: Final = 30.0
+DEFAULT_BRIDGE_TIMEOUT: Final = (1.0, 5.0)
+DEFAULT_BRIDGE_RETRY_AFTER: Final = 30.0
+DEFAULT_LATENCY_BUCKETS: Final = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+DEFAULT_PARSE_BUCKETS: Final = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.05,
+)
+
+INVALID_API_KEY: Final = "INVALID_API_KEY"
+RETRYABLE_STATUS_CODES: Final = frozenset({429, 500, 502, 503, 504})
 
 
 class JsonKeys:
@@ -36,6 +83,29 @@ class DeviceClass(Enum):
     unknown = 999
 
 
+class ChangeType(Enum):
+    """Enum for kinds of device status changes."""
+
+    added = 1
+    removed = 2
+    changed = 3
+
+
+class CircuitState(Enum):
+    """Enum for states of a circuit breaker."""
+
+    closed = 1
+    open = 2
+    half_open = 3
+
+
+class ExportFormat(Enum):
+    """Enum for file formats of exported device status snapshots."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
 DEVICES = {
     "RELAY QS-D-S5": DeviceClass.dimmer,
     "RELAY QS-R-S5": DeviceClass.relay,
@@ -0,0 +1,196 @@
+"""Coalescing of rapid control commands per device."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Self
+
+from .constants import DEFAULT_BATCH_MAX_WORKERS, DEFAULT_MAX_IN_FLIGHT_PER_DEVICE
+
+if TYPE_CHECKING:
+    from .entities import ControlResult
+
+
+class _DeviceQueue:
+    """The in-flight count and the pending command of a single device."""
+
+    __slots__ = ("in_flight", "level", "waiters")
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.level: int | None = None
+        self.waiters: list[Future[ControlResult]] = []
+
+
+class ControlQueue:
+    """
+    A queue in front of control_device that coalesces commands per device.
+
+    While a device has ``max_in_flight_per_device`` requests in flight, further commands
+    for it wait; only the most recently submitted level is sent once a request completes.
+    Every caller receives a future, resolved with the result of the request that carried
+    its command or a later one superseding it.  With the default of one request in flight
+    per device, commands for a device reach the API in the order they were submitted.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_in_flight_per_device: int = DEFAULT_MAX_IN_FLIGHT_PER_DEVICE,
+        max_workers: int = DEFAULT_BATCH_MAX_WORKERS,
+    ) -> None:
+        """
+        Initialize a ControlQueue.
+
+        :param client: the QSClient to send commands with
+        :param max_in_flight_per_device: the maximum number of requests in flight for one device
+        :param max_workers: the maximum number of requests in flight across all devices
+        """
+        self._client = client
+        self._max_in_flight = max(1, max_in_flight_per_device)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="qs-control"
+        )
+        self._devices: dict[str, _DeviceQueue] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+        self._submitted = 0
+        self._sent = 0
+
+    @property
+    def submitted(self) -> int:
+        """
+        The number of commands submitted.
+
+        :return: the number of commands submitted
+        """
+        return self._submitted
+
+    @property
+    def sent(self) -> int:
+        """
+        The number of requests sent to the API.
+
+        :return: the number of requests sent
+        """
+        return self._sent
+
+    @property
+    def coalesced(self) -> int:
+        """
+        The number of commands superseded by a later command before being sent.
+
+        :return: the number of commands not sent
+        """
+        with self._lock:
+            pending = sum(len(queue.waiters) for queue in self._devices.values())
+            return self._submitted - self._sent - pending
+
+    def submit(self, device_id: str, level: int) -> Future[ControlResult]:
+        """
+        Queue a command to set a device to a level.
+
+        :param device_id: the unique identifier of the device to control
+        :param level: the level to set the device to
+        :return: a future resolved with the ControlResult, or the QSError raised by the request
+        :raises RuntimeError: if the queue has been closed
+        """
+        future: Future[ControlResult] = Future()
+        with self._lock:
+            if self._closed:
+                msg = "Cannot submit to a closed ControlQueue"
+                raise RuntimeError(msg)
+
+            self._submitted += 1
+            queue = self._devices.get(device_id)
+            if queue is None:
+                queue = self._devices[device_id] = _DeviceQueue()
+
+            if queue.in_flight < self._max_in_flight and not queue.waiters:
+                self._dispatch(device_id, queue, level, [future])
+            else:
+                queue.level = level
+                queue.waiters.append(future)
+
+        return future
+
+    def control_device(self, device_id: str, level: int) -> ControlResult:
+        """
+        Queue a command and wait for its result.
+
+        :param device_id: the unique identifier of the device to control
+        :param level: the level to set the device to
+        :return: ControlResult, with the device and level set
+        :raises QSException: when the request fails
+        """
+        return self.submit(device_id, level).result()
+
+    def close(self, *, wait: bool = True) -> None:
+        """
+        Stop accepting commands and release the worker threads.
+
+        :param wait: whether to send pending commands and wait for them to complete.  Otherwise pending commands are cancelled.
+        """
+        with self._lock:
+            self._closed = True
+            if wait:
+                self._idle.wait_for(lambda: not self._devices)
+            else:
+                for queue in self._devices.values():
+                    for future in queue.waiters:
+                        future.cancel()
+                    queue.waiters = []
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context, returning the queue."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, sending pending commands and closing the queue."""
+        self.close()
+
+    def _dispatch(
+        self,
+        device_id: str,
+        queue: _DeviceQueue,
+        level: int,
+        waiters: list[Future[ControlResult]],
+    ) -> None:
+        # Called with the lock held.  Commands whose callers all cancelled are not sent.
+        waiters = [
+            future for future in waiters if future.set_running_or_notify_cancel()
+        ]
+        if waiters:
+            self._sent += 1
+        queue.in_flight += 1
+        self._executor.submit(self._send, device_id, queue, level, waiters)
+
+    def _send(
+        self,
+        device_id: str,
+        queue: _DeviceQueue,
+        level: int,
+        waiters: list[Future[ControlResult]],
+    ) -> None:
+        try:
+            if not waiters:
+                return
+            result = self._client.control_device(device_id, level)
+        except Exception as ex:  # noqa: BLE001
+            for future in waiters:
+                future.set_exception(ex)
+        else:
+            for future in waiters:
+                future.set_result(result)
+        finally:
+            with self._lock:
+                queue.in_flight -= 1
+                if queue.waiters:
+                    pending, queue.waiters = queue.waiters, []
+                    self._dispatch(device_id, queue, queue.level, pending)  # type: ignore
+                elif queue.in_flight == 0:
+                    del self._devices[device_id]
+                    self._idle.notify_all()
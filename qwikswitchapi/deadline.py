@@ -0,0 +1,102 @@
+"""Deadlines bounding the total time spent on an API call."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from .exceptions import QSDeadlineExceededError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# The smallest timeout handed to requests, which rejects timeouts of zero or less.
+_MIN_TIMEOUT = 0.001
+
+
+class Deadline:
+    """
+    A point in time by which an API call, including authentication and retries, must finish.
+
+    Request timeouts are clamped to the time remaining, and no request is sent once the
+    deadline has passed.  The read timeout bounds the wait between bytes received, so a
+    response still arriving at the deadline may overrun it by up to that timeout.
+    """
+
+    def __init__(
+        self, seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize a Deadline, starting now.
+
+        :param seconds: the time allowed, in seconds
+        :param clock: the monotonic clock to use, in seconds
+        """
+        self._seconds = seconds
+        self._clock = clock
+        self._expires_at = clock() + seconds
+
+    @property
+    def seconds(self) -> float:
+        """
+        The time allowed.
+
+        :return: the time allowed, in seconds
+        """
+        return self._seconds
+
+    @property
+    def remaining(self) -> float:
+        """
+        The time left before the deadline.
+
+        :return: the time left in seconds, 0 once the deadline has passed
+        """
+        return max(self._expires_at - self._clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the deadline has passed.
+
+        :return: True if the deadline has passed
+        """
+        return self._clock() >= self._expires_at
+
+    def check(self, url: str = "Unknown") -> None:
+        """
+        Check that a request may still be sent.
+
+        :param url: the URL of the request, used in the error message
+        :raises QSDeadlineExceededError: if the deadline has passed
+        """
+        if self.expired:
+            msg = f"Request to {url} not sent: the deadline of {self._seconds}s has passed"
+            raise QSDeadlineExceededError(msg)
+
+    def clamp(
+        self, timeout: float | tuple[float, float]
+    ) -> float | tuple[float, float]:
+        """
+        Limit a request timeout to the time remaining.
+
+        :param timeout: a timeout, or a (connect, read) tuple of timeouts, in seconds
+        :return: the timeout, no longer than the time remaining
+        """
+        remaining = max(self.remaining, _MIN_TIMEOUT)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return min(connect, remaining), min(read, remaining)
+        return min(timeout, remaining)
+
+    @classmethod
+    def coerce(cls, deadline: float | Deadline | None) -> Deadline | None:
+        """
+        Convert a number of seconds to a Deadline starting now.
+
+        :param deadline: the time allowed in seconds, an existing Deadline, or None
+        :return: the Deadline, or None if no deadline was given
+        """
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
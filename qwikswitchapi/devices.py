@@ -0,0 +1,92 @@
+"""Registry of device types and the classes they belong to."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from .constants import DEVICES, DeviceClass
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+
+class DeviceRegistry:
+    """
+    Maps the device types reported by the API to device classes.
+
+    Registries are immutable: ``extend`` returns a new registry, so a registry can be
+    shared between clients and threads.  A registry including the defaults reads
+    ``constants.DEVICES`` when resolving, so types added to it at runtime are still
+    recognised; the registry itself never modifies it.  Types that are not registered
+    resolve to ``DeviceClass.unknown``.
+    """
+
+    __slots__ = ("_defaults", "_devices")
+
+    def __init__(
+        self,
+        devices: Mapping[str, DeviceClass] | None = None,
+        *,
+        include_defaults: bool = True,
+    ) -> None:
+        """
+        Initialize a DeviceRegistry.
+
+        :param devices: the classes of device types, keyed by type, optional.  These take precedence over the defaults.
+        :param include_defaults: whether to include the device types known to this library
+        """
+        self._defaults: Mapping[str, DeviceClass] = DEVICES if include_defaults else {}
+        self._devices: dict[str, DeviceClass] = (
+            dict(devices) if devices is not None else {}
+        )
+
+    @property
+    def devices(self) -> dict[str, DeviceClass]:
+        """
+        The registered device types.
+
+        :return: a copy of the classes of device types, keyed by type
+        """
+        return {**self._defaults, **self._devices}
+
+    def resolve(self, device_type: str) -> DeviceClass:
+        """
+        Look up the class of a device type.
+
+        :param device_type: the type of device, as reported by the API
+        :return: the class of the device type, DeviceClass.unknown if not registered
+        """
+        device_class = self._devices.get(device_type)
+        if device_class is None:
+            return self._defaults.get(device_type, DeviceClass.unknown)
+        return device_class
+
+    def extend(self, devices: Mapping[str, DeviceClass]) -> DeviceRegistry:
+        """
+        Return a new registry with additional device types.
+
+        :param devices: the classes of device types, keyed by type.  These take precedence over those registered.
+        :return: the new registry
+        """
+        return DeviceRegistry(
+            {**self._devices, **devices}, include_defaults=self._defaults is DEVICES
+        )
+
+    def __contains__(self, device_type: object) -> bool:
+        """Return whether a device type is registered."""
+        return device_type in self._devices or device_type in self._defaults
+
+    def __len__(self) -> int:
+        """Return the number of registered device types."""
+        return len(self.devices)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the registered device types."""
+        return iter(self.devices)
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly representation of the registry."""
+        return f"DeviceRegistry({self.devices!r})"
+
+
+DEFAULT_REGISTRY: Final = DeviceRegistry()
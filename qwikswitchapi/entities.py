@@ -3,16 +3,65 @@
 from __future__ import annotations
 
 from http import HTTPStatus
-from typing import Any
+from sys import intern
+from typing import TYPE_CHECKING, Any, ClassVar, overload
 
-from .constants import DEVICES, DeviceClass, JsonKeys
-from .exceptions import QSResponseParseError
+from .constants import RETRYABLE_STATUS_CODES, DeviceClass, JsonKeys
+from .devices import DEFAULT_REGISTRY
+from .exceptions import QSError, QSResponseParseError
 from .utility import ResponseParser
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
 
-class ApiKeys:
+    from .devices import DeviceRegistry
+
+
+class _Entity:
+    """
+    Base class for immutable, slotted entities.
+
+    Instances compare equal, and hash alike, when they are of the same type and all
+    slots are equal, except those listed in ``_derived``.
+    """
+
+    __slots__ = ()
+
+    # Slots computed from the others, left out of comparisons and representations.
+    _derived: ClassVar[tuple[str, ...]] = ()
+    _fields: ClassVar[tuple[str, ...]] = ()
+
+    def __init_subclass__(cls) -> None:
+        """Determine the slots holding the values of the entity."""
+        super().__init_subclass__()
+        cls._fields = tuple(slot for slot in cls.__slots__ if slot not in cls._derived)
+
+    def _key(self) -> tuple:
+        return tuple(getattr(self, slot) for slot in self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether both entities are of the same type, with equal values."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()  # type: ignore
+
+    def __hash__(self) -> int:
+        """Return a hash of the entity's values."""
+        return hash((type(self), self._key()))
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly representation of the entity."""
+        values = ", ".join(
+            f"{slot[1:]}={getattr(self, slot)!r}" for slot in self._fields
+        )
+        return f"{type(self).__name__}({values})"
+
+
+class ApiKeys(_Entity):
     """API keys for the QwikSwitch API."""
 
+    __slots__ = ("_read_key", "_read_write_key")
+
     def __init__(self, read_key: str, read_write_key: str) -> None:
         """
         Initialize an ApiKeys object.
@@ -50,12 +99,15 @@ class ApiKeys:
 
         :param resp: The response object to construct the object from
         :return: the ApiKeys object
+        :raises QSServerError: if the API answered with a server error or 429, which may be retried
         :raises QSRequestError: on failure of the response, or validation error.
         """
+        if resp.status_code in RETRYABLE_STATUS_CODES:
+            ResponseParser.raise_request_error(resp)
         if resp.status_code != HTTPStatus.OK:
             ResponseParser.raise_auth_failure(resp)
 
-        json_data = resp.json()
+        json_data = ResponseParser.parse_json(resp)
 
         if (JsonKeys.OK in json_data and json_data[JsonKeys.OK] == 0) or (
             JsonKeys.ERR in json_data
@@ -65,9 +117,11 @@ class ApiKeys:
         return cls(json_data[JsonKeys.READ_KEY], json_data[JsonKeys.READ_WRITE_KEY])
 
 
-class ControlResult:
+class ControlResult(_Entity):
     """Result of a control operation on a device."""
 
+    __slots__ = ("_device_id", "_level")
+
     def __init__(self, device_id: str, level: int) -> None:
         """
         Initialize a ControlResult object.
@@ -104,22 +158,160 @@ class ControlResult:
         :param resp: The response object to construct the object from
         :return: A ControlResult object
         :raises QSRequestError: on failure of the response, or validation error
+        :raises QSResponseParseError: if a successful response lacks the device or level
         """
         if resp.status_code != HTTPStatus.OK:
             ResponseParser.raise_request_error(resp)
 
-        json_data = resp.json()
+        json_data = ResponseParser.parse_json(resp)
 
         if (JsonKeys.SUCCESS in json_data and not json_data[JsonKeys.SUCCESS]) or (
             JsonKeys.ERROR in json_data
         ):
-            ResponseParser.raise_request_error(resp)
+            ResponseParser.raise_request_error(resp, json_data)
+
+        try:
+            return cls(json_data[JsonKeys.DEVICE], json_data[JsonKeys.LEVEL])
+        except (KeyError, TypeError) as ex:
+            msg = f"Invalid control response: {ex!r}"
+            raise QSResponseParseError(msg) from ex
+
+
+class BatchControlResult:
+    """Result of controlling multiple devices in one batch."""
+
+    def __init__(
+        self,
+        results: dict[str, ControlResult],
+        errors: dict[str, QSError],
+        elapsed: float,
+    ) -> None:
+        """
+        Initialize a BatchControlResult object.
 
-        return cls(json_data[JsonKeys.DEVICE], json_data[JsonKeys.LEVEL])
+        :param results: the successful control results, keyed by device identifier
+        :param errors: the errors raised for devices that failed, keyed by device identifier
+        :param elapsed: the wall-clock time taken by the whole batch, in seconds
+        """
+        self._results = results
+        self._errors = errors
+        self._elapsed = elapsed
+
+    @property
+    def results(self) -> dict[str, ControlResult]:
+        """
+        The successful control results.
 
+        :return: The successful control results, keyed by device identifier
+        """
+        return self._results
 
-class DeviceStatus:
-    """Status of a device."""
+    @property
+    def errors(self) -> dict[str, QSError]:
+        """
+        The errors for devices that could not be controlled.
+
+        :return: The errors raised, keyed by device identifier
+        """
+        return self._errors
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The wall-clock time taken by the whole batch.
+
+        :return: The time taken by the whole batch, in seconds
+        """
+        return self._elapsed
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        Whether every device in the batch was controlled successfully.
+
+        :return: True if no device failed
+        """
+        return not self._errors
+
+
+class BatchStatusResult:
+    """Result of retrieving the device statuses of multiple accounts at once."""
+
+    def __init__(
+        self,
+        results: dict[str, DeviceStatuses],
+        errors: dict[str, QSError],
+        elapsed: float,
+    ) -> None:
+        """
+        Initialize a BatchStatusResult object.
+
+        :param results: the device statuses retrieved, keyed by account identifier
+        :param errors: the errors raised for accounts that failed, keyed by account identifier
+        :param elapsed: the wall-clock time taken by the whole batch, in seconds
+        """
+        self._results = results
+        self._errors = errors
+        self._elapsed = elapsed
+
+    @property
+    def results(self) -> dict[str, DeviceStatuses]:
+        """
+        The device statuses retrieved.
+
+        :return: The device statuses, keyed by account identifier
+        """
+        return self._results
+
+    @property
+    def errors(self) -> dict[str, QSError]:
+        """
+        The errors for accounts whose statuses could not be retrieved.
+
+        :return: The errors raised, keyed by account identifier
+        """
+        return self._errors
+
+    @property
+    def elapsed(self) -> float:
+        """
+        The wall-clock time taken by the whole batch.
+
+        :return: The time taken by the whole batch, in seconds
+        """
+        return self._elapsed
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        Whether the statuses of every account were retrieved successfully.
+
+        :return: True if no account failed
+        """
+        return not self._errors
+
+
+class DeviceStatus(_Entity):
+    """
+    Status of a device.
+
+    Statuses parsed from a response intern their type and firmware strings, as these
+    repeat across the devices of an account and across polls.  The class of the device
+    is resolved by its registry when first read, rather than on construction, which is
+    on the polling hot path.
+    """
+
+    __slots__ = (  # noqa: RUF023 - ordered as the constructor arguments
+        "_device_id",
+        "_device_type",
+        "_firmware",
+        "_epoch",
+        "_rssi",
+        "_value",
+        "_registry",
+        "_device_class",
+    )
+    _derived = ("_registry", "_device_class")
 
     def __init__(  # noqa: PLR0913
         self,
@@ -129,6 +321,8 @@ class DeviceStatus:
         epoch: int,
         rssi: int,
         value: int,
+        *,
+        registry: DeviceRegistry = DEFAULT_REGISTRY,
     ) -> None:
         """
         Initialize a DeviceStatus object.
@@ -139,6 +333,7 @@ class DeviceStatus:
         :param epoch: the epoch time of the last status update
         :param rssi: the signal strength of the device
         :param value: the current value of the device
+        :param registry: the registry resolving the class of the device, optional
         """
         self._device_id = device_id
         self._device_type = device_type
@@ -146,6 +341,7 @@ class DeviceStatus:
         self._epoch = epoch
         self._rssi = rssi
         self._value = value
+        self._registry = registry
 
     @property
     def device_id(self) -> str:
@@ -202,22 +398,30 @@ class DeviceStatus:
         return self._value
 
     @property
-    def device_class(self) -> DeviceClass | Any:
+    def device_class(self) -> DeviceClass:
         """
         The class of the device.
 
-        :return: The class of the device
+        :return: The class of the device, as resolved by the registry it was constructed with
         """
-        if self._device_type in DEVICES:
-            return DEVICES[self._device_type]
-        return DeviceClass.unknown
+        try:
+            return self._device_class
+        except AttributeError:
+            self._device_class = self._registry.resolve(self._device_type)
+            return self._device_class
 
     @classmethod
-    def from_json(cls, json_data) -> DeviceStatus:  # noqa: ANN001
+    def from_json(
+        cls,
+        json_data,  # noqa: ANN001
+        *,
+        registry: DeviceRegistry = DEFAULT_REGISTRY,
+    ) -> DeviceStatus:
         """
         Construct a DeviceStatus object from JSON data.
 
         :param json_data: The JSON data to construct the object from
+        :param registry: the registry resolving the class of the device, optional
         :return: A DeviceStatus object
         :raises QSRequestError: on validation error
         """
@@ -226,21 +430,53 @@ class DeviceStatus:
             raise QSResponseParseError(msg)
 
         device_id = next(iter(json_data))  # Only expecting one key
-        state_json_data = json_data[device_id]
+        return cls.from_state(device_id, json_data[device_id], registry=registry)
 
-        rssi = int(state_json_data[JsonKeys.RSSI].replace("%", ""))
-        return cls(
-            device_id,
-            state_json_data[JsonKeys.TYPE],
-            state_json_data[JsonKeys.FIRMWARE],
-            state_json_data[JsonKeys.EPOCH],
-            rssi,
-            state_json_data[JsonKeys.VALUE],
-        )
+    @classmethod
+    def from_state(
+        cls,
+        device_id: str,
+        state_json_data,  # noqa: ANN001
+        *,
+        registry: DeviceRegistry = DEFAULT_REGISTRY,
+    ) -> DeviceStatus:
+        """
+        Construct a DeviceStatus object from the JSON state of one device.
+
+        :param device_id: the unique device identifier
+        :param state_json_data: the JSON state of the device, as found under its identifier in the response
+        :param registry: the registry resolving the class of the device, optional
+        :return: A DeviceStatus object
+        :raises QSResponseParseError: if the state is invalid
+        """
+        try:
+            rssi = state_json_data[JsonKeys.RSSI]
+            return cls(
+                device_id,
+                intern(state_json_data[JsonKeys.TYPE]),
+                intern(state_json_data[JsonKeys.FIRMWARE]),
+                state_json_data[JsonKeys.EPOCH],
+                int(rssi[:-1]) if rssi[-1:] == "%" else int(rssi),
+                state_json_data[JsonKeys.VALUE],
+                registry=registry,
+            )
+        except (KeyError, TypeError, ValueError, AttributeError) as ex:
+            msg = f"Invalid status for device {device_id}: {ex!r}"
+            raise QSResponseParseError(msg) from ex
 
 
 class DeviceStatuses:
-    """Statuses of multiple devices."""
+    """
+    Statuses of multiple devices.
+
+    Statuses can be looked up by device identifier (``statuses["@123450"]``) or by
+    position, and filtered by device class.  The lookup indexes are built lazily on
+    first use and reference the underlying list rather than copying it.
+
+    When constructed with ``lazy=True``, the raw response mapping is kept and each
+    DeviceStatus is only parsed when it is first accessed, so validation errors for a
+    device are raised on access rather than on construction.
+    """
 
     def __init__(self, statuses: list[DeviceStatus]) -> None:
         """
@@ -248,40 +484,211 @@ class DeviceStatuses:
 
         :param statuses: The list of device statuses
         """
-        self._statuses = statuses
+        self._statuses: list[DeviceStatus] | None = statuses
+        self._raw: Mapping[str, Any] | None = None
+        self._registry = DEFAULT_REGISTRY
+        self._device_ids: list[str] | None = None
+        self._by_id: dict[str, DeviceStatus] | None = None
+        self._by_class: dict[DeviceClass, list[DeviceStatus]] | None = None
 
     @property
     def statuses(self) -> list[DeviceStatus]:
         """
         The list of device statuses.
 
+        In lazy mode, accessing this parses every device that has not been parsed yet.
+
         :return: The list of device statuses
         """
+        if self._statuses is None:
+            self._statuses = [self._materialize(d) for d in self._device_ids]  # type: ignore
         return self._statuses
 
+    @property
+    def lazy(self) -> bool:
+        """
+        Whether device statuses are parsed on access.
+
+        :return: True if device statuses are parsed on access
+        """
+        return self._raw is not None
+
+    def _materialize(self, device_id: str) -> DeviceStatus:
+        status = self._by_id.get(device_id)  # type: ignore
+        if status is None:
+            status = DeviceStatus.from_state(
+                device_id,
+                self._raw[device_id],  # type: ignore
+                registry=self._registry,
+            )
+            self._by_id[device_id] = status  # type: ignore
+        return status
+
+    def _id_index(self) -> dict[str, DeviceStatus]:
+        if self._by_id is None:
+            self._by_id = {status.device_id: status for status in self.statuses}
+        return self._by_id
+
+    def _class_index(self) -> dict[DeviceClass, list[DeviceStatus]]:
+        if self._by_class is None:
+            index: dict[DeviceClass, list[DeviceStatus]] = {}
+            for status in self.statuses:
+                index.setdefault(status.device_class, []).append(status)
+            self._by_class = index
+        return self._by_class
+
+    def get(self, device_id: str, default: Any = None) -> DeviceStatus | Any:
+        """
+        Look up the status of a device.
+
+        :param device_id: the unique identifier of the device
+        :param default: the value to return if the device is not present
+        :return: the status of the device, or default if not present
+        :raises QSResponseParseError: in lazy mode, if the status of the device is invalid
+        """
+        if self._raw is not None:
+            return self._materialize(device_id) if device_id in self else default
+        return self._id_index().get(device_id, default)
+
+    def by_class(self, device_class: DeviceClass) -> list[DeviceStatus]:
+        """
+        Return the statuses of all devices of a given class.
+
+        :param device_class: the class of device
+        :return: the statuses of devices of the given class, in response order
+        """
+        return self._class_index().get(device_class, [])
+
+    @overload
+    def __getitem__(self, key: str) -> DeviceStatus: ...
+
+    @overload
+    def __getitem__(self, key: int) -> DeviceStatus: ...
+
+    def __getitem__(self, key: str | int) -> DeviceStatus:
+        """
+        Look up a status by device identifier, or by position.
+
+        :raises KeyError: if no device with the given identifier is present
+        :raises QSResponseParseError: in lazy mode, if the status of the device is invalid
+        """
+        if self._raw is not None:
+            if isinstance(key, str):
+                if key not in self:
+                    raise KeyError(key)
+                return self._materialize(key)
+            return self._materialize(self._device_ids[key])  # type: ignore
+        if isinstance(key, str):
+            return self._id_index()[key]
+        return self._statuses[key]  # type: ignore
+
+    def __contains__(self, device_id: object) -> bool:
+        """Return whether a device with the given identifier is present."""
+        if self._raw is not None:
+            return device_id != JsonKeys.SUCCESS and device_id in self._raw
+        return device_id in self._id_index()
+
+    def __len__(self) -> int:
+        """Return the number of devices."""
+        if self._device_ids is not None:
+            return len(self._device_ids)
+        return len(self._statuses)  # type: ignore
+
+    def __iter__(self) -> Iterator[DeviceStatus]:
+        """Iterate over the statuses in response order."""
+        if self._statuses is None:
+            return (self._materialize(d) for d in self._device_ids)  # type: ignore
+        return iter(self._statuses)
+
+    def stream(self) -> Iterator[DeviceStatus]:
+        """
+        Iterate over the statuses in response order, without retaining them.
+
+        In lazy mode, devices that have not been accessed yet are parsed for the iteration
+        only, so a full snapshot never has to be held in memory at once.
+
+        :return: an iterator of device statuses
+        :raises QSResponseParseError: in lazy mode, if the status of a device is invalid
+        """
+        if self._statuses is not None:
+            yield from self._statuses
+            return
+
+        by_id, raw, registry = self._by_id, self._raw, self._registry
+        for device_id in self._device_ids:  # type: ignore
+            status = by_id.get(device_id)  # type: ignore
+            yield (
+                status
+                if status is not None
+                else DeviceStatus.from_state(
+                    device_id,
+                    raw[device_id],  # type: ignore
+                    registry=registry,
+                )
+            )
+
     @classmethod
-    def from_resp(cls, resp) -> DeviceStatuses:  # noqa: ANN001
+    def from_resp(
+        cls,
+        resp,  # noqa: ANN001
+        *,
+        lazy: bool = False,
+        registry: DeviceRegistry = DEFAULT_REGISTRY,
+    ) -> DeviceStatuses:
         """
-        Construct a DeviceStatuses object from JSON data.
+        Construct a DeviceStatuses object from a response.
 
-        :param json_data: The JSON data to construct the object from
+        :param resp: The response object to construct the object from
+        :param lazy: whether to defer parsing each device status until it is accessed
+        :param registry: the registry resolving the classes of devices, optional
         :return: A DeviceStatuses object
         :raises QSRequestError: on validation error
         """
         if resp.status_code != HTTPStatus.OK:
             ResponseParser.raise_request_error(resp)
 
-        json_data = resp.json()
+        json_data = ResponseParser.parse_json(resp)
 
         if (JsonKeys.SUCCESS in json_data and not json_data[JsonKeys.SUCCESS]) or (
             JsonKeys.ERROR in json_data
         ):
-            ResponseParser.raise_request_error(resp)
+            ResponseParser.raise_request_error(resp, json_data)
 
-        statuses = [
-            DeviceStatus.from_json({key: json_data[key]})
-            for key in json_data
-            if key != JsonKeys.SUCCESS
-        ]
+        return cls.from_json(json_data, lazy=lazy, registry=registry)
 
-        return cls(statuses)
+    @classmethod
+    def from_json(
+        cls,
+        json_data: Mapping[str, Any],
+        *,
+        lazy: bool = False,
+        registry: DeviceRegistry = DEFAULT_REGISTRY,
+    ) -> DeviceStatuses:
+        """
+        Construct a DeviceStatuses object from a validated response mapping.
+
+        Device statuses are built in a single pass over the mapping, or on access when lazy.
+
+        :param json_data: The JSON data of the response, keyed by device identifier
+        :param lazy: whether to defer parsing each device status until it is accessed
+        :param registry: the registry resolving the classes of devices, optional
+        :return: A DeviceStatuses object
+        :raises QSResponseParseError: if a device status is invalid, and not lazy
+        """
+        if lazy:
+            instance = cls([])
+            instance._statuses = None
+            instance._raw = json_data
+            instance._registry = registry
+            instance._device_ids = [d for d in json_data if d != JsonKeys.SUCCESS]
+            instance._by_id = {}
+            return instance
+
+        from_state = DeviceStatus.from_state
+        return cls(
+            [
+                from_state(device_id, state, registry=registry)
+                for device_id, state in json_data.items()
+                if device_id != JsonKeys.SUCCESS
+            ]
+        )
@@ -25,6 +25,22 @@ class QSRequestFailedError(QSError):
     """
 
 
+class QSCircuitOpenError(QSRequestFailedError):
+    """
+    Exception raised when a request is not sent because the circuit breaker is open.
+
+    Source exceptions are chained.
+    """
+
+
+class QSDeadlineExceededError(QSRequestFailedError):
+    """
+    Exception raised when a request is not sent because its deadline has passed.
+
+    Source exceptions are chained.
+    """
+
+
 class QSRequestError(QSError):
     """
     Exception raised by the Qwikswitch API when a request fails.
@@ -33,9 +49,38 @@ class QSRequestError(QSError):
     """
 
 
+class QSServerError(QSRequestFailedError, QSRequestError):
+    """
+    Exception raised when the API answers with a server error, or asks to slow down.
+
+    Raised for 5xx and 429 responses, which are worth retrying, and count as failures
+    towards a circuit breaker.
+
+    Source exceptions are chained.
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """
+        Initialize a QSServerError.
+
+        :param message: the message describing the failure
+        :param retry_after: the number of seconds the API asked to wait before retrying, if any
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class QSResponseParseError(QSRequestError):
     """
     Exception raised by the Qwikswitch API when validations fail on a response.
 
     Source exceptions are chained.
     """
+
+
+class QSApiKeyRejectedError(QSRequestError):
+    """
+    Exception raised by the Qwikswitch API when the API key used is not valid.
+
+    Source exceptions are chained.
+    """
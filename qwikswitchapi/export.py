@@ -0,0 +1,257 @@
+"""Streaming export of device status snapshots to NDJSON or CSV files."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Self
+
+from .constants import DEFAULT_EXPORT_BACKUP_COUNT, ExportFormat
+from .entities import DeviceStatuses
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .entities import DeviceStatus
+
+_READ_CHUNK_SIZE = 1 << 20
+
+EXPORT_FIELDS = (
+    "timestamp",
+    "device_id",
+    "type",
+    "firmware",
+    "epoch",
+    "rssi",
+    "value",
+    "device_class",
+)
+
+
+class _CountingWriter:
+    """Forwards writes to a text file, counting the UTF-8 encoded bytes written."""
+
+    def __init__(self, file: IO[str], size: int) -> None:
+        self.file = file
+        self.size = size
+
+    def write(self, text: str) -> int:
+        self.size += len(text) if text.isascii() else len(text.encode("utf-8"))
+        return self.file.write(text)
+
+
+class SnapshotExporter:
+    """
+    Writes device status snapshots to a file, one record per device, as they are parsed.
+
+    Records are written while iterating over a snapshot, so no list of rows is built.
+    Together with a client constructed with ``lazy_parsing=True``, a snapshot's devices
+    are parsed and written one at a time.  Every record carries the time the snapshot was
+    written.  When ``max_bytes`` is set, the file is rotated after the snapshot that makes
+    it reach that size, renaming it with a suffix of ``.1``, ``.2`` and so on, as
+    ``logging.handlers.RotatingFileHandler`` does.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str | os.PathLike[str],
+        export_format: ExportFormat | str = ExportFormat.ndjson,
+        *,
+        compress: bool = False,
+        append: bool = False,
+        max_bytes: int | None = None,
+        backup_count: int = DEFAULT_EXPORT_BACKUP_COUNT,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize a SnapshotExporter.  The file is opened on the first write.
+
+        :param path: the path of the file to write
+        :param export_format: ExportFormat.ndjson or ExportFormat.csv, or their names
+        :param compress: whether to gzip the file
+        :param append: whether to append to an existing file, rather than replace it.  A CSV header is only written to an empty file.
+        :param max_bytes: the size of the file in bytes, before compression, at which it is rotated, optional.  Never rotated if not supplied.  An appended gzip file is decompressed once to find its size.
+        :param backup_count: the number of rotated files kept
+        :param clock: the clock used to timestamp snapshots, in seconds
+        :raises ValueError: if the format is unknown
+        """
+        self._path = Path(path)
+        self._format = ExportFormat(export_format)
+        self._compress = compress
+        self._append = append
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = None
+        self._writer: _CountingWriter | None = None
+        self._csv_writer: Any = None
+        self._records = 0
+        self._rotations = 0
+
+    @property
+    def path(self) -> Path:
+        """
+        The path of the file written.
+
+        :return: the path of the current file
+        """
+        return self._path
+
+    @property
+    def export_format(self) -> ExportFormat:
+        """
+        The format of the file written.
+
+        :return: the format of the file
+        """
+        return self._format
+
+    @property
+    def records_written(self) -> int:
+        """
+        The number of device records written, across rotations.
+
+        :return: the number of records written
+        """
+        return self._records
+
+    @property
+    def rotations(self) -> int:
+        """
+        The number of times the file was rotated.
+
+        :return: the number of rotations
+        """
+        return self._rotations
+
+    def write(
+        self,
+        statuses: DeviceStatuses | Iterable[DeviceStatus],
+        timestamp: float | None = None,
+    ) -> int:
+        """
+        Write a snapshot, one record per device.
+
+        :param statuses: the snapshot, typically the result of get_all_device_status
+        :param timestamp: the time of the snapshot, in seconds.  Defaults to now.
+        :return: the number of records written
+        :raises QSResponseParseError: if the status of a device in a lazy snapshot is invalid
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+
+        with self._lock:
+            if self._writer is None:
+                self._open()
+            count = 0
+            try:
+                if self._format is ExportFormat.csv:
+                    writerow = self._csv_writer.writerow
+                    for row in _rows(statuses, timestamp):
+                        writerow(row)
+                        count += 1
+                else:
+                    write = self._writer.write  # type: ignore
+                    dumps = json.JSONEncoder(separators=(",", ":")).encode
+                    for row in _rows(statuses, timestamp):
+                        write(dumps(dict(zip(EXPORT_FIELDS, row, strict=True))))
+                        write("\n")
+                        count += 1
+            finally:
+                self._records += count
+                self._file.flush()  # type: ignore
+
+            if self._max_bytes is not None and self._writer.size >= self._max_bytes:  # type: ignore
+                self._rotate()
+        return count
+
+    def close(self) -> None:
+        """Close the file."""
+        with self._lock:
+            self._close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context, returning the exporter."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, closing the file."""
+        self.close()
+
+    def _open(self) -> None:
+        append = self._append and self._path.exists()
+        mode = "at" if append else "wt"
+        if self._compress:
+            file = gzip.open(  # noqa: SIM115
+                self._path, mode, encoding="utf-8", newline=""
+            )
+        else:
+            file = self._path.open(mode, encoding="utf-8", newline="")
+        size = self._uncompressed_size() if append else 0
+
+        self._file = file
+        self._writer = _CountingWriter(file, size)
+        if self._format is ExportFormat.csv:
+            self._csv_writer = csv.writer(self._writer)
+            if size == 0:
+                self._csv_writer.writerow(EXPORT_FIELDS)
+
+    def _uncompressed_size(self) -> int:
+        if not self._compress:
+            return self._path.stat().st_size
+
+        # The gzip trailer only records the size of its own member, modulo 4 GiB, so
+        # count the bytes of every member instead.
+        size = 0
+        with gzip.open(self._path, "rb") as file:
+            while chunk := file.read(_READ_CHUNK_SIZE):
+                size += len(chunk)
+        return size
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._writer = None
+        self._csv_writer = None
+
+    def _rotate(self) -> None:
+        self._close()
+        if self._backup_count > 0:
+            for index in range(self._backup_count - 1, 0, -1):
+                source = self._backup(index)
+                if source.exists():
+                    source.replace(self._backup(index + 1))
+            self._path.replace(self._backup(1))
+        else:
+            self._path.unlink()
+        # Rotated files are complete; the next file starts empty, even in append mode.
+        self._append = False
+        self._rotations += 1
+
+    def _backup(self, index: int) -> Path:
+        return self._path.with_name(f"{self._path.name}.{index}")
+
+
+def _rows(
+    statuses: DeviceStatuses | Iterable[DeviceStatus], timestamp: float
+) -> Iterator[tuple]:
+    if isinstance(statuses, DeviceStatuses):
+        statuses = statuses.stream()
+    for status in statuses:
+        yield (
+            timestamp,
+            status.device_id,
+            status.device_type,
+            status.firmware,
+            int(status.epoch),
+            status.rssi,
+            status.value,
+            status.device_class.name,
+        )
@@ -0,0 +1,528 @@
+"""Polling of many accounts across a pool of worker processes."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait
+from typing import TYPE_CHECKING, Any, Self
+
+from .changes import ChangeFeed
+from .client import QSClient
+from .constants import (
+    DEFAULT_BASE_URI,
+    DEFAULT_BATCH_MAX_WORKERS,
+    DEFAULT_POLL_INTERVAL,
+    ChangeType,
+)
+from .exceptions import QSError
+from .transport import HttpTransport
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import BaseContext
+    from multiprocessing.process import BaseProcess
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long the parent waits for results before checking on its workers.
+_SUPERVISE_INTERVAL = 0.1
+
+_Account = tuple[str, str, str, str]
+_Record = tuple[str, str, int, int, int, int]
+
+
+class FleetChange:
+    """A change in the status of one device of one account, as reported by a worker."""
+
+    __slots__ = (
+        "_account_id",
+        "_change_type",
+        "_device_id",
+        "_epoch",
+        "_rssi",
+        "_value",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        account_id: str,
+        device_id: str,
+        change_type: ChangeType,
+        *,
+        epoch: int,
+        rssi: int,
+        value: int,
+    ) -> None:
+        """
+        Initialize a FleetChange.
+
+        :param account_id: the identifier of the account
+        :param device_id: the unique identifier of the device
+        :param change_type: whether the device was added, removed or changed
+        :param epoch: the epoch of the device's status, the last known one if removed
+        :param rssi: the signal strength of the device, the last known one if removed
+        :param value: the value of the device, the last known one if removed
+        """
+        self._account_id = account_id
+        self._device_id = device_id
+        self._change_type = change_type
+        self._epoch = epoch
+        self._rssi = rssi
+        self._value = value
+
+    @property
+    def account_id(self) -> str:
+        """
+        The identifier of the account.
+
+        :return: the identifier of the account
+        """
+        return self._account_id
+
+    @property
+    def device_id(self) -> str:
+        """
+        The unique identifier of the device.
+
+        :return: the unique identifier of the device
+        """
+        return self._device_id
+
+    @property
+    def change_type(self) -> ChangeType:
+        """
+        The kind of change.
+
+        :return: whether the device was added, removed or changed
+        """
+        return self._change_type
+
+    @property
+    def epoch(self) -> int:
+        """
+        The epoch of the device's status.
+
+        :return: the epoch, the last known one if the device was removed
+        """
+        return self._epoch
+
+    @property
+    def rssi(self) -> int:
+        """
+        The signal strength of the device.
+
+        :return: the RSSI, the last known one if the device was removed
+        """
+        return self._rssi
+
+    @property
+    def value(self) -> int:
+        """
+        The value of the device.
+
+        :return: the value, the last known one if the device was removed
+        """
+        return self._value
+
+    @classmethod
+    def from_record(cls, record: _Record) -> FleetChange:
+        """
+        Construct a FleetChange from the tuple sent by a worker.
+
+        :param record: (account_id, device_id, change type value, epoch, rssi, value)
+        :return: the FleetChange
+        """
+        account_id, device_id, change_type, epoch, rssi, value = record
+        return cls(
+            account_id,
+            device_id,
+            ChangeType(change_type),
+            epoch=epoch,
+            rssi=rssi,
+            value=value,
+        )
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly representation of the change."""
+        return (
+            f"FleetChange({self._change_type.name}, {self._account_id!r}, "
+            f"{self._device_id!r}, value={self._value})"
+        )
+
+
+class FleetFailure:
+    """An unexpected error raised while a worker polled one account."""
+
+    __slots__ = ("_account_id", "_error")
+
+    def __init__(self, account_id: str, error: str) -> None:
+        """
+        Initialize a FleetFailure.
+
+        :param account_id: the identifier of the account
+        :param error: a description of the error, with its type
+        """
+        self._account_id = account_id
+        self._error = error
+
+    @property
+    def account_id(self) -> str:
+        """
+        The identifier of the account.
+
+        :return: the identifier of the account
+        """
+        return self._account_id
+
+    @property
+    def error(self) -> str:
+        """
+        A description of the error.
+
+        :return: the type and message of the exception raised in the worker
+        """
+        return self._error
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly representation of the failure."""
+        return f"FleetFailure({self._account_id!r}, {self._error!r})"
+
+
+def _poll_shard(  # noqa: PLR0913
+    index: int,
+    accounts: list[_Account],
+    conn: Connection,
+    *,
+    interval: float,
+    emit_initial: bool,
+    threads: int,
+    client_options: dict[str, Any],
+) -> None:
+    """
+    Poll a shard of accounts until stopped, sending compact change records to the parent.
+
+    Runs in a worker process, connected to the parent by its own pipe, so that a worker
+    dying cannot leave a lock shared with other workers held.  Each message sent is
+    (worker index, polls, errors, records, failures); any message received stops the
+    worker.  Failures are (account_id, error) pairs for unexpected exceptions, which
+    would otherwise kill the worker and have it restarted over and over.
+    """
+    transport = HttpTransport(pool_maxsize=threads)
+    clients = {
+        account_id: QSClient(email, master_key, base_uri, transport, **client_options)
+        for account_id, email, master_key, base_uri in accounts
+    }
+    feeds = {
+        account_id: ChangeFeed(client, interval, emit_initial=emit_initial)
+        for account_id, client in clients.items()
+    }
+
+    def poll(account_id: str) -> list[_Record] | str | None:
+        try:
+            changes = feeds[account_id].poll()
+        except QSError as ex:
+            _LOGGER.debug("Polling account %s failed: %s", account_id, ex)
+            return None
+        except Exception as ex:
+            _LOGGER.exception(
+                "Polling account %s raised an unexpected error", account_id
+            )
+            return f"{type(ex).__name__}: {ex}"
+        records = []
+        for change in changes:
+            status = change.current if change.current is not None else change.previous
+            records.append(
+                (
+                    account_id,
+                    status.device_id,  # type: ignore
+                    change.change_type.value,
+                    int(status.epoch),  # type: ignore
+                    status.rssi,  # type: ignore
+                    status.value,  # type: ignore
+                )
+            )
+        return records
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+            while True:
+                start = time.monotonic()
+                records: list[_Record] = []
+                failures: list[tuple[str, str]] = []
+                errors = 0
+                for account_id, outcome in zip(
+                    clients, executor.map(poll, clients), strict=True
+                ):
+                    if outcome is None:
+                        errors += 1
+                    elif isinstance(outcome, str):
+                        errors += 1
+                        failures.append((account_id, outcome))
+                    else:
+                        records.extend(outcome)
+                conn.send((index, len(clients), errors, records, failures))
+                if conn.poll(max(interval - (time.monotonic() - start), 0.0)):
+                    break
+    except (BrokenPipeError, EOFError):
+        pass  # The parent has gone away.
+    finally:
+        transport.close()
+        conn.close()
+
+
+class FleetPoller:
+    """
+    Polls device statuses for many accounts across a pool of worker processes.
+
+    Accounts are sharded round-robin over the workers.  Each worker runs its own QSClient
+    per account and diffs successive snapshots itself, sending only compact change records
+    to the parent, so JSON decoding and entity construction scale across cores.  Workers
+    that exit unexpectedly are restarted with the same shard; the devices of a restarted
+    shard are reported as added again when ``emit_initial`` is set.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        *,
+        emit_initial: bool = True,
+        threads_per_worker: int = DEFAULT_BATCH_MAX_WORKERS,
+        mp_context: BaseContext | None = None,
+        **client_options: Any,
+    ) -> None:
+        """
+        Initialize a FleetPoller.
+
+        :param workers: the number of worker processes, optional.  Defaults to the number of CPUs.
+        :param interval: the number of seconds between polls of each account
+        :param emit_initial: whether devices in an account's first snapshot are reported as added
+        :param threads_per_worker: the number of requests each worker keeps in flight
+        :param mp_context: the multiprocessing context to start workers with, optional
+        :param client_options: keyword arguments passed to every QSClient.  They must be picklable.
+        """
+        self._workers = max(1, workers or os.cpu_count() or 1)
+        self._interval = interval
+        self._emit_initial = emit_initial
+        self._threads = threads_per_worker
+        self._context = mp_context or multiprocessing.get_context()
+        self._client_options = client_options
+        self._accounts: dict[str, _Account] = {}
+        self._shards: list[list[_Account]] = []
+        self._processes: list[BaseProcess] = []
+        self._connections: list[Connection] = []
+        self._pending: deque[_Record | FleetFailure] = deque()
+        self._running = False
+        self._started_at = 0.0
+        self._polls = 0
+        self._errors = 0
+        self._changes = 0
+        self._restarts = 0
+
+    @property
+    def accounts(self) -> list[str]:
+        """
+        The identifiers of the accounts polled.
+
+        :return: the account identifiers
+        """
+        return list(self._accounts)
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the workers have been started and not stopped.
+
+        :return: True while running
+        """
+        return self._running
+
+    @property
+    def worker_pids(self) -> list[int | None]:
+        """
+        The process identifiers of the workers.
+
+        :return: the process identifier of each worker
+        """
+        return [process.pid for process in self._processes]
+
+    def add_account(
+        self,
+        account_id: str,
+        email: str,
+        master_key: str,
+        base_uri: str = DEFAULT_BASE_URI,
+    ) -> None:
+        """
+        Add an account to poll.  Accounts must be added before starting.
+
+        :param account_id: the identifier of the account
+        :param email: the email address registered on https://qwikswitch.com
+        :param master_key: the master key of the account's Wi-Fi bridge
+        :param base_uri: the base URI of the Qwikswitch API, optional
+        :raises RuntimeError: if the poller is running
+        """
+        if self.running:
+            msg = "Accounts cannot be added to a running FleetPoller"
+            raise RuntimeError(msg)
+        self._accounts[account_id] = (account_id, email, master_key, base_uri)
+
+    def start(self) -> None:
+        """Start the worker processes.  Does nothing if they are already running."""
+        if self._running:
+            return
+        accounts = list(self._accounts.values())
+        count = min(self._workers, len(accounts)) or 1
+        self._shards = [accounts[i::count] for i in range(count)]
+        self._started_at = time.monotonic()
+        self._processes = []
+        self._connections = []
+        for index in range(count):
+            process, conn = self._spawn(index)
+            self._processes.append(process)
+            self._connections.append(conn)
+        self._running = True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the worker processes, terminating any that do not exit within the timeout.
+
+        Changes reported while stopping are kept, and returned by the next call to changes.
+
+        :param timeout: the number of seconds to wait for workers to exit
+        """
+        if not self._running:
+            return
+        self._running = False
+
+        for conn in self._connections:
+            with contextlib.suppress(OSError):
+                conn.send(None)
+
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            while process.is_alive() and time.monotonic() < deadline:
+                # Workers blocked sending results cannot exit until those are read.
+                self._pending.extend(self._receive(0))
+                process.join(_SUPERVISE_INTERVAL)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+        self._pending.extend(self._receive(0))
+        for conn in self._connections:
+            conn.close()
+
+    def __enter__(self) -> Self:
+        """Start the workers, returning the poller."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the workers."""
+        self.stop()
+
+    def changes(
+        self, duration: float | None = None
+    ) -> Iterator[FleetChange | FleetFailure]:
+        """
+        Yield changes as workers report them, restarting workers that have died.
+
+        An account whose polling raised an unexpected exception, rather than a QSError,
+        is reported as a FleetFailure, and polled again at the next interval.
+
+        Changes not yet yielded when iteration ends, or reported while stopping, are
+        yielded first by the next call, even once the poller is stopped.
+
+        :param duration: the number of seconds to iterate for, optional.  Iterates until stopped if not supplied.
+        :return: an iterator of changes
+        """
+        until = time.monotonic() + duration if duration is not None else None
+        while self._running and (until is None or time.monotonic() < until):
+            self._supervise()
+            self._pending.extend(self._receive(_SUPERVISE_INTERVAL))
+            yield from self._drain()
+        yield from self._drain()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report the throughput of the fleet since it was started.
+
+        :return: counts of polls, failed polls, changes and worker restarts, with rates per second
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "workers": len(self._processes),
+            "accounts": len(self._accounts),
+            "polls": self._polls,
+            "errors": self._errors,
+            "changes": self._changes,
+            "restarts": self._restarts,
+            "elapsed": elapsed,
+            "polls_per_second": self._polls / elapsed if elapsed else 0.0,
+            "changes_per_second": self._changes / elapsed if elapsed else 0.0,
+        }
+
+    def _spawn(self, index: int) -> tuple[BaseProcess, Connection]:
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_poll_shard,
+            args=(index, self._shards[index], child_conn),
+            kwargs={
+                "interval": self._interval,
+                "emit_initial": self._emit_initial,
+                "threads": self._threads,
+                "client_options": self._client_options,
+            },
+            name=f"qs-fleet-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return process, conn
+
+    def _supervise(self) -> None:
+        for index, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+            _LOGGER.warning(
+                "Fleet worker %s exited with code %s, restarting",
+                index,
+                process.exitcode,
+            )
+            self._connections[index].close()
+            with contextlib.suppress(ValueError):
+                process.close()
+            self._processes[index], self._connections[index] = self._spawn(index)
+            self._restarts += 1
+
+    def _drain(self) -> Iterator[FleetChange | FleetFailure]:
+        while self._pending:
+            item = self._pending.popleft()
+            yield (
+                item
+                if isinstance(item, FleetFailure)
+                else FleetChange.from_record(item)
+            )
+
+    def _receive(self, timeout: float) -> list[_Record | FleetFailure]:
+        items: list[_Record | FleetFailure] = []
+        open_connections = [conn for conn in self._connections if not conn.closed]
+        for conn in wait(open_connections, timeout):
+            try:
+                _, polls, errors, batch, failures = conn.recv()  # type: ignore
+            except (EOFError, OSError):
+                continue  # The worker died; _supervise restarts it.
+            self._polls += polls
+            self._errors += errors
+            self._changes += len(batch)
+            items.extend(batch)
+            items.extend(FleetFailure(*failure) for failure in failures)
+        return items
@@ -0,0 +1,209 @@
+"""Columnar history of device statuses for long-running telemetry."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from bisect import bisect_left
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any
+
+from .constants import DEFAULT_HISTORY_CAPACITY
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is not installed
+    np = None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .entities import DeviceStatus
+
+_COLUMNS = {"timestamp": "d", "epoch": "q", "rssi": "b", "value": "h"}
+
+
+class _DeviceSeries:
+    """Ring buffers holding one column per field for a single device."""
+
+    def __init__(self, capacity: int, use_numpy: bool) -> None:  # noqa: FBT001
+        self.capacity = capacity
+        self.head = 0
+        self.size = 0
+        if use_numpy:
+            self.columns = {
+                name: np.zeros(capacity, dtype=typecode)  # type: ignore
+                for name, typecode in _COLUMNS.items()
+            }
+        else:
+            self.columns = {
+                name: array(typecode, bytes(array(typecode).itemsize * capacity))
+                for name, typecode in _COLUMNS.items()
+            }
+
+    def append(self, timestamp: float, epoch: int, rssi: int, value: int) -> None:
+        columns = self.columns
+        head = self.head
+        columns["timestamp"][head] = timestamp
+        columns["epoch"][head] = epoch
+        columns["rssi"][head] = rssi
+        columns["value"][head] = value
+        self.head = (head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def ordered(self, name: str) -> Any:
+        column = self.columns[name]
+        if self.size < self.capacity:
+            return column[: self.size]
+        if np is not None and not isinstance(column, array):
+            return np.concatenate((column[self.head :], column[: self.head]))
+        return column[self.head :] + column[: self.head]
+
+
+class StatusHistory:
+    """
+    Per-device time series of epoch, RSSI and value.
+
+    Each device keeps its samples in compact fixed-size columns (``array`` buffers, or
+    NumPy arrays when available), retaining the most recent ``capacity`` samples.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_HISTORY_CAPACITY,
+        *,
+        use_numpy: bool | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize a StatusHistory.
+
+        :param capacity: the number of samples retained per device
+        :param use_numpy: whether to store columns as NumPy arrays.  Defaults to whether NumPy is installed.
+        :param clock: the clock used to timestamp samples, in seconds
+        :raises ImportError: if use_numpy is True and NumPy is not installed
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            msg = "NumPy is required for use_numpy=True"
+            raise ImportError(msg)
+
+        self._capacity = capacity
+        self._use_numpy = use_numpy
+        self._clock = clock
+        self._series: dict[str, _DeviceSeries] = {}
+
+    @property
+    def capacity(self) -> int:
+        """
+        The number of samples retained per device.
+
+        :return: the number of samples retained per device
+        """
+        return self._capacity
+
+    @property
+    def device_ids(self) -> list[str]:
+        """
+        The devices with recorded samples.
+
+        :return: the identifiers of devices with recorded samples
+        """
+        return list(self._series)
+
+    def record(
+        self, statuses: Iterable[DeviceStatus], timestamp: float | None = None
+    ) -> None:
+        """
+        Append one sample per device from a snapshot.
+
+        :param statuses: the snapshot, typically the result of get_all_device_status
+        :param timestamp: the time of the snapshot, in seconds.  Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+
+        for status in statuses:
+            series = self._series.get(status.device_id)
+            if series is None:
+                series = _DeviceSeries(self._capacity, self._use_numpy)
+                self._series[status.device_id] = series
+            series.append(timestamp, int(status.epoch), status.rssi, status.value)
+
+    def __len__(self) -> int:
+        """Return the number of devices with recorded samples."""
+        return len(self._series)
+
+    def samples(self, device_id: str) -> int:
+        """
+        Return the number of samples retained for a device.
+
+        :param device_id: the unique identifier of the device
+        :return: the number of samples, 0 if the device is unknown
+        """
+        series = self._series.get(device_id)
+        return series.size if series is not None else 0
+
+    def column(self, device_id: str, name: str, since: float | None = None) -> Any:
+        """
+        Return one column for a device, oldest sample first.
+
+        :param device_id: the unique identifier of the device
+        :param name: one of 'timestamp', 'epoch', 'rssi' or 'value'
+        :param since: only include samples recorded at or after this time, optional
+        :return: an ``array``, or a NumPy array when NumPy storage is used
+        :raises KeyError: if the device or column is unknown
+        """
+        series = self._series[device_id]
+        values = series.ordered(name)
+        if since is None:
+            return values
+
+        timestamps = series.ordered("timestamp")
+        if self._use_numpy:
+            start = int(np.searchsorted(timestamps, since, side="left"))  # type: ignore
+        else:
+            start = bisect_left(timestamps, since)
+        return values[start:]
+
+    def mean_rssi(self, device_id: str, since: float | None = None) -> float | None:
+        """
+        Return the mean RSSI of a device.
+
+        :param device_id: the unique identifier of the device
+        :param since: only include samples recorded at or after this time, optional
+        :return: the mean RSSI, or None if there are no samples
+        """
+        rssi = self.column(device_id, "rssi", since)
+        if len(rssi) == 0:
+            return None
+        if self._use_numpy:
+            return float(rssi.mean())
+        return sum(rssi) / len(rssi)
+
+    def min_rssi(self, device_id: str, since: float | None = None) -> int | None:
+        """
+        Return the minimum RSSI of a device.
+
+        :param device_id: the unique identifier of the device
+        :param since: only include samples recorded at or after this time, optional
+        :return: the minimum RSSI, or None if there are no samples
+        """
+        rssi = self.column(device_id, "rssi", since)
+        if len(rssi) == 0:
+            return None
+        return int(rssi.min()) if self._use_numpy else min(rssi)
+
+    def value_changes(self, device_id: str, since: float | None = None) -> int:
+        """
+        Count the number of times the value of a device changed between samples.
+
+        :param device_id: the unique identifier of the device
+        :param since: only include samples recorded at or after this time, optional
+        :return: the number of value changes
+        """
+        values = self.column(device_id, "value", since)
+        if self._use_numpy:
+            return int(np.count_nonzero(np.diff(values)))  # type: ignore
+        return sum(1 for a, b in pairwise(values) if a != b)
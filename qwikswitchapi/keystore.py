@@ -0,0 +1,232 @@
+"""Persistent storage of generated API keys."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .constants import JsonKeys
+from .entities import ApiKeys
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - exercised on platforms without fcntl
+    fcntl = None
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class KeyStore(ABC):
+    """
+    Base class for stores of API keys, keyed by email address and master key.
+
+    Subclasses implement load, save and delete.
+    """
+
+    @staticmethod
+    def account_key(email: str, master_key: str) -> str:
+        """
+        Derive the key under which the API keys of an account are stored.
+
+        The master key is hashed rather than stored as-is.  The hash is unsalted and fast,
+        so a short master key can be recovered from a leaked store by brute force; protect
+        the store as you would the API keys it holds.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        :return: a stable, opaque identifier for the account
+        """
+        return hashlib.sha256(f"{email}\0{master_key}".encode()).hexdigest()
+
+    @abstractmethod
+    def load(self, email: str, master_key: str) -> ApiKeys | None:
+        """
+        Load the API keys of an account.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        :return: the stored API keys, or None if none are stored
+        """
+
+    @abstractmethod
+    def save(self, email: str, master_key: str, api_keys: ApiKeys) -> None:
+        """
+        Store the API keys of an account, replacing any stored keys.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        :param api_keys: the API keys to store
+        """
+
+    @abstractmethod
+    def delete(self, email: str, master_key: str) -> None:
+        """
+        Remove the API keys of an account, if stored.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        """
+
+
+class MemoryKeyStore(KeyStore):
+    """A key store held in memory, shared by clients in the same process."""
+
+    def __init__(self) -> None:
+        """Initialize an empty MemoryKeyStore."""
+        self._keys: dict[str, ApiKeys] = {}
+        self._lock = threading.Lock()
+
+    def load(self, email: str, master_key: str) -> ApiKeys | None:
+        """
+        Load the API keys of an account.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        :return: the stored API keys, or None if none are stored
+        """
+        with self._lock:
+            return self._keys.get(self.account_key(email, master_key))
+
+    def save(self, email: str, master_key: str, api_keys: ApiKeys) -> None:
+        """
+        Store the API keys of an account, replacing any stored keys.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        :param api_keys: the API keys to store
+        """
+        with self._lock:
+            self._keys[self.account_key(email, master_key)] = api_keys
+
+    def delete(self, email: str, master_key: str) -> None:
+        """
+        Remove the API keys of an account, if stored.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        """
+        with self._lock:
+            self._keys.pop(self.account_key(email, master_key), None)
+
+
+class FileKeyStore(KeyStore):
+    """
+    A key store persisted as a JSON file, readable only by the current user.
+
+    Writes go to a temporary file in the same directory which then atomically replaces
+    the store, so concurrent readers never observe a partially written file.  Updates
+    hold an exclusive ``flock`` on a ``.lock`` file next to the store, so processes
+    sharing it do not lose each other's entries.  Without ``fcntl``, updates are only
+    serialized within a process.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """
+        Initialize a FileKeyStore.
+
+        :param path: the path of the JSON file holding the keys.  It is created on first save.
+        """
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        """
+        The path of the JSON file holding the keys.
+
+        :return: the path of the store
+        """
+        return self._path
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            if fcntl is None:  # pragma: no cover - exercised on platforms without fcntl
+                yield
+                return
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            lock_path = self._path.with_name(f"{self._path.name}.lock")
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def _read(self) -> dict[str, dict[str, str]]:
+        try:
+            with self._path.open(encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: dict[str, dict[str, str]]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(
+            dir=self._path.parent, prefix=f".{self._path.name}.", suffix=".tmp"
+        )
+        try:
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            Path(tmp).replace(self._path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                Path(tmp).unlink()
+            raise
+
+    def load(self, email: str, master_key: str) -> ApiKeys | None:
+        """
+        Load the API keys of an account.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        :return: the stored API keys, or None if none are stored
+        """
+        with self._lock:
+            entry = self._read().get(self.account_key(email, master_key))
+        if not isinstance(entry, dict):
+            return None
+        try:
+            return ApiKeys(entry[JsonKeys.READ_KEY], entry[JsonKeys.READ_WRITE_KEY])
+        except KeyError:
+            return None
+
+    def save(self, email: str, master_key: str, api_keys: ApiKeys) -> None:
+        """
+        Store the API keys of an account, replacing any stored keys.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        :param api_keys: the API keys to store
+        """
+        with self._locked():
+            data = self._read()
+            data[self.account_key(email, master_key)] = {
+                JsonKeys.READ_KEY: api_keys.read_key,
+                JsonKeys.READ_WRITE_KEY: api_keys.read_write_key,
+            }
+            self._write(data)
+
+    def delete(self, email: str, master_key: str) -> None:
+        """
+        Remove the API keys of an account, if stored.
+
+        :param email: the email address of the account
+        :param master_key: the master key of the account
+        """
+        with self._locked():
+            data = self._read()
+            if data.pop(self.account_key(email, master_key), None) is not None:
+                self._write(data)
@@ -0,0 +1,234 @@
+"""Instrumentation of calls made by the QwikSwitch API client."""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+
+from .constants import DEFAULT_LATENCY_BUCKETS, DEFAULT_PARSE_BUCKETS
+
+
+class Histogram:
+    """A thread-safe histogram of observations with fixed upper bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """
+        Initialize an empty Histogram.
+
+        :param buckets: the upper bounds of the buckets, in ascending order.  Larger observations fall in a final, unbounded bucket.
+        """
+        self._bounds = tuple(buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """
+        The number of observations.
+
+        :return: the number of observations
+        """
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        """
+        The sum of all observations.
+
+        :return: the sum of all observations
+        """
+        return self._sum
+
+    def observe(self, value: float) -> None:
+        """
+        Record an observation.
+
+        :param value: the observed value
+        """
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """
+        Return the cumulative count of observations at or below each bound.
+
+        :return: (upper bound, cumulative count) pairs, ending with an infinite bound
+        """
+        with self._lock:
+            counts = list(self._counts)
+        cumulative = 0
+        result = []
+        for bound, count in zip((*self._bounds, float("inf")), counts, strict=True):
+            cumulative += count
+            result.append((bound, cumulative))
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Export the histogram as plain data.
+
+        :return: the count, sum and cumulative buckets of the histogram
+        """
+        return {"count": self._count, "sum": self._sum, "buckets": self.buckets()}
+
+
+class _EndpointMetrics:
+    """The measurements recorded for a single endpoint."""
+
+    def __init__(
+        self, latency_buckets: tuple[float, ...], parse_buckets: tuple[float, ...]
+    ) -> None:
+        self.latency = Histogram(latency_buckets)
+        self.network = Histogram(latency_buckets)
+        self.parse = Histogram(parse_buckets)
+        self.errors: Counter[str] = Counter()
+        self.bytes_received = 0
+
+
+class ClientMetrics:
+    """
+    Per-endpoint measurements of a QSClient.
+
+    For each endpoint the following are recorded:
+
+    - ``latency``: the duration of each call as seen by the caller, including authentication and retries
+    - ``network``: the duration of each HTTP request, up to the response body being read
+    - ``parse``: the time spent decoding and validating each response and constructing entities
+    - ``bytes_received``: the size of the response bodies
+    - ``errors``: the number of failed calls, by exception class
+
+    One instance may be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        parse_buckets: tuple[float, ...] = DEFAULT_PARSE_BUCKETS,
+    ) -> None:
+        """
+        Initialize an empty ClientMetrics.
+
+        :param latency_buckets: the upper bounds of the latency and network histograms, in seconds
+        :param parse_buckets: the upper bounds of the parse time histograms, in seconds
+        """
+        self._latency_buckets = latency_buckets
+        self._parse_buckets = parse_buckets
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def endpoints(self) -> list[str]:
+        """
+        The endpoints with recorded measurements.
+
+        :return: the names of the endpoints
+        """
+        return list(self._endpoints)
+
+    def _endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            with self._lock:
+                metrics = self._endpoints.setdefault(
+                    endpoint,
+                    _EndpointMetrics(self._latency_buckets, self._parse_buckets),
+                )
+        return metrics
+
+    def observe_call(
+        self, endpoint: str, seconds: float, error: BaseException | None = None
+    ) -> None:
+        """
+        Record a completed call.
+
+        :param endpoint: the name of the endpoint
+        :param seconds: the duration of the call
+        :param error: the exception raised by the call, if it failed
+        """
+        metrics = self._endpoint(endpoint)
+        metrics.latency.observe(seconds)
+        if error is not None:
+            with self._lock:
+                metrics.errors[type(error).__name__] += 1
+
+    def observe_request(self, endpoint: str, seconds: float, size: int) -> None:
+        """
+        Record an HTTP request that received a response.
+
+        :param endpoint: the name of the endpoint
+        :param seconds: the duration of the request
+        :param size: the size of the response body, in bytes
+        """
+        metrics = self._endpoint(endpoint)
+        metrics.network.observe(seconds)
+        with self._lock:
+            metrics.bytes_received += size
+
+    def observe_parse(self, endpoint: str, seconds: float) -> None:
+        """
+        Record the parsing of a response.
+
+        :param endpoint: the name of the endpoint
+        :param seconds: the time spent parsing
+        """
+        self._endpoint(endpoint).parse.observe(seconds)
+
+    def histogram(self, endpoint: str, name: str) -> Histogram:
+        """
+        Return one of the histograms of an endpoint.
+
+        :param endpoint: the name of the endpoint
+        :param name: one of 'latency', 'network' or 'parse'
+        :return: the histogram
+        :raises KeyError: if the endpoint has no measurements
+        """
+        return getattr(self._endpoints[endpoint], name)
+
+    def errors(self, endpoint: str) -> dict[str, int]:
+        """
+        Return the number of failed calls to an endpoint, by exception class.
+
+        :param endpoint: the name of the endpoint
+        :return: the number of failures keyed by the name of the exception class
+        """
+        metrics = self._endpoints.get(endpoint)
+        return dict(metrics.errors) if metrics is not None else {}
+
+    def bytes_received(self, endpoint: str) -> int:
+        """
+        Return the number of bytes received from an endpoint.
+
+        :param endpoint: the name of the endpoint
+        :return: the total size of the response bodies
+        """
+        metrics = self._endpoints.get(endpoint)
+        return metrics.bytes_received if metrics is not None else 0
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        Export all measurements as plain data, suitable for JSON.
+
+        :return: the measurements keyed by endpoint
+        """
+        return {
+            endpoint: {
+                "latency": metrics.latency.to_dict(),
+                "network": metrics.network.to_dict(),
+                "parse": metrics.parse.to_dict(),
+                "bytes_received": metrics.bytes_received,
+                "errors": dict(metrics.errors),
+            }
+            for endpoint, metrics in list(self._endpoints.items())
+        }
+
+    def reset(self) -> None:
+        """Discard all measurements."""
+        with self._lock:
+            self._endpoints = {}
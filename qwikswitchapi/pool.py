@@ -0,0 +1,314 @@
+"""Management of clients for many QwikSwitch accounts."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Self
+
+from .client import QSClient
+from .constants import (
+    DEFAULT_BASE_URI,
+    DEFAULT_BATCH_MAX_WORKERS,
+    DEFAULT_MAX_CONCURRENT_PER_ACCOUNT,
+    DEFAULT_TIMEOUT,
+)
+from .entities import BatchStatusResult
+from .exceptions import QSError
+from .keystore import KeyStore, MemoryKeyStore
+from .transport import HttpTransport, Transport
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    import requests
+
+    from .deadline import Deadline
+    from .entities import ControlResult, DeviceStatuses
+
+
+class _LimitedTransport(Transport):
+    """A view of a shared transport that bounds the requests in flight for one account."""
+
+    def __init__(
+        self,
+        transport: Transport,
+        account_limit: threading.Semaphore,
+        global_limit: threading.Semaphore | None,
+    ) -> None:
+        self._transport = transport
+        self._account_limit = account_limit
+        self._global_limit = global_limit
+
+    def _acquire(self) -> None:
+        # Always account first, then global, so that no two requests deadlock.
+        self._account_limit.acquire()
+        if self._global_limit is not None:
+            self._global_limit.acquire()
+
+    def _release(self) -> None:
+        if self._global_limit is not None:
+            self._global_limit.release()
+        self._account_limit.release()
+
+    def get(
+        self,
+        url: str,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        self._acquire()
+        try:
+            return self._transport.get(url, timeout=timeout, deadline=deadline)
+        finally:
+            self._release()
+
+    def post(
+        self,
+        url: str,
+        json: Any = None,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        self._acquire()
+        try:
+            return self._transport.post(
+                url, json=json, timeout=timeout, deadline=deadline
+            )
+        finally:
+            self._release()
+
+
+class QSClientPool:
+    """
+    Clients for many QwikSwitch accounts, sharing connections, threads and API keys.
+
+    Every account's client sends requests through one pooled transport, bounded by a
+    per-account and an optional global limit on requests in flight, including those made
+    directly on a client obtained from the pool.  Generated API keys are kept in a shared
+    key store, so a removed and re-added account does not generate new keys.
+
+    Waiting for a request slot is not bounded by a call's deadline, as the transport only
+    sees request timeouts; size the limits so that requests do not queue for long.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_BATCH_MAX_WORKERS,
+        max_concurrent: int | None = None,
+        max_concurrent_per_account: int = DEFAULT_MAX_CONCURRENT_PER_ACCOUNT,
+        transport: Transport | None = None,
+        key_store: KeyStore | None = None,
+        **client_options: Any,
+    ) -> None:
+        """
+        Initialize an empty QSClientPool.
+
+        :param max_workers: the number of threads used by poll_all
+        :param max_concurrent: the maximum number of requests in flight across all accounts, optional.  Unbounded if not supplied.
+        :param max_concurrent_per_account: the maximum number of requests in flight for one account
+        :param transport: the transport shared by all accounts, optional.  A pooled HttpTransport sized for the concurrency limits is created if not supplied.
+        :param key_store: the store of API keys shared by all accounts, optional.  Defaults to a MemoryKeyStore.
+        :param client_options: keyword arguments passed to every QSClient, such as retry_policy, rate_limiter or metrics
+        """
+        if transport is None:
+            pool_size = max(max_concurrent or max_workers, max_workers)
+            transport = HttpTransport(pool_maxsize=pool_size)
+            self._owns_transport = True
+        else:
+            self._owns_transport = False
+
+        self._transport = transport
+        self._key_store = key_store if key_store is not None else MemoryKeyStore()
+        self._max_workers = max(1, max_workers)
+        self._global_limit = (
+            threading.BoundedSemaphore(max_concurrent)
+            if max_concurrent is not None
+            else None
+        )
+        self._max_concurrent_per_account = max(1, max_concurrent_per_account)
+        self._client_options = client_options
+        self._clients: dict[str, QSClient] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def accounts(self) -> list[str]:
+        """
+        The identifiers of the accounts in the pool.
+
+        :return: the account identifiers
+        """
+        return list(self._clients)
+
+    @property
+    def key_store(self) -> KeyStore:
+        """
+        The store of API keys shared by all accounts.
+
+        :return: the key store
+        """
+        return self._key_store
+
+    def __len__(self) -> int:
+        """Return the number of accounts in the pool."""
+        return len(self._clients)
+
+    def __contains__(self, account_id: object) -> bool:
+        """Return whether an account is in the pool."""
+        return account_id in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the account identifiers."""
+        return iter(list(self._clients))
+
+    def add_account(
+        self,
+        account_id: str,
+        email: str,
+        master_key: str,
+        base_uri: str = DEFAULT_BASE_URI,
+        **client_options: Any,
+    ) -> QSClient:
+        """
+        Add an account to the pool.
+
+        :param account_id: the identifier of the account within the pool
+        :param email: the email address registered on https://qwikswitch.com
+        :param master_key: the master key of the account's Wi-Fi bridge
+        :param base_uri: the base URI of the Qwikswitch API, optional
+        :param client_options: keyword arguments for this account's QSClient, overriding those of the pool
+        :return: the client of the account
+        :raises ValueError: if an account with the same identifier is already in the pool
+        """
+        transport = _LimitedTransport(
+            self._transport,
+            threading.BoundedSemaphore(self._max_concurrent_per_account),
+            self._global_limit,
+        )
+        options = {
+            "key_store": self._key_store,
+            **self._client_options,
+            **client_options,
+        }
+        client = QSClient(email, master_key, base_uri, transport, **options)
+
+        with self._lock:
+            if account_id in self._clients:
+                msg = f"Account {account_id!r} is already in the pool"
+                raise ValueError(msg)
+            self._clients[account_id] = client
+        return client
+
+    def remove_account(self, account_id: str) -> None:
+        """
+        Remove an account from the pool.  Its API keys remain in the key store.
+
+        :param account_id: the identifier of the account
+        :raises KeyError: if the account is not in the pool
+        """
+        with self._lock:
+            del self._clients[account_id]
+
+    def client(self, account_id: str) -> QSClient:
+        """
+        Return the client of an account.
+
+        :param account_id: the identifier of the account
+        :return: the client of the account
+        :raises KeyError: if the account is not in the pool
+        """
+        return self._clients[account_id]
+
+    def control_device(
+        self, account_id: str, device_id: str, level: int
+    ) -> ControlResult:
+        """
+        Control a device of an account.
+
+        :param account_id: the identifier of the account
+        :param device_id: the unique identifier of the device to control
+        :param level: the level to set the device to
+        :return: ControlResult, with the device and level set
+        :raises KeyError: if the account is not in the pool
+        :raises QSException: when the request fails
+        """
+        return self._clients[account_id].control_device(device_id, level)
+
+    def get_all_device_status(self, account_id: str) -> DeviceStatuses:
+        """
+        Retrieve the status of all devices of an account.
+
+        :param account_id: the identifier of the account
+        :return: the device statuses of the account
+        :raises KeyError: if the account is not in the pool
+        :raises QSException: when the request fails
+        """
+        return self._clients[account_id].get_all_device_status()
+
+    def poll_all(self, account_ids: Iterable[str] | None = None) -> BatchStatusResult:
+        """
+        Retrieve the device statuses of many accounts in parallel.
+
+        A failure for one account does not abort the others.
+
+        :param account_ids: the accounts to poll, optional.  Defaults to every account in the pool.
+        :return: BatchStatusResult, with the statuses or error of every account
+        :raises KeyError: if an account is not in the pool
+        """
+        clients = {
+            account_id: self._clients[account_id]
+            for account_id in (account_ids if account_ids is not None else self)
+        }
+
+        def poll(client: QSClient) -> DeviceStatuses | QSError:
+            try:
+                return client.get_all_device_status()
+            except QSError as ex:
+                return ex
+
+        start = time.perf_counter()
+        outcomes = list(self._get_executor().map(poll, clients.values()))
+        elapsed = time.perf_counter() - start
+
+        results = {}
+        errors = {}
+        for account_id, outcome in zip(clients, outcomes, strict=True):
+            if isinstance(outcome, QSError):
+                errors[account_id] = outcome
+            else:
+                results[account_id] = outcome
+
+        return BatchStatusResult(results, errors, elapsed)
+
+    def close(self) -> None:
+        """
+        Stop the worker threads and release pooled connections.
+
+        A transport supplied by the caller is left open, as it may be shared.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        if self._owns_transport:
+            self._transport.close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context, returning the pool."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, closing the pool."""
+        self.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="qs-pool"
+                )
+            return self._executor
@@ -0,0 +1,94 @@
+"""Export of client metrics to Prometheus."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from prometheus_client.registry import CollectorRegistry
+
+    from .metrics import ClientMetrics, Histogram
+
+_HISTOGRAMS = {
+    "latency": "Duration of API calls, including authentication and retries",
+    "network": "Duration of HTTP requests to the API",
+    "parse": "Time spent parsing API responses",
+}
+
+
+class PrometheusCollector:
+    """
+    A Prometheus collector exposing the measurements of a ClientMetrics.
+
+    Measurements are read on each scrape, so the client records no Prometheus state itself.
+    """
+
+    def __init__(self, metrics: ClientMetrics, prefix: str = "qwikswitch") -> None:
+        """
+        Initialize a PrometheusCollector.
+
+        :param metrics: the measurements to expose
+        :param prefix: the prefix of the exposed metric names
+        """
+        self._metrics = metrics
+        self._prefix = prefix
+
+    def register(self, registry: CollectorRegistry | None = None) -> None:
+        """
+        Register the collector.
+
+        :param registry: the registry to register with, optional.  Defaults to the global registry.
+        """
+        if registry is None:
+            from prometheus_client import REGISTRY  # noqa: PLC0415
+
+            registry = REGISTRY
+        registry.register(self)
+
+    def collect(self) -> Iterator[HistogramMetricFamily | CounterMetricFamily]:
+        """
+        Build the metric families for a scrape.
+
+        :return: the metric families
+        """
+        endpoints = self._metrics.endpoints
+        for name, documentation in _HISTOGRAMS.items():
+            family = HistogramMetricFamily(
+                f"{self._prefix}_{name}_seconds", documentation, labels=["endpoint"]
+            )
+            for endpoint in endpoints:
+                histogram: Histogram = self._metrics.histogram(endpoint, name)
+                family.add_metric(
+                    [endpoint],
+                    [
+                        (_format_bound(bound), count)
+                        for bound, count in histogram.buckets()
+                    ],
+                    histogram.sum,
+                )
+            yield family
+
+        received = CounterMetricFamily(
+            f"{self._prefix}_received_bytes",
+            "Size of API response bodies",
+            labels=["endpoint"],
+        )
+        errors = CounterMetricFamily(
+            f"{self._prefix}_errors",
+            "Failed API calls, by exception class",
+            labels=["endpoint", "error"],
+        )
+        for endpoint in endpoints:
+            received.add_metric([endpoint], self._metrics.bytes_received(endpoint))
+            for error, count in self._metrics.errors(endpoint).items():
+                errors.add_metric([endpoint, error], count)
+        yield received
+        yield errors
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
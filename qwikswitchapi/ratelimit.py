@@ -0,0 +1,257 @@
+"""Token-bucket rate limiting of requests to the QwikSwitch API."""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from .exceptions import QSDeadlineExceededError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - exercised on platforms without fcntl
+    fcntl = None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_STATE = struct.Struct("=dd")
+
+
+class RateLimiter(ABC):
+    """
+    Base class for token-bucket rate limiters.
+
+    Tokens accrue at ``rate`` per second up to ``capacity``.  Each request reserves a token,
+    waiting for the balance to recover if none is available; reservations are served in
+    the order they are made.  Subclasses implement _reserve, which holds the bucket state.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize a RateLimiter.
+
+        :param rate: the sustained number of requests allowed per second
+        :param capacity: the number of requests allowed in a burst, optional.  Defaults to one second's worth.
+        :param sleep: the function used to wait for tokens
+        """
+        if rate <= 0:
+            msg = "rate must be positive"
+            raise ValueError(msg)
+
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._sleep = sleep
+        self._stats_lock = threading.Lock()
+        self._acquired = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def rate(self) -> float:
+        """
+        The sustained number of requests allowed per second.
+
+        :return: the rate in requests per second
+        """
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        """
+        The number of requests allowed in a burst.
+
+        :return: the capacity of the bucket
+        """
+        return self._capacity
+
+    @property
+    def acquired(self) -> int:
+        """
+        The number of tokens acquired by this limiter.
+
+        :return: the number of tokens acquired
+        """
+        return self._acquired
+
+    @property
+    def waits(self) -> int:
+        """
+        The number of acquisitions that had to wait for a token.
+
+        :return: the number of acquisitions that waited
+        """
+        return self._waits
+
+    @property
+    def wait_time(self) -> float:
+        """
+        The total time spent waiting for tokens.
+
+        :return: the total wait in seconds
+        """
+        return self._wait_time
+
+    @property
+    def max_wait(self) -> float:
+        """
+        The longest time spent waiting for a token.
+
+        :return: the longest wait in seconds
+        """
+        return self._max_wait
+
+    def acquire(self, max_wait: float | None = None) -> float:
+        """
+        Take a token, waiting until one is available.
+
+        :param max_wait: the longest acceptable wait in seconds, optional
+        :return: the time waited, in seconds
+        :raises QSDeadlineExceededError: if the wait would exceed max_wait.  No token is taken.
+        """
+        delay = self._reserve(max_wait)
+        if delay is None:
+            msg = f"Rate limit of {self._rate}/s would delay the request beyond its deadline"
+            raise QSDeadlineExceededError(msg)
+
+        if delay > 0:
+            self._sleep(delay)
+
+        with self._stats_lock:
+            self._acquired += 1
+            if delay > 0:
+                self._waits += 1
+                self._wait_time += delay
+                self._max_wait = max(self._max_wait, delay)
+        return delay
+
+    def _refill(
+        self, tokens: float, updated: float, now: float, max_wait: float | None
+    ) -> tuple[float, float | None]:
+        """
+        Apply the token-bucket arithmetic to a stored balance.
+
+        The balance may go negative, representing reservations waiting for tokens.
+
+        :return: the new balance, and the delay before the token may be used or None if it exceeds max_wait
+        """
+        elapsed = max(now - updated, 0.0)
+        tokens = min(tokens + elapsed * self._rate, self._capacity)
+        delay = max(1.0 - tokens, 0.0) / self._rate
+        if max_wait is not None and delay > max_wait:
+            return tokens, None
+        return tokens - 1.0, delay
+
+    @abstractmethod
+    def _reserve(self, max_wait: float | None) -> float | None:
+        """
+        Reserve a token.
+
+        :param max_wait: the longest acceptable wait in seconds, optional
+        :return: the delay before the token may be used, or None if it exceeds max_wait
+        """
+
+
+class TokenBucket(RateLimiter):
+    """A token bucket shared by the threads of one process."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize a TokenBucket, initially full.
+
+        :param rate: the sustained number of requests allowed per second
+        :param capacity: the number of requests allowed in a burst, optional.  Defaults to one second's worth.
+        :param clock: the monotonic clock to use, in seconds
+        :param sleep: the function used to wait for tokens
+        """
+        super().__init__(rate, capacity, sleep)
+        self._clock = clock
+        self._tokens = self._capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, max_wait: float | None) -> float | None:
+        with self._lock:
+            now = self._clock()
+            tokens, delay = self._refill(self._tokens, self._updated, now, max_wait)
+            self._tokens = tokens
+            self._updated = now
+            return delay
+
+
+class FileTokenBucket(RateLimiter):
+    """
+    A token bucket shared by every process on a host through a lock file.
+
+    The balance is stored in the file and updated under an exclusive ``flock``, so that all
+    clients configured with the same path share one budget.  Wait metrics are per process.
+    Requires a platform providing ``fcntl``.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize a FileTokenBucket.
+
+        :param path: the path of the file holding the bucket state.  It is created, full, on first use.
+        :param rate: the sustained number of requests allowed per second
+        :param capacity: the number of requests allowed in a burst, optional.  Defaults to one second's worth.
+        :param clock: the clock to use, in seconds.  It must be shared by all processes.
+        :param sleep: the function used to wait for tokens
+        :raises NotImplementedError: if the platform does not provide fcntl
+        """
+        if fcntl is None:
+            msg = "FileTokenBucket requires fcntl, which is not available on this platform"
+            raise NotImplementedError(msg)
+
+        super().__init__(rate, capacity, sleep)
+        self._path = os.fspath(path)
+        self._clock = clock
+
+    @property
+    def path(self) -> str:
+        """
+        The path of the file holding the bucket state.
+
+        :return: the path of the file
+        """
+        return self._path
+
+    def _reserve(self, max_wait: float | None) -> float | None:
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)  # type: ignore
+            now = self._clock()
+            data = os.pread(fd, _STATE.size, 0)
+            if len(data) == _STATE.size:
+                tokens, updated = _STATE.unpack(data)
+            else:
+                tokens, updated = self._capacity, now
+
+            tokens, delay = self._refill(tokens, updated, now, max_wait)
+            os.pwrite(fd, _STATE.pack(tokens, now), 0)
+            return delay
+        finally:
+            os.close(fd)
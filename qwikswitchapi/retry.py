@@ -0,0 +1,252 @@
+"""Retry policies and circuit breaking for requests to the QwikSwitch API."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from .constants import (
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BASE_DELAY,
+    DEFAULT_RETRY_BUDGET_RATIO,
+    DEFAULT_RETRY_MAX_DELAY,
+    CircuitState,
+)
+from .exceptions import QSCircuitOpenError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the request volume.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so that during
+    an outage retries cannot multiply the load on the API.  ``min_tokens`` allows a few
+    retries while request volume is low.
+    """
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        min_tokens: float = 10.0,
+        max_tokens: float = 100.0,
+    ) -> None:
+        """
+        Initialize a RetryBudget.
+
+        :param ratio: the number of retries earned by each request
+        :param min_tokens: the initial balance
+        :param max_tokens: the maximum balance
+        """
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """
+        The number of retries currently available.
+
+        :return: the current balance
+        """
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Record a request, earning a fraction of a retry."""
+        with self._lock:
+            self._tokens = min(self._tokens + self._ratio, self._max_tokens)
+
+    def withdraw(self) -> bool:
+        """
+        Spend one retry, if available.
+
+        :return: True if the retry may proceed
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Retries failed idempotent requests with jittered exponential backoff."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        max_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+        *,
+        budget: RetryBudget | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Initialize a RetryPolicy.
+
+        :param max_attempts: the maximum number of attempts, including the first
+        :param base_delay: the backoff before the first retry, in seconds
+        :param max_delay: the upper bound of the backoff, in seconds
+        :param budget: a retry budget shared between requests, optional
+        :param sleep: the function used to wait between attempts
+        :param rng: the random number generator used for jitter, optional
+        """
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._budget = budget
+        self._sleep = sleep
+        self._rng = rng or random.Random()  # noqa: S311
+
+    @property
+    def max_attempts(self) -> int:
+        """
+        The maximum number of attempts, including the first.
+
+        :return: the maximum number of attempts
+        """
+        return self._max_attempts
+
+    @property
+    def budget(self) -> RetryBudget | None:
+        """
+        The retry budget shared between requests.
+
+        :return: the retry budget, or None if retries are unbudgeted
+        """
+        return self._budget
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Compute the delay before a retry, using full jitter.
+
+        :param attempt: the number of attempts made so far, starting at 1
+        :return: the delay in seconds
+        """
+        cap = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        return self._rng.uniform(0, cap)
+
+    def should_retry(
+        self,
+        attempt: int,
+        remaining: float | None = None,
+        min_delay: float | None = None,
+    ) -> float | None:
+        """
+        Decide whether to retry after a failed attempt.
+
+        :param attempt: the number of attempts made so far, starting at 1
+        :param remaining: the time left before the caller's deadline, in seconds, optional
+        :param min_delay: the shortest acceptable delay, such as a Retry-After requested by the API, optional
+        :return: the delay before retrying, or None if no retry should be made
+        """
+        if attempt >= self._max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if min_delay is not None:
+            delay = max(delay, min_delay)
+        if remaining is not None and delay >= remaining:
+            return None
+        if self._budget is not None and not self._budget.withdraw():
+            return None
+        return delay
+
+    def sleep(self, delay: float) -> None:
+        """
+        Wait before retrying.
+
+        :param delay: the delay in seconds
+        """
+        self._sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Fails fast while the QwikSwitch API is unreachable.
+
+    After ``failure_threshold`` consecutive request failures the circuit opens, and
+    requests raise QSCircuitOpenError without being sent.  Once ``reset_timeout`` has
+    passed, a single probe request is let through: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_CIRCUIT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize a CircuitBreaker.
+
+        :param failure_threshold: the number of consecutive failures that opens the circuit
+        :param reset_timeout: the number of seconds the circuit stays open before a probe
+        :param clock: the monotonic clock to use, in seconds
+        """
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        The current state of the circuit.
+
+        :return: the state of the circuit
+        """
+        with self._lock:
+            if (
+                self._state is CircuitState.open
+                and self._clock() - self._opened_at >= self._reset_timeout
+            ):
+                return CircuitState.half_open
+            return self._state
+
+    def before_request(self, url: str = "Unknown") -> None:
+        """
+        Check that a request may be sent.
+
+        :param url: the URL of the request, used in the error message
+        :raises QSCircuitOpenError: if the circuit is open
+        """
+        with self._lock:
+            if self._state is CircuitState.closed:
+                return
+            if (
+                self._state is CircuitState.open
+                and self._clock() - self._opened_at >= self._reset_timeout
+            ):
+                self._state = CircuitState.half_open
+                return
+
+        msg = f"Request to {url} not sent: the circuit is open after repeated failures"
+        raise QSCircuitOpenError(msg)
+
+    def record_success(self) -> None:
+        """Record a request that reached the API, closing the circuit."""
+        with self._lock:
+            self._state = CircuitState.closed
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Record a request that failed to reach the API."""
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is CircuitState.half_open
+                or self._failures >= self._failure_threshold
+            ):
+                self._state = CircuitState.open
+                self._opened_at = self._clock()
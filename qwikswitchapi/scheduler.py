@@ -0,0 +1,216 @@
+"""Adaptive polling of device statuses."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+from .changes import DeviceChange, StatusDiffer
+from .constants import (
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_POLL_BACKOFF_FACTOR,
+    DEFAULT_POLL_INTERVAL,
+    DeviceClass,
+)
+from .exceptions import QSError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .entities import ControlResult, DeviceStatuses
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Subscription:
+    """Interest in changes to specific devices or classes of device."""
+
+    def __init__(
+        self,
+        callback: Callable[[list[DeviceChange]], None],
+        device_ids: Iterable[str] | None,
+        device_classes: Iterable[DeviceClass] | None,
+    ) -> None:
+        self.callback = callback
+        self.device_ids = frozenset(device_ids) if device_ids is not None else None
+        self.device_classes = (
+            frozenset(device_classes) if device_classes is not None else None
+        )
+
+    def matches(self, change: DeviceChange) -> bool:
+        if self.device_ids is None and self.device_classes is None:
+            return True
+        if self.device_ids is not None and change.device_id in self.device_ids:
+            return True
+        status = change.current if change.current is not None else change.previous
+        return (
+            self.device_classes is not None
+            and status.device_class in self.device_classes  # type: ignore
+        )
+
+
+class AdaptivePoller:
+    """
+    Polls get_all_device_status at an interval that adapts to activity.
+
+    The interval drops to ``min_interval`` after a control_device call on the client, or
+    when a change of interest is detected.  While snapshots are stable, or requests fail,
+    the interval grows by ``backoff_factor`` up to ``max_interval``.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: Any,
+        min_interval: float = DEFAULT_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        backoff_factor: float = DEFAULT_POLL_BACKOFF_FACTOR,
+        *,
+        on_error: Callable[[QSError], None] | None = None,
+        on_snapshot: Callable[[DeviceStatuses], object] | None = None,
+    ) -> None:
+        """
+        Initialize an AdaptivePoller.
+
+        :param client: the QSClient to poll
+        :param min_interval: the interval used while devices are active, in seconds
+        :param max_interval: the upper bound of the interval while idle or failing, in seconds
+        :param backoff_factor: the factor by which the interval grows after an idle or failed poll
+        :param on_error: a function called with the error when a poll fails, optional
+        :param on_snapshot: a function called with every snapshot retrieved, before it is diffed, optional
+        """
+        self._client = client
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff_factor = backoff_factor
+        self._on_error = on_error
+        self._on_snapshot = on_snapshot
+        self._interval = min_interval
+        self._differ = StatusDiffer()
+        self._subscriptions: list[_Subscription] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._listening = False
+
+    @property
+    def interval(self) -> float:
+        """
+        The delay before the next poll.
+
+        :return: the current polling interval in seconds
+        """
+        return self._interval
+
+    def subscribe(
+        self,
+        callback: Callable[[list[DeviceChange]], None],
+        device_ids: Iterable[str] | None = None,
+        device_classes: Iterable[DeviceClass] | None = None,
+    ) -> Callable[[], None]:
+        """
+        Register interest in changes.
+
+        When any subscription exists, only changes matching a subscription speed up polling.
+
+        :param callback: the function called with the matching changes of each poll
+        :param device_ids: the devices of interest, optional
+        :param device_classes: the classes of device of interest, optional.  When neither filter is given, every change matches.
+        :return: a function that removes the subscription
+        """
+        subscription = _Subscription(callback, device_ids, device_classes)
+        with self._lock:
+            self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    def notify_activity(self) -> None:
+        """Reset the interval to its minimum and wake the polling loop."""
+        self._interval = self._min_interval
+        self._wake.set()
+
+    def poll(self) -> float:
+        """
+        Poll once, dispatch changes to subscribers and adapt the interval.
+
+        :return: the delay before the next poll, in seconds
+        """
+        try:
+            statuses = self._client.get_all_device_status()
+        except QSError as ex:
+            _LOGGER.debug("Polling device statuses failed: %s", ex)
+            if self._on_error is not None:
+                self._on_error(ex)
+            return self._back_off()
+
+        if self._on_snapshot is not None:
+            _dispatch(self._on_snapshot, statuses)
+        changes = self._differ.diff(statuses)
+
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+
+        active = bool(changes) and not subscriptions
+        for subscription in subscriptions:
+            matched = [change for change in changes if subscription.matches(change)]
+            if matched:
+                active = True
+                _dispatch(subscription.callback, matched)
+
+        if active:
+            self._interval = self._min_interval
+            return self._interval
+        return self._back_off()
+
+    def run(self) -> None:
+        """Poll until stop is called, polling again as soon as activity is notified."""
+        while not self._stopped.is_set():
+            self._wake.clear()
+            delay = self.poll()
+            self._wake.wait(delay)
+
+    def start(self) -> None:
+        """
+        Attach to the client's control calls and start polling in a background thread.
+
+        Does nothing if the poller is already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if not self._listening and hasattr(self._client, "add_control_listener"):
+            self._client.add_control_listener(self._on_control)
+            self._listening = True
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling, waiting for the background thread to finish, and detach from the client."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._listening:
+            self._client.remove_control_listener(self._on_control)
+            self._listening = False
+
+    def _back_off(self) -> float:
+        self._interval = min(self._interval * self._backoff_factor, self._max_interval)
+        return self._interval
+
+    def _on_control(self, _result: ControlResult) -> None:
+        self.notify_activity()
+
+
+def _dispatch(callback: Callable[[Any], object], arg: object) -> None:
+    # A failing callback must not stop the polling thread, nor the other callbacks.
+    try:
+        callback(arg)
+    except Exception:
+        _LOGGER.exception("Polling callback %r failed", callback)
@@ -0,0 +1,201 @@
+"""
+A local stand-in for the QwikSwitch cloud API.
+
+Used by the test suite and the benchmarks, and usable by applications that want to
+exercise their integration without a real account.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import parse_qs, urlsplit
+
+READ_KEY = "aaaa-bbbb-cccc-dddd"
+READ_WRITE_KEY = "1111-2222-3333-4444"
+MAX_LEVEL = 100
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_devices(count: int) -> dict[str, dict]:
+    """Build ``count`` fake device states, keyed by device id."""
+    return {
+        f"@{i:06x}": {
+            "type": "RELAY QS-D-S5" if i % 2 else "RELAY QS-R-S5",
+            "hardware": "0x81",
+            "firmware": "v3.3",
+            "epoch": str(1736018000 + i),
+            "rssi": f"{50 + i % 50}%",
+            "value": 0,
+        }
+        for i in range(count)
+    }
+
+
+class MockQSServer:
+    """
+    Threaded HTTP server implementing the keys, keys/delete, state and control endpoints.
+
+    Use as a context manager; ``base_uri`` points at the running server.  Each request is
+    delayed by ``latency`` seconds, and fails with a 500 response with probability
+    ``error_rate``.  The same server stands in for a Wi-Fi bridge on the local network.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        email: str = "email",
+        master_key: str = "master",
+        device_count: int = 2,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Configure the server; it starts listening when the context is entered."""
+        self.email = email
+        self.master_key = master_key
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)  # noqa: S311
+        self.devices = make_devices(device_count)
+        self.keys = {READ_KEY, READ_WRITE_KEY}
+        self.requests: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def base_uri(self) -> str:
+        """The base URI of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v1/"
+
+    def __enter__(self) -> Self:
+        """Start serving requests in a background thread."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _record(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests[endpoint] += 1
+
+    def _should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.requests["errors"] += 1
+        return failed
+
+    def _keys(self, body: dict) -> dict:
+        self._record("keys")
+        if body.get("email") != self.email or body.get("masterKey") != self.master_key:
+            return {"ok": 0, "err": "Please provide a valid serial key."}
+        return {"ok": 1, "r": READ_KEY, "rw": READ_WRITE_KEY}
+
+    def _delete_keys(self, body: dict) -> dict:
+        self._record("keys/delete")
+        if body.get("email") != self.email or body.get("masterKey") != self.master_key:
+            return {"ok": 0, "err": "Please provide a valid serial key."}
+        return {"ok": 1, "r": None, "rw": None}
+
+    def _state(self, key: str) -> dict:
+        self._record("state")
+        if key not in self.keys:
+            return {"error": "INVALID_API_KEY"}
+        with self._lock:
+            return {"success": True, **json.loads(json.dumps(self.devices))}
+
+    def _control(self, key: str, query: dict[str, list[str]]) -> dict:
+        self._record("control")
+        if key not in self.keys:
+            return {"error": "INVALID_API_KEY"}
+        device_id = query.get("device", [""])[0]
+        if device_id not in self.devices:
+            return {"error": "INVALID DEVICE ID"}
+        level = int(query.get("setlevel", ["-1"])[0])
+        if not 0 <= level <= MAX_LEVEL:
+            return {"error": "INVALID LEVEL"}
+        with self._lock:
+            self.devices[device_id]["value"] = level
+            self.devices[device_id]["epoch"] = str(int(time.time()))
+        return {"success": True, "device": device_id, "level": level}
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without TCP_NODELAY the body
+            # waits on the client's delayed ACK, adding ~40 ms to every request.
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def _send(self, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _fail(self, status: HTTPStatus) -> None:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _not_found(self) -> None:
+                self._fail(HTTPStatus.NOT_FOUND)
+
+            def do_POST(self) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if server._should_fail():
+                    self._fail(HTTPStatus.INTERNAL_SERVER_ERROR)
+                    return
+                path = urlsplit(self.path).path.rstrip("/")
+                if path.endswith("/keys"):
+                    self._send(server._keys(body))
+                elif path.endswith("/keys/delete"):
+                    self._send(server._delete_keys(body))
+                else:
+                    self._not_found()
+
+            def do_GET(self) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._should_fail():
+                    self._fail(HTTPStatus.INTERNAL_SERVER_ERROR)
+                    return
+                url = urlsplit(self.path)
+                endpoint, key = ["", *url.path.strip("/").split("/")][-2:]
+                if endpoint == "state":
+                    self._send(server._state(key))
+                elif endpoint == "control":
+                    self._send(server._control(key, parse_qs(url.query)))
+                else:
+                    self._not_found()
+
+        return Handler
@@ -0,0 +1,168 @@
+"""HTTP transport used by the QwikSwitch API client."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Self
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .constants import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from urllib3.util.retry import Retry
+
+    from .deadline import Deadline
+
+
+class Transport(ABC):
+    """
+    Base class for the transports QSClient sends requests through.
+
+    Subclasses implement get and post, and close if they hold resources, returning
+    ``requests``-compatible responses and raising ``requests`` exceptions on failure.
+    The timeout QSClient passes is already limited by the deadline of the call; the
+    deadline itself is passed too, for transports that send more than one request.
+    """
+
+    @abstractmethod
+    def get(
+        self,
+        url: str,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        """
+        Issue a GET request.
+
+        :param url: the URL to request
+        :param timeout: the request timeout, as accepted by ``requests``
+        :param deadline: the deadline of the call the request is made for, optional
+        :return: the response
+        """
+
+    @abstractmethod
+    def post(
+        self,
+        url: str,
+        json: Any = None,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        """
+        Issue a POST request with a JSON body.
+
+        :param url: the URL to request
+        :param json: the body to send, serialized as JSON
+        :param timeout: the request timeout, as accepted by ``requests``
+        :param deadline: the deadline of the call the request is made for, optional
+        :return: the response
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release any resources held by the transport."""
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context, returning the transport."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Exit the runtime context, closing the transport."""
+        self.close()
+
+
+class HttpTransport(Transport):
+    """
+    A pooled, keep-alive HTTP transport.
+
+    Wraps a single ``requests.Session`` so that TCP connections and TLS sessions to the
+    QwikSwitch API are reused across calls instead of being set up for every request.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int | Retry = DEFAULT_MAX_RETRIES,
+        session: requests.Session | None = None,
+    ) -> None:
+        """
+        Initialize a new HttpTransport.
+
+        :param pool_connections: the number of host connection pools to cache
+        :param pool_maxsize: the maximum number of connections to keep per host
+        :param max_retries: the number of connection-level retries, or a ``urllib3`` Retry object
+        :param session: an existing session to use, optional.  When supplied, the session is used as-is and no adapters are mounted.
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+        self._session = session
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The underlying HTTP session.
+
+        :return: the underlying HTTP session
+        """
+        return self._session
+
+    def get(
+        self,
+        url: str,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        """
+        Issue a GET request.
+
+        :param url: the URL to request
+        :param timeout: the request timeout, as accepted by ``requests``
+        :param deadline: the deadline of the call the request is made for, optional
+        :return: the response
+        """
+        if deadline is not None:
+            timeout = deadline.clamp(timeout)
+        return self._session.get(url, timeout=timeout)
+
+    def post(
+        self,
+        url: str,
+        json: Any = None,
+        timeout: Any = DEFAULT_TIMEOUT,
+        *,
+        deadline: Deadline | None = None,
+    ) -> requests.Response:
+        """
+        Issue a POST request with a JSON body.
+
+        :param url: the URL to request
+        :param json: the body to send, serialized as JSON
+        :param timeout: the request timeout, as accepted by ``requests``
+        :param deadline: the deadline of the call the request is made for, optional
+        :return: the response
+        """
+        if deadline is not None:
+            timeout = deadline.clamp(timeout)
+        return self._session.post(url, json=json, timeout=timeout)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
@@ -1,21 +1,53 @@
 """Utility methods for handling urls and parsing response messages."""
 
-from typing import Never
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Never
 from urllib.parse import quote_plus, urljoin
 
 from requests import RequestException
 
-from .constants import DEFAULT_BASE_URI
+from .constants import (
+    DEFAULT_BASE_URI,
+    INVALID_API_KEY,
+    RETRYABLE_STATUS_CODES,
+    JsonKeys,
+)
 from .exceptions import (
+    QSApiKeyRejectedError,
     QSAuthError,
     QSRequestError,
     QSRequestFailedError,
+    QSServerError,
 )
 
+try:
+    from orjson import loads as _fast_loads
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    _fast_loads = None
+
 
 class ResponseParser:
     """Utility methods to parse and validate HTTP responses."""
 
+    @staticmethod
+    def parse_json(resp) -> Any:  # noqa: ANN001
+        """
+        Decode the JSON body of a response.
+
+        The raw bytes are decoded with orjson when it is installed, falling back to the
+        response's own decoder (and its errors) otherwise.
+
+        :param resp: The response object
+        :return: The decoded JSON body
+        """
+        if _fast_loads is not None:
+            try:
+                return _fast_loads(resp.content)
+            except ValueError:
+                pass
+        return resp.json()
+
     @staticmethod
     def get_failure_message(resp) -> str:  # noqa: ANN001
         """
@@ -43,14 +75,44 @@ class ResponseParser:
         raise QSRequestFailedError(msg) from ex
 
     @staticmethod
-    def raise_request_error(resp) -> Never:  # noqa: ANN001
+    def raise_request_error(resp, json_data: Any = None) -> Never:  # noqa: ANN001
         """
         Raise a QSRequestError indicating the request failed.
 
         :param resp: The response object
+        :param json_data: The decoded body of the response, if any
+        :raises QSApiKeyRejectedError: If the API key used was rejected.
+        :raises QSServerError: If the API answered with a server error or 429, which may be retried.
         :raises QSRequestError: Indicating the request failed, with the body of the response.
         """
-        raise QSRequestError(ResponseParser.get_failure_message(resp))
+        message = ResponseParser.get_failure_message(resp)
+        if resp.status_code in RETRYABLE_STATUS_CODES:
+            raise QSServerError(message, ResponseParser.get_retry_after(resp))
+        if (
+            isinstance(json_data, dict)
+            and json_data.get(JsonKeys.ERROR) == INVALID_API_KEY
+        ):
+            raise QSApiKeyRejectedError(message)
+        raise QSRequestError(message)
+
+    @staticmethod
+    def get_retry_after(resp) -> float | None:  # noqa: ANN001
+        """
+        Return the wait requested by the Retry-After header of a response.
+
+        :param resp: The response object
+        :return: the number of seconds to wait, or None if the header is absent or invalid
+        """
+        value = (getattr(resp, "headers", None) or {}).get("Retry-After")
+        if value is None:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0.0)
 
     @staticmethod
     def raise_auth_failure(resp) -> Never:  # noqa: ANN001
@@ -26,3 +26,28 @@ def authenticated_api_client(mock_api_keys):
     client = QSClient("email", "master")
     client._api_keys = mock_api_keys
     return client
+
+
+class FakeClock:
+    """A manually advanced clock, advanced explicitly or by sleeping on it."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self.now += seconds
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock instead of sleeping."""
+        self.advance(seconds)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
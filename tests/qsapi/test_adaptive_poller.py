@@ -0,0 +1,200 @@
+"""Tests for the adaptive polling scheduler."""
+
+import threading
+from unittest.mock import MagicMock
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.constants import DeviceClass
+from qwikswitchapi.entities import DeviceStatus, DeviceStatuses
+from qwikswitchapi.exceptions import QSRequestFailedError
+from qwikswitchapi.scheduler import AdaptivePoller
+from qwikswitchapi.utility import UrlBuilder
+
+
+def snapshot(**values: tuple[str, int]):
+    return DeviceStatuses(
+        [
+            DeviceStatus(device_id, device_type, "v3.3", 1, 59, value)
+            for device_id, (device_type, value) in values.items()
+        ]
+    )
+
+
+def make_poller(*snapshots, **kwargs):  # noqa: ANN002, ANN003
+    client = MagicMock(spec=["get_all_device_status"])
+    client.get_all_device_status.side_effect = list(snapshots)
+    return AdaptivePoller(client, min_interval=1, max_interval=8, **kwargs)
+
+
+DIMMER = "RELAY QS-D-S5"
+RELAY = "RELAY QS-R-S5"
+
+
+def test_stable_snapshots_back_off_exponentially():
+    poller = make_poller(*[snapshot(a=(DIMMER, 0))] * 6)
+
+    delays = [poller.poll() for _ in range(6)]
+
+    assert delays == [1, 2, 4, 8, 8, 8]
+
+
+def test_detected_change_resets_interval():
+    poller = make_poller(
+        snapshot(a=(DIMMER, 0)),
+        snapshot(a=(DIMMER, 0)),
+        snapshot(a=(DIMMER, 0)),
+        snapshot(a=(DIMMER, 50)),
+    )
+
+    delays = [poller.poll() for _ in range(4)]
+
+    assert delays == [1, 2, 4, 1]
+
+
+def test_errors_back_off_and_are_reported():
+    errors = []
+    poller = make_poller(
+        QSRequestFailedError("down"),
+        QSRequestFailedError("down"),
+        on_error=errors.append,
+    )
+
+    assert [poller.poll(), poller.poll()] == [2, 4]
+    assert len(errors) == 2
+
+
+def test_only_subscribed_changes_reset_interval():
+    poller = make_poller(
+        snapshot(a=(DIMMER, 0), b=(RELAY, 0)),
+        snapshot(a=(DIMMER, 0), b=(RELAY, 100)),
+        snapshot(a=(DIMMER, 0), b=(RELAY, 100)),
+        snapshot(a=(DIMMER, 30), b=(RELAY, 100)),
+    )
+    seen = []
+    poller.subscribe(seen.append, device_classes=[DeviceClass.dimmer])
+
+    delays = [poller.poll() for _ in range(4)]
+
+    assert delays == [1, 2, 4, 1]
+    assert [[c.device_id for c in changes] for changes in seen] == [["a"], ["a"]]
+
+
+def test_subscription_by_device_id_and_unsubscribe():
+    poller = make_poller(
+        snapshot(a=(DIMMER, 0), b=(RELAY, 0)),
+        snapshot(a=(DIMMER, 10), b=(RELAY, 10)),
+    )
+    seen = []
+    unsubscribe = poller.subscribe(seen.append, device_ids=["b"])
+
+    poller.poll()
+    unsubscribe()
+    poller.poll()
+
+    assert [[c.device_id for c in changes] for changes in seen] == [["b"]]
+
+
+def test_control_device_wakes_poller(mock_api_keys, mock_request):
+    client = QSClient("email", "master")
+    client.api_keys = mock_api_keys
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url(mock_api_keys.read_write_key),
+        json={"success": True},
+    )
+    mock_request.get(
+        UrlBuilder.build_control_url(mock_api_keys.read_write_key, "@111111", 10),
+        json={"success": True, "device": "@111111", "level": 10},
+    )
+    polled = threading.Event()
+    poller = AdaptivePoller(
+        client, min_interval=0.01, max_interval=60, backoff_factor=10000
+    )
+    original = poller.poll
+
+    def poll():
+        delay = original()
+        polled.set()
+        return delay
+
+    poller.poll = poll
+    poller.start()
+    polled.wait(5)
+    polled.clear()
+    assert poller.interval == 60
+    client.control_device("@111111", 10)
+
+    assert polled.wait(5)
+    poller.stop()
+    assert client._control_listeners == []
+
+
+def test_restarted_poller_listens_to_control_again():
+    client = QSClient("email", "master")
+    poller = AdaptivePoller(client, min_interval=60, max_interval=60)
+    poller.poll = lambda: 60
+
+    for _ in range(2):
+        poller.start()
+        assert client._control_listeners == [poller._on_control]
+        poller.stop()
+        assert client._control_listeners == []
+
+
+def test_snapshots_are_passed_to_on_snapshot():
+    first, second = snapshot(a=(DIMMER, 0)), snapshot(a=(DIMMER, 10))
+    seen = []
+    poller = make_poller(first, second, on_snapshot=seen.append)
+
+    poller.poll()
+    poller.poll()
+
+    assert seen == [first, second]
+
+
+def test_activity_triggers_poll_without_waiting_min_interval():
+    poller = AdaptivePoller(MagicMock(spec=[]), min_interval=60, max_interval=60)
+    polls = threading.Semaphore(0)
+
+    def poll():
+        polls.release()
+        return 60
+
+    poller.poll = poll
+    poller.start()
+    try:
+        assert polls.acquire(timeout=5)
+        poller.notify_activity()
+        assert polls.acquire(timeout=5)
+    finally:
+        poller.stop()
+
+
+def test_failing_callback_is_logged_and_others_still_run(caplog):
+    poller = make_poller(snapshot(a=(DIMMER, 0)))
+    seen = []
+
+    def fail(_changes):
+        msg = "subscriber bug"
+        raise RuntimeError(msg)
+
+    poller.subscribe(fail)
+    poller.subscribe(seen.append)
+
+    assert poller.poll() == 1
+    assert len(seen) == 1
+    assert "subscriber bug" in caplog.text
+
+
+def test_start_twice_runs_one_thread():
+    poller = AdaptivePoller(MagicMock(spec=[]), min_interval=60, max_interval=60)
+    poller.poll = lambda: 60
+
+    poller.start()
+    thread = poller._thread
+    poller.start()
+    try:
+        assert poller._thread is thread
+        assert sum(t.name == thread.name for t in threading.enumerate()) == 1
+    finally:
+        poller.stop()
+    assert not thread.is_alive()
@@ -0,0 +1,123 @@
+"""Tests for binary snapshot archives."""
+
+import pytest
+
+from qwikswitchapi import archive
+from qwikswitchapi.archive import ArchiveReader, ArchiveWriter
+from qwikswitchapi.entities import DeviceStatus, DeviceStatuses
+
+
+def snapshot(epoch, **values):  # noqa: ANN003
+    return DeviceStatuses(
+        [
+            DeviceStatus(device_id, "RELAY QS-D-S5", "v3.3", str(epoch), rssi, value)
+            for device_id, (rssi, value) in values.items()
+        ]
+    )
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "statuses.qsa"
+    with ArchiveWriter(path) as writer:
+        writer.write(snapshot(100, a=(50, 0), b=(60, 100)), timestamp=1.0)
+        writer.write(snapshot(101, a=(40, 10), b=(60, 100)), timestamp=2.0)
+        writer.write(snapshot(102, a=(30, 20), c=(70, 1)), timestamp=3.0)
+    return path
+
+
+@pytest.fixture(params=[False, True], ids=["array", "numpy"])
+def use_numpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(archive, "np", None)
+    return request.param
+
+
+def test_records_round_trip(path):
+    with ArchiveReader(path) as reader:
+        assert len(reader) == 3
+        assert reader.records == 6
+        assert reader.timestamps == [1.0, 2.0, 3.0]
+        assert reader.device_ids == ["a", "b", "c"]
+        assert reader.snapshot(2)["c"] == DeviceStatus(
+            "c", "RELAY QS-D-S5", "v3.3", 102, 70, 1
+        )
+
+
+def test_strings_are_stored_once(tmp_path):
+    path = tmp_path / "statuses.qsa"
+    with ArchiveWriter(path) as writer:
+        for i in range(10):
+            writer.write(snapshot(i, a=(50, i)), timestamp=float(i))
+
+    assert path.stat().st_size == (
+        len(archive._FILE_MAGIC)
+        + 10 * (archive._HEADER.size + archive._RECORD.size)
+        + len(b"\0\0a\0\0RELAY QS-D-S5\0\0v3.3")
+    )
+
+
+def test_scan_slices_by_time_and_device(path):
+    with ArchiveReader(path) as reader:
+        records = list(reader.scan(start=2.0, end=3.5, device_id="a"))
+        assert [(t, s.value) for t, s in records] == [(2.0, 10), (3.0, 20)]
+        assert [s.device_id for _, s in reader.scan(end=2.0)] == ["a", "b"]
+        assert list(reader.scan(device_id="missing")) == []
+
+
+def test_columns_of_device(path, use_numpy):
+    with ArchiveReader(path) as reader:
+        assert list(reader.column("a", "rssi")) == [50, 40, 30]
+        assert list(reader.column("b", "timestamp")) == [1.0, 2.0]
+        assert list(reader.column("a", "epoch", start=3.0)) == [102]
+        assert len(reader.column("c", "value", end=3.0)) == 0
+
+
+def test_append_continues_string_tables(path):
+    with ArchiveWriter(path, append=True) as writer:
+        writer.write(snapshot(103, a=(20, 30), d=(10, 0)), timestamp=4.0)
+
+    with ArchiveReader(path) as reader:
+        assert reader.device_ids == ["a", "b", "c", "d"]
+        assert [s.value for _, s in reader.scan(device_id="a")] == [0, 10, 20, 30]
+
+
+def test_truncated_block_is_ignored_and_overwritten(path):
+    size = path.stat().st_size
+    with path.open("r+b") as file:
+        file.truncate(size - 5)
+
+    with ArchiveReader(path) as reader:
+        assert reader.timestamps == [1.0, 2.0]
+
+    with ArchiveWriter(path, append=True) as writer:
+        writer.write(snapshot(103, c=(70, 2)), timestamp=4.0)
+
+    with ArchiveReader(path) as reader:
+        assert reader.timestamps == [1.0, 2.0, 4.0]
+        assert reader.device_ids == ["a", "b", "c"]
+        assert reader.snapshot(2)["c"].value == 2
+
+
+def test_failed_snapshot_leaves_archive_unchanged(path):
+    with ArchiveWriter(path, append=True) as writer:
+        with pytest.raises(ValueError, match="precedes"):
+            writer.write(snapshot(99, a=(50, 0)), timestamp=0.5)
+        with pytest.raises(ValueError, match="cannot be archived"):
+            writer.write(snapshot(104, e=(500, 0)), timestamp=5.0)
+        writer.write(snapshot(104, f=(50, 0)), timestamp=5.0)
+
+    with ArchiveReader(path) as reader:
+        assert reader.device_ids == ["a", "b", "c", "f"]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "statuses.qsa"
+    path.write_bytes(b"not an archive")
+
+    with pytest.raises(ValueError, match="Not a device status archive"):
+        ArchiveReader(path)
+    with pytest.raises(ValueError, match="Not a device status archive"):
+        ArchiveWriter(path, append=True)
@@ -0,0 +1,123 @@
+"""Tests for the asyncio Qwikswitch API client."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from qwikswitchapi.async_client import AsyncQSClient, _BufferedResponse
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.constants import DeviceClass
+from qwikswitchapi.exceptions import (
+    QSAuthError,
+    QSRequestError,
+    QSRequestFailedError,
+)
+from qwikswitchapi.testing import READ_WRITE_KEY, MockQSServer
+from qwikswitchapi.utility import UrlBuilder
+
+
+@pytest.fixture
+def server():
+    with MockQSServer(device_count=20) as s:
+        yield s
+
+
+def run(client, coro_fn):
+    async def main():
+        async with client:
+            return await coro_fn(client)
+
+    return asyncio.run(main())
+
+
+def test_generate_api_keys_returns_keys(server):
+    keys = run(
+        AsyncQSClient("email", "master", server.base_uri),
+        lambda c: c.generate_api_keys(),
+    )
+
+    assert keys.read_write_key == READ_WRITE_KEY
+
+
+def test_generate_api_keys_with_invalid_credentials_raises(server):
+    with pytest.raises(QSAuthError):
+        run(
+            AsyncQSClient("email", "wrong", server.base_uri),
+            lambda c: c.generate_api_keys(),
+        )
+
+
+def test_delete_api_keys_succeeds(server):
+    run(
+        AsyncQSClient("email", "master", server.base_uri),
+        lambda c: c.delete_api_keys(),
+    )
+
+    assert server.requests["keys/delete"] == 1
+
+
+def test_get_all_device_status_authenticates_and_parses(server):
+    devices = run(
+        AsyncQSClient("email", "master", server.base_uri),
+        lambda c: c.get_all_device_status(),
+    )
+
+    assert server.requests["keys"] == 1
+    assert len(devices.statuses) == 20
+    assert devices.statuses[0].device_id == "@000000"
+    assert devices.statuses[0].rssi == 50
+    assert devices.statuses[1].device_class == DeviceClass.dimmer
+
+
+def test_concurrent_control_authenticates_once(server):
+    device_ids = list(server.devices)
+
+    results = run(
+        AsyncQSClient("email", "master", server.base_uri),
+        lambda c: asyncio.gather(*(c.control_device(d, 40) for d in device_ids)),
+    )
+
+    assert [r.device_id for r in results] == device_ids
+    assert all(r.level == 40 for r in results)
+    assert server.requests["keys"] == 1
+    assert server.requests["control"] == len(device_ids)
+
+
+def test_control_with_invalid_device_raises(server):
+    with pytest.raises(QSRequestError):
+        run(
+            AsyncQSClient("email", "master", server.base_uri),
+            lambda c: c.control_device("@nonexistent", 40),
+        )
+
+
+def test_connection_failure_raises(server):
+    base_uri = server.base_uri
+    server.__exit__(None, None, None)
+
+    with pytest.raises(QSRequestFailedError):
+        run(
+            AsyncQSClient("email", "master", base_uri),
+            lambda c: c.generate_api_keys(),
+        )
+
+
+def test_invalid_json_raises_like_sync_client(mock_api_keys, mock_request):
+    body = "<html>Bad gateway</html>"
+    url = UrlBuilder.build_control_url(mock_api_keys.read_write_key, "@111111", 40)
+    mock_request.get(url, text=body)
+    sync_client = QSClient("email", "master")
+    sync_client.api_keys = mock_api_keys
+    with pytest.raises(QSRequestFailedError):
+        sync_client.control_device("@111111", 40)
+
+    async def get(url):
+        return _BufferedResponse(url, 200, body.encode())
+
+    client = AsyncQSClient("email", "master")
+    client.api_keys = mock_api_keys
+    client._get = get
+    with pytest.raises(QSRequestFailedError, match="control"):
+        run(client, lambda c: c.control_device("@111111", 40))
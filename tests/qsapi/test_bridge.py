@@ -0,0 +1,149 @@
+"""Tests for routing requests through a local Wi-Fi bridge."""
+
+import socket
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from qwikswitchapi.bridge import BridgeTransport
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.deadline import Deadline
+from qwikswitchapi.exceptions import QSDeadlineExceededError
+from qwikswitchapi.testing import MockQSServer
+from qwikswitchapi.transport import Transport
+from qwikswitchapi.utility import UrlBuilder
+
+BRIDGE_URI = "http://192.168.1.20/api/v1/"
+
+
+@pytest.fixture
+def cloud():
+    with MockQSServer() as server:
+        yield server
+
+
+@pytest.fixture
+def unreachable_uri():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/v1/"
+
+
+def make_client(cloud, transport):
+    return QSClient("email", "master", cloud.base_uri, transport=transport)
+
+
+def test_device_requests_go_to_bridge(cloud):
+    with MockQSServer() as bridge:
+        transport = BridgeTransport(bridge.base_uri, cloud_base_uri=cloud.base_uri)
+        with make_client(cloud, transport) as client, transport:
+            device_id = next(iter(bridge.devices))
+            assert client.control_device(device_id, 30).level == 30
+            assert client.get_all_device_status()[device_id].value == 30
+
+    assert bridge.requests == {"control": 1, "state": 1}
+    assert cloud.requests == {"keys": 1}
+    assert transport.local_requests == 2
+    assert transport.fallbacks == 0
+
+
+def test_bridge_key_replaces_cloud_key(cloud):
+    with MockQSServer() as bridge:
+        bridge.keys = {"local-key"}
+        transport = BridgeTransport(
+            bridge.base_uri, cloud_base_uri=cloud.base_uri, bridge_key="local-key"
+        )
+        with make_client(cloud, transport) as client, transport:
+            assert len(client.get_all_device_status()) == len(bridge.devices)
+
+    assert bridge.requests["state"] == 1
+    assert cloud.requests["state"] == 0
+
+
+def test_falls_back_to_cloud_when_bridge_unreachable(cloud, unreachable_uri, clock):
+    transport = BridgeTransport(
+        unreachable_uri, cloud_base_uri=cloud.base_uri, retry_after=30, clock=clock
+    )
+    with make_client(cloud, transport) as client, transport:
+        assert len(client.get_all_device_status()) == len(cloud.devices)
+        assert not transport.bridge_available
+        client.get_all_device_status()
+        assert transport.fallbacks == 1
+
+        clock.now = 30
+        assert transport.bridge_available
+        client.get_all_device_status()
+        assert transport.fallbacks == 2
+
+    assert cloud.requests["state"] == 3
+
+
+def test_falls_back_to_cloud_on_bridge_server_error(cloud):
+    with MockQSServer(error_rate=1.0) as bridge:
+        transport = BridgeTransport(bridge.base_uri, cloud_base_uri=cloud.base_uri)
+        with make_client(cloud, transport) as client, transport:
+            device_id = next(iter(cloud.devices))
+            assert client.control_device(device_id, 40).level == 40
+
+    assert bridge.requests["errors"] == 1
+    assert cloud.requests["control"] == 1
+    assert transport.fallbacks == 1
+
+
+def test_only_device_endpoints_are_routed_locally():
+    transport = BridgeTransport(
+        "http://bridge/api/v1", cloud_base_uri="https://cloud/api/v1/", bridge_key="k"
+    )
+
+    assert transport.local_url("https://cloud/api/v1/keys") is None
+    assert transport.local_url("https://elsewhere/api/v1/state/abc/") is None
+    assert (
+        transport.local_url("https://cloud/api/v1/control/abc/?device=%40a&setlevel=1")
+        == "http://bridge/api/v1/control/k/?device=%40a&setlevel=1"
+    )
+
+
+class StallingTransport(Transport):
+    """A transport whose bridge requests time out after advancing the clock."""
+
+    def __init__(self, clock, stall: float) -> None:
+        """Initialize the transport."""
+        self.clock = clock
+        self.stall = stall
+        self.cloud_timeouts = []
+
+    def get(self, url, timeout=None, *, deadline=None):
+        """Time out on the bridge, and record the timeouts of cloud requests."""
+        if url.startswith(BRIDGE_URI):
+            self.clock.advance(self.stall)
+            raise requests.exceptions.ReadTimeout
+        self.cloud_timeouts.append(timeout)
+        return SimpleNamespace(status_code=200)
+
+    def post(self, url, json=None, timeout=None, *, deadline=None):
+        """Not used."""
+        raise NotImplementedError
+
+
+def test_cloud_fallback_is_bounded_by_remaining_deadline(clock):
+    inner = StallingTransport(clock, stall=4)
+    transport = BridgeTransport(BRIDGE_URI, inner, clock=clock)
+    url = UrlBuilder.build_get_all_device_status_url("key")
+    deadline = Deadline(10, clock=clock)
+
+    transport.get(url, timeout=deadline.clamp((5, 15)), deadline=deadline)
+
+    assert inner.cloud_timeouts == [(5, 6)]
+
+
+def test_cloud_fallback_is_not_sent_past_deadline(clock):
+    inner = StallingTransport(clock, stall=10)
+    transport = BridgeTransport(BRIDGE_URI, inner, clock=clock)
+    url = UrlBuilder.build_get_all_device_status_url("key")
+    deadline = Deadline(10, clock=clock)
+
+    with pytest.raises(QSDeadlineExceededError):
+        transport.get(url, timeout=deadline.clamp((5, 15)), deadline=deadline)
+    assert inner.cloud_timeouts == []
@@ -0,0 +1,104 @@
+"""Tests for the incremental device status change feed."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from qwikswitchapi.changes import ChangeFeed, StatusDiffer
+from qwikswitchapi.constants import ChangeType
+from qwikswitchapi.entities import DeviceStatus, DeviceStatuses
+
+
+def status(device_id, epoch=1, value=0):
+    return DeviceStatus(device_id, "RELAY QS-D-S5", "v3.3", epoch, 59, value)
+
+
+def snapshot(*statuses: DeviceStatus):
+    return DeviceStatuses(list(statuses))
+
+
+def test_first_snapshot_reports_all_devices_added():
+    changes = StatusDiffer().diff(snapshot(status("@1"), status("@2")))
+
+    assert [(c.change_type, c.device_id) for c in changes] == [
+        (ChangeType.added, "@1"),
+        (ChangeType.added, "@2"),
+    ]
+
+
+def test_only_changed_devices_are_reported():
+    differ = StatusDiffer()
+    differ.diff(snapshot(status("@1"), status("@2"), status("@3")))
+
+    changes = differ.diff(
+        snapshot(status("@1"), status("@2", value=50), status("@3", epoch=2))
+    )
+
+    assert [(c.change_type, c.device_id) for c in changes] == [
+        (ChangeType.changed, "@2"),
+        (ChangeType.changed, "@3"),
+    ]
+    assert changes[0].previous.value == 0
+    assert changes[0].current.value == 50
+
+
+def test_added_and_removed_devices_are_reported():
+    differ = StatusDiffer()
+    differ.diff(snapshot(status("@1"), status("@2")))
+
+    changes = differ.diff(snapshot(status("@2"), status("@3")))
+
+    assert [(c.change_type, c.device_id) for c in changes] == [
+        (ChangeType.added, "@3"),
+        (ChangeType.removed, "@1"),
+    ]
+    assert changes[1].current is None
+
+
+def test_feed_without_initial_emission_skips_first_snapshot():
+    client = MagicMock()
+    client.get_all_device_status.side_effect = [
+        snapshot(status("@1")),
+        snapshot(status("@1", value=100)),
+    ]
+    feed = ChangeFeed(client, interval=0, emit_initial=False)
+
+    assert feed.poll() == []
+    assert [c.device_id for c in feed.poll()] == ["@1"]
+
+
+def test_feed_iterates_until_stopped():
+    client = MagicMock()
+    client.get_all_device_status.side_effect = [
+        snapshot(status("@1")),
+        snapshot(status("@1"), status("@2")),
+    ]
+    feed = ChangeFeed(client, interval=0)
+
+    seen = []
+    for change in feed:
+        seen.append(change.device_id)
+        if len(seen) == 2:
+            feed.stop()
+
+    assert seen == ["@1", "@2"]
+
+
+def test_feed_async_iteration():
+    client = MagicMock()
+    snapshots = iter([snapshot(status("@1")), snapshot(status("@1", value=10))])
+
+    async def get_all_device_status():
+        return next(snapshots)
+
+    client.get_all_device_status = get_all_device_status
+    feed = ChangeFeed(client, interval=0)
+
+    async def collect():
+        seen = []
+        async for change in feed:
+            seen.append(change.change_type)
+            if len(seen) == 2:
+                feed.stop()
+        return seen
+
+    assert asyncio.run(collect()) == [ChangeType.added, ChangeType.changed]
@@ -0,0 +1,135 @@
+"""Tests for managing many accounts with QSClientPool."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from qwikswitchapi.entities import ApiKeys
+from qwikswitchapi.exceptions import QSAuthError
+from qwikswitchapi.pool import QSClientPool
+from qwikswitchapi.testing import MockQSServer
+from qwikswitchapi.transport import Transport
+
+STATE = json.dumps(
+    {
+        "success": True,
+        "@111111": {
+            "type": "RELAY QS-R-S5",
+            "firmware": "v3.3",
+            "epoch": "1736018000",
+            "rssi": "80%",
+            "value": 0,
+        },
+    }
+).encode()
+
+
+class SlowTransport(Transport):
+    """A transport answering every GET with a device status after a delay."""
+
+    def __init__(self, delay: float = 0.02) -> None:
+        """Initialize the transport."""
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None, *, deadline=None):
+        """Return a status response, tracking concurrency."""
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return SimpleNamespace(
+            status_code=200,
+            content=STATE,
+            text=STATE.decode(),
+            json=lambda: json.loads(STATE),
+            request=SimpleNamespace(url=url),
+        )
+
+    def post(self, url, json=None, timeout=None, *, deadline=None):
+        """Answer like a GET, ignoring the body."""
+        return self.get(url, timeout)
+
+
+def add_accounts(pool, count):
+    for i in range(count):
+        client = pool.add_account(f"account-{i}", f"user{i}@example.com", "master")
+        client.api_keys = ApiKeys(f"r{i}", f"rw{i}")
+
+
+def test_poll_all_accounts_in_parallel():
+    with MockQSServer(device_count=3) as server, QSClientPool(max_workers=4) as pool:
+        for i in range(6):
+            pool.add_account(f"account-{i}", "email", "master", server.base_uri)
+
+        result = pool.poll_all()
+
+    assert result.succeeded
+    assert sorted(result.results) == [f"account-{i}" for i in range(6)]
+    assert all(len(statuses) == 3 for statuses in result.results.values())
+    assert server.requests["state"] == 6
+
+
+def test_api_keys_are_reused_when_account_is_re_added():
+    with MockQSServer() as server, QSClientPool() as pool:
+        pool.add_account("account", "email", "master", server.base_uri)
+        pool.get_all_device_status("account")
+        pool.remove_account("account")
+        pool.add_account("account", "email", "master", server.base_uri)
+        pool.get_all_device_status("account")
+
+    assert server.requests["keys"] == 1
+    assert server.requests["state"] == 2
+
+
+def test_failures_are_isolated_per_account():
+    with MockQSServer() as server, QSClientPool() as pool:
+        pool.add_account("good", "email", "master", server.base_uri)
+        pool.add_account("bad", "email", "wrong", server.base_uri)
+
+        result = pool.poll_all()
+
+    assert list(result.results) == ["good"]
+    assert isinstance(result.errors["bad"], QSAuthError)
+
+
+def test_global_concurrency_limit():
+    transport = SlowTransport()
+    with QSClientPool(max_workers=10, max_concurrent=3, transport=transport) as pool:
+        add_accounts(pool, 10)
+        assert pool.poll_all().succeeded
+
+    assert transport.max_in_flight == 3
+
+
+def test_per_account_concurrency_limit():
+    transport = SlowTransport()
+    with QSClientPool(transport=transport, max_concurrent_per_account=2) as pool:
+        add_accounts(pool, 1)
+        client = pool.client("account-0")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: client.get_all_device_status(), range(8)))
+
+    assert transport.max_in_flight == 2
+
+
+def test_accounts_are_managed_by_identifier():
+    with QSClientPool(transport=SlowTransport()) as pool:
+        add_accounts(pool, 2)
+        with pytest.raises(ValueError, match="already in the pool"):
+            pool.add_account("account-0", "email", "master")
+
+        pool.remove_account("account-0")
+
+        assert "account-0" not in pool
+        assert pool.accounts == ["account-1"]
+        assert len(pool) == 1
+        assert pool.get_all_device_status("account-1")["@111111"].value == 0
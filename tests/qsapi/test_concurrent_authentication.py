@@ -0,0 +1,62 @@
+"""Stress tests for authentication of a QSClient shared between threads."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.entities import ApiKeys
+from qwikswitchapi.keystore import MemoryKeyStore
+from qwikswitchapi.testing import READ_WRITE_KEY, MockQSServer
+from qwikswitchapi.transport import HttpTransport
+
+THREADS = 32
+
+
+@pytest.fixture
+def server():
+    with MockQSServer(device_count=5, latency=0.05) as s:
+        yield s
+
+
+def run_concurrently(func):
+    barrier = threading.Barrier(THREADS)
+
+    def call(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return list(executor.map(call, range(THREADS)))
+
+
+def make_client(server, **kwargs):  # noqa: ANN003
+    return QSClient(
+        "email",
+        "master",
+        server.base_uri,
+        transport=HttpTransport(pool_maxsize=THREADS),
+        **kwargs,
+    )
+
+
+def test_concurrent_first_requests_generate_keys_once(server):
+    with make_client(server) as client:
+        results = run_concurrently(client.get_all_device_status)
+
+    assert server.requests["keys"] == 1
+    assert server.requests["state"] == THREADS
+    assert all(len(statuses) == 5 for statuses in results)
+
+
+def test_concurrent_rejections_regenerate_keys_once(server):
+    key_store = MemoryKeyStore()
+    key_store.save("email", "master", ApiKeys("stale", "stale"))
+
+    with make_client(server, key_store=key_store) as client:
+        run_concurrently(lambda: client.control_device("@000001", 30))
+
+    assert server.requests["keys"] == 1
+    assert server.requests["control"] == 2 * THREADS
+    assert key_store.load("email", "master").read_write_key == READ_WRITE_KEY
@@ -0,0 +1,106 @@
+"""Tests for the control_devices method of the Qwikswitch API client."""
+
+import requests
+
+from qwikswitchapi.exceptions import (
+    QSRequestError,
+    QSRequestFailedError,
+    QSResponseParseError,
+)
+from qwikswitchapi.utility import UrlBuilder
+
+
+def mock_control(client, mock_request, device_id, level, **kwargs):  # noqa: ANN003
+    mock_request.get(
+        UrlBuilder.build_control_url(client._api_keys.read_write_key, device_id, level),
+        **kwargs,
+    )
+
+
+def test_success_returns_result_per_device(authenticated_api_client, mock_request):
+    levels = {f"@11111{i}": i * 10 for i in range(6)}
+    for device_id, level in levels.items():
+        mock_control(
+            authenticated_api_client,
+            mock_request,
+            device_id,
+            level,
+            json={"success": True, "device": device_id, "level": level},
+        )
+
+    batch = authenticated_api_client.control_devices(levels, max_workers=3)
+
+    assert batch.succeeded
+    assert mock_request.call_count == len(levels)
+    assert list(batch.results) == list(levels)
+    assert {d: r.level for d, r in batch.results.items()} == levels
+    assert batch.elapsed >= 0
+
+
+def test_failures_do_not_abort_batch(authenticated_api_client, mock_request):
+    mock_control(
+        authenticated_api_client,
+        mock_request,
+        "@111111",
+        50,
+        json={"success": True, "device": "@111111", "level": 50},
+    )
+    mock_control(
+        authenticated_api_client,
+        mock_request,
+        "@111112",
+        50,
+        json={"error": "INVALID DEVICE ID"},
+    )
+    mock_control(
+        authenticated_api_client,
+        mock_request,
+        "@111113",
+        50,
+        exc=requests.exceptions.Timeout,
+    )
+
+    batch = authenticated_api_client.control_devices(
+        {"@111111": 50, "@111112": 50, "@111113": 50}
+    )
+
+    assert not batch.succeeded
+    assert list(batch.results) == ["@111111"]
+    assert isinstance(batch.errors["@111112"], QSRequestError)
+    assert isinstance(batch.errors["@111113"], QSRequestFailedError)
+
+
+def test_malformed_response_does_not_abort_batch(
+    authenticated_api_client, mock_request
+):
+    mock_control(
+        authenticated_api_client,
+        mock_request,
+        "@111111",
+        50,
+        json={"success": True, "device": "@111111", "level": 50},
+    )
+    mock_control(
+        authenticated_api_client, mock_request, "@111112", 50, json={"success": True}
+    )
+
+    batch = authenticated_api_client.control_devices({"@111111": 50, "@111112": 50})
+
+    assert list(batch.results) == ["@111111"]
+    assert isinstance(batch.errors["@111112"], QSResponseParseError)
+
+
+def test_authenticates_once_before_fan_out(api_client, mock_request):
+    response = {"ok": 1, "r": "aaaa-bbbb-cccc-dddd", "rw": "1111-2222-3333-4444"}
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), json=response)
+    levels = {f"@11111{i}": 100 for i in range(5)}
+    for device_id in levels:
+        mock_request.get(
+            UrlBuilder.build_control_url(response["rw"], device_id, 100),
+            json={"success": True, "device": device_id, "level": 100},
+        )
+
+    batch = api_client.control_devices(levels)
+
+    assert batch.succeeded
+    assert sum(r.method == "POST" for r in mock_request.request_history) == 1
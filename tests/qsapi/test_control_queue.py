@@ -0,0 +1,115 @@
+"""Tests for the coalescing control queue."""
+
+import threading
+
+import pytest
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.control_queue import ControlQueue
+from qwikswitchapi.entities import ControlResult
+from qwikswitchapi.exceptions import QSRequestError
+from qwikswitchapi.testing import MockQSServer
+
+
+class GatedClient:
+    """A client whose control requests block until released."""
+
+    def __init__(self) -> None:
+        """Initialize the client with the gate closed."""
+        self.calls = []
+        self.started = threading.Semaphore(0)
+        self.gate = threading.Event()
+        self._lock = threading.Lock()
+
+    def control_device(self, device_id, level):
+        """Record the call and wait for the gate to open."""
+        with self._lock:
+            self.calls.append((device_id, level))
+        self.started.release()
+        self.gate.wait(5)
+        if level < 0:
+            msg = "INVALID LEVEL"
+            raise QSRequestError(msg)
+        return ControlResult(device_id, level)
+
+
+def test_commands_are_coalesced_last_level_wins():
+    client = GatedClient()
+    with ControlQueue(client) as queue:
+        first = queue.submit("@111111", 10)
+        assert client.started.acquire(timeout=5)
+        rest = [queue.submit("@111111", level) for level in range(20, 100, 10)]
+        client.gate.set()
+
+        assert first.result(5).level == 10
+        assert {future.result(5).level for future in rest} == {90}
+
+    assert client.calls == [("@111111", 10), ("@111111", 90)]
+    assert queue.submitted == 9
+    assert queue.sent == 2
+    assert queue.coalesced == 7
+
+
+def test_devices_are_controlled_independently():
+    client = GatedClient()
+    with ControlQueue(client, max_workers=4) as queue:
+        futures = [queue.submit(f"@11111{i}", 50) for i in range(4)]
+        for _ in futures:
+            assert client.started.acquire(timeout=5)
+        client.gate.set()
+
+        assert [future.result(5).device_id for future in futures] == [
+            f"@11111{i}" for i in range(4)
+        ]
+
+
+def test_in_flight_limit_per_device():
+    client = GatedClient()
+    with ControlQueue(client, max_in_flight_per_device=2) as queue:
+        queue.submit("@111111", 10)
+        queue.submit("@111111", 20)
+        assert client.started.acquire(timeout=5)
+        assert client.started.acquire(timeout=5)
+        queue.submit("@111111", 30)
+        assert len(client.calls) == 2
+        client.gate.set()
+
+    assert sorted(client.calls) == [("@111111", 10), ("@111111", 20), ("@111111", 30)]
+
+
+def test_errors_are_delivered_to_every_caller():
+    client = GatedClient()
+    client.gate.set()
+    with ControlQueue(client) as queue:
+        future = queue.submit("@111111", -1)
+        with pytest.raises(QSRequestError):
+            future.result(5)
+
+
+def test_close_without_wait_cancels_pending_commands():
+    client = GatedClient()
+    queue = ControlQueue(client)
+    running = queue.submit("@111111", 10)
+    assert client.started.acquire(timeout=5)
+    pending = queue.submit("@111111", 20)
+
+    queue.close(wait=False)
+    client.gate.set()
+
+    assert pending.cancelled()
+    assert running.result(5).level == 10
+    with pytest.raises(RuntimeError):
+        queue.submit("@111111", 30)
+
+
+def test_queue_cuts_request_volume_against_server():
+    with (
+        MockQSServer(latency=0.02) as server,
+        QSClient("email", "master", server.base_uri) as client,
+    ):
+        device_id = next(iter(server.devices))
+        with ControlQueue(client) as queue:
+            futures = [queue.submit(device_id, level) for level in range(100)]
+            assert futures[-1].result(5).level == 99
+
+        assert 1 <= server.requests["control"] < 10
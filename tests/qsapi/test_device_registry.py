@@ -0,0 +1,129 @@
+"""Tests for the registry of device classes."""
+
+import json
+
+import pytest
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.constants import DEVICES, DeviceClass
+from qwikswitchapi.devices import DEFAULT_REGISTRY, DeviceRegistry
+from qwikswitchapi.entities import DeviceStatus, DeviceStatuses
+from qwikswitchapi.utility import UrlBuilder
+
+SENSOR = "SENSOR QS-S-S1"
+
+RESPONSE = {
+    "success": True,
+    "@11111a": {
+        "type": "RELAY QS-D-S5",
+        "firmware": "v3.3",
+        "epoch": "1736018165",
+        "rssi": "59%",
+        "value": 0,
+    },
+    "@11111b": {
+        "type": SENSOR,
+        "firmware": "v3.3",
+        "epoch": "1736018046",
+        "rssi": "58%",
+        "value": 0,
+    },
+}
+
+
+def test_default_registry_resolves_known_types():
+    assert DEFAULT_REGISTRY.resolve("RELAY QS-R-S5") == DeviceClass.relay
+    assert DEFAULT_REGISTRY.resolve(SENSOR) == DeviceClass.unknown
+    assert DEFAULT_REGISTRY.devices == DEVICES
+
+
+def test_extend_returns_new_registry_without_changing_defaults():
+    defaults = dict(DEVICES)
+    registry = DEFAULT_REGISTRY.extend(
+        {SENSOR: DeviceClass.humidity_temperature, "RELAY QS-D-S5": DeviceClass.relay}
+    )
+
+    assert registry.resolve(SENSOR) == DeviceClass.humidity_temperature
+    assert registry.resolve("RELAY QS-D-S5") == DeviceClass.relay
+    assert SENSOR not in DEFAULT_REGISTRY
+    assert defaults == DEVICES
+
+
+def test_registry_without_defaults():
+    registry = DeviceRegistry({SENSOR: DeviceClass.relay}, include_defaults=False)
+
+    assert list(registry) == [SENSOR]
+    assert registry.resolve("RELAY QS-D-S5") == DeviceClass.unknown
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_statuses_resolve_classes_with_registry(lazy):
+    registry = DeviceRegistry({SENSOR: DeviceClass.humidity_temperature})
+
+    statuses = DeviceStatuses.from_json(RESPONSE, lazy=lazy, registry=registry)
+
+    assert statuses.by_class(DeviceClass.humidity_temperature) == [statuses["@11111b"]]
+    assert [s.device_class for s in statuses.stream()] == [
+        DeviceClass.dimmer,
+        DeviceClass.humidity_temperature,
+    ]
+
+
+def test_client_uses_device_registry(mock_request, mock_api_keys):
+    registry = DeviceRegistry({SENSOR: DeviceClass.relay})
+    client = QSClient("email", "master", device_registry=registry)
+    client._api_keys = mock_api_keys
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url(mock_api_keys.read_write_key),
+        json=RESPONSE,
+    )
+
+    statuses = client.get_all_device_status()
+
+    assert statuses["@11111b"].device_class == DeviceClass.relay
+
+
+def test_type_and_firmware_strings_are_interned():
+    first, second = (
+        DeviceStatuses.from_json(json.loads(json.dumps(RESPONSE)))["@11111a"]
+        for _ in range(2)
+    )
+
+    assert first.device_type is second.device_type
+    assert first.firmware is second.firmware
+
+
+def test_device_class_is_not_part_of_the_value():
+    relay = DeviceRegistry({SENSOR: DeviceClass.relay})
+    status = DeviceStatus("@1", SENSOR, "v1", 1, 50, 0, registry=relay)
+
+    assert status == DeviceStatus("@1", SENSOR, "v1", 1, 50, 0)
+    assert repr(status) == (
+        "DeviceStatus(device_id='@1', device_type='SENSOR QS-S-S1', "
+        "firmware='v1', epoch=1, rssi=50, value=0)"
+    )
+
+
+def test_default_registry_sees_types_added_to_devices(monkeypatch):
+    monkeypatch.setitem(DEVICES, SENSOR, DeviceClass.relay)
+
+    assert DEFAULT_REGISTRY.resolve(SENSOR) == DeviceClass.relay
+    assert SENSOR in DEFAULT_REGISTRY.extend({})
+    assert DeviceStatus("@1", SENSOR, "v1", 1, 50, 0).device_class == DeviceClass.relay
+
+
+def test_device_class_is_resolved_on_first_access():
+    class CountingRegistry(DeviceRegistry):
+        __slots__ = ("lookups",)
+
+        def resolve(self, device_type):
+            self.lookups += 1
+            return super().resolve(device_type)
+
+    registry = CountingRegistry()
+    registry.lookups = 0
+    status = DeviceStatus("@1", SENSOR, "v1", 1, 50, 0, registry=registry)
+    assert registry.lookups == 0
+
+    assert status.device_class == status.device_class == DeviceClass.unknown
+    assert registry.lookups == 1
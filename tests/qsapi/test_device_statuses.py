@@ -0,0 +1,60 @@
+"""Tests for lookups on DeviceStatuses."""
+
+import pytest
+
+from qwikswitchapi.constants import DeviceClass
+from qwikswitchapi.entities import DeviceStatus, DeviceStatuses
+
+
+@pytest.fixture
+def statuses():
+    return DeviceStatuses(
+        [
+            DeviceStatus("@11111a", "RELAY QS-D-S5", "v3.3", 1, 59, 0),
+            DeviceStatus("@11111b", "RELAY QS-R-S5", "v3.3", 1, 58, 100),
+            DeviceStatus("@11111c", "RELAY QS-D-S5", "v3.3", 1, 57, 40),
+            DeviceStatus("@11111d", "RELAY QS-Q-S9", "v3.3", 1, 56, 0),
+        ]
+    )
+
+
+def test_lookup_by_device_id(statuses):
+    assert statuses["@11111b"].value == 100
+    assert statuses.get("@11111c").rssi == 57
+    assert statuses.get("@missing") is None
+
+
+def test_lookup_of_missing_device_raises_key_error(statuses):
+    with pytest.raises(KeyError):
+        statuses["@missing"]
+
+
+def test_lookup_by_position(statuses):
+    assert statuses[0].device_id == "@11111a"
+    assert statuses[-1].device_id == "@11111d"
+
+
+def test_contains_len_and_iteration(statuses):
+    assert "@11111a" in statuses
+    assert "@missing" not in statuses
+    assert len(statuses) == 4
+    assert [s.device_id for s in statuses] == [
+        "@11111a",
+        "@11111b",
+        "@11111c",
+        "@11111d",
+    ]
+
+
+def test_by_class(statuses):
+    assert [s.device_id for s in statuses.by_class(DeviceClass.dimmer)] == [
+        "@11111a",
+        "@11111c",
+    ]
+    assert [s.device_id for s in statuses.by_class(DeviceClass.unknown)] == ["@11111d"]
+    assert statuses.by_class(DeviceClass.humidity_temperature) == []
+
+
+def test_indexes_share_underlying_statuses(statuses):
+    assert statuses["@11111a"] is statuses.statuses[0]
+    assert statuses.by_class(DeviceClass.relay)[0] is statuses.statuses[1]
@@ -0,0 +1,87 @@
+"""Tests for the value semantics of the entities."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from qwikswitchapi.entities import (
+    ApiKeys,
+    ControlResult,
+    DeviceStatus,
+    DeviceStatuses,
+)
+from qwikswitchapi.exceptions import QSResponseParseError
+from qwikswitchapi.utility import ResponseParser
+
+
+def make_status(value=0):
+    return DeviceStatus("@11111a", "RELAY QS-D-S5", "v3.3", 1736018165, 59, value)
+
+
+@pytest.mark.parametrize(
+    ("first", "same", "different"),
+    [
+        (ApiKeys("r", "rw"), ApiKeys("r", "rw"), ApiKeys("r", "other")),
+        (ControlResult("@1", 50), ControlResult("@1", 50), ControlResult("@1", 0)),
+        (make_status(), make_status(), make_status(100)),
+    ],
+)
+def test_entities_compare_and_hash_by_value(first, same, different):
+    assert first == same
+    assert hash(first) == hash(same)
+    assert first != different
+    assert len({first, same, different}) == 2
+
+
+def test_entities_of_different_types_are_not_equal():
+    assert ControlResult("@1", 50) != ("@1", 50)
+
+
+def test_entities_are_slotted_and_read_only():
+    status = make_status()
+
+    assert not hasattr(status, "__dict__")
+    with pytest.raises(AttributeError):
+        status.value = 100
+    with pytest.raises(AttributeError):
+        status.extra = 1
+
+
+def test_repr_lists_values():
+    assert repr(ControlResult("@1", 50)) == "ControlResult(device_id='@1', level=50)"
+
+
+def test_device_statuses_from_json_skips_success_and_parses_rssi():
+    statuses = DeviceStatuses.from_json(
+        {
+            "success": True,
+            "@1": {
+                "type": "t",
+                "firmware": "f",
+                "epoch": "1",
+                "rssi": "59%",
+                "value": 0,
+            },
+            "@2": {"type": "t", "firmware": "f", "epoch": "2", "rssi": "7", "value": 1},
+        }
+    )
+
+    assert [s.device_id for s in statuses] == ["@1", "@2"]
+    assert [s.rssi for s in statuses] == [59, 7]
+    assert statuses["@1"] == DeviceStatus.from_json(
+        {"@1": {"type": "t", "firmware": "f", "epoch": "1", "rssi": "59%", "value": 0}}
+    )
+
+
+def test_device_status_from_json_rejects_multiple_devices():
+    state = {"type": "t", "firmware": "f", "epoch": "1", "rssi": "59%", "value": 0}
+
+    with pytest.raises(QSResponseParseError):
+        DeviceStatus.from_json({"@1": state, "@2": state})
+
+
+def test_parse_json_falls_back_to_response_decoder():
+    resp = MagicMock(content=b"not json")
+    resp.json.return_value = {"ok": 1}
+
+    assert ResponseParser.parse_json(resp) == {"ok": 1}
@@ -0,0 +1,139 @@
+"""Tests for the streaming snapshot exporter."""
+
+import csv
+import gzip
+import json
+
+import pytest
+
+from qwikswitchapi.constants import ExportFormat
+from qwikswitchapi.entities import DeviceStatus, DeviceStatuses
+from qwikswitchapi.export import EXPORT_FIELDS, SnapshotExporter
+
+RESPONSE = {
+    "success": True,
+    "@11111a": {
+        "type": "RELAY QS-D-S5",
+        "firmware": "v3.3",
+        "epoch": "1736018165",
+        "rssi": "59%",
+        "value": 0,
+    },
+    "@11111b": {
+        "type": "RELAY QS-R-S5",
+        "firmware": "v3.3",
+        "epoch": "1736018046",
+        "rssi": "57%",
+        "value": 100,
+    },
+}
+
+
+def test_ndjson_records_one_line_per_device(tmp_path):
+    path = tmp_path / "snapshots.ndjson"
+    with SnapshotExporter(path) as exporter:
+        assert exporter.write(DeviceStatuses.from_json(RESPONSE), timestamp=60.0) == 2
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0] == {
+        "timestamp": 60.0,
+        "device_id": "@11111a",
+        "type": "RELAY QS-D-S5",
+        "firmware": "v3.3",
+        "epoch": 1736018165,
+        "rssi": 59,
+        "value": 0,
+        "device_class": "dimmer",
+    }
+    assert lines[1]["device_class"] == "relay"
+
+
+def test_csv_header_is_written_once_when_appending(tmp_path):
+    path = tmp_path / "snapshots.csv"
+    with SnapshotExporter(path, "csv") as exporter:
+        exporter.write(DeviceStatuses.from_json(RESPONSE), timestamp=60.0)
+    with SnapshotExporter(path, ExportFormat.csv, append=True) as exporter:
+        exporter.write(DeviceStatuses.from_json(RESPONSE), timestamp=120.0)
+
+    with path.open(newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == list(EXPORT_FIELDS)
+    assert len(rows) == 5
+    assert [row[0] for row in rows[1:]] == ["60.0", "60.0", "120.0", "120.0"]
+
+
+def test_replaces_existing_file_unless_appending(tmp_path):
+    path = tmp_path / "snapshots.ndjson"
+    path.write_text("stale\n")
+    with SnapshotExporter(path) as exporter:
+        exporter.write(DeviceStatuses.from_json(RESPONSE), timestamp=1.0)
+
+    assert "stale" not in path.read_text()
+
+
+def test_gzip_appends_members(tmp_path):
+    path = tmp_path / "snapshots.ndjson.gz"
+    for timestamp in (1.0, 2.0):
+        with SnapshotExporter(path, compress=True, append=True) as exporter:
+            exporter.write(DeviceStatuses.from_json(RESPONSE), timestamp=timestamp)
+
+    with gzip.open(path, "rt") as file:
+        timestamps = [json.loads(line)["timestamp"] for line in file]
+    assert timestamps == [1.0, 1.0, 2.0, 2.0]
+
+
+def test_rotates_after_snapshot_reaching_max_bytes(tmp_path):
+    path = tmp_path / "snapshots.ndjson"
+    exporter = SnapshotExporter(path, max_bytes=1, backup_count=2)
+    for timestamp in (1.0, 2.0, 3.0):
+        exporter.write(DeviceStatuses.from_json(RESPONSE), timestamp=timestamp)
+    exporter.close()
+
+    assert exporter.rotations == 3
+    assert exporter.records_written == 6
+    assert not path.exists()
+    newest = path.with_name("snapshots.ndjson.1").read_text().splitlines()
+    assert json.loads(newest[0])["timestamp"] == 3.0
+    assert path.with_name("snapshots.ndjson.2").exists()
+    assert not path.with_name("snapshots.ndjson.3").exists()
+
+
+def test_lazy_snapshots_are_streamed_without_caching(tmp_path):
+    statuses = DeviceStatuses.from_json(RESPONSE, lazy=True)
+    with SnapshotExporter(tmp_path / "snapshots.ndjson") as exporter:
+        exporter.write(statuses, timestamp=1.0)
+
+    assert statuses._by_id == {}
+
+
+def test_accepts_iterables_of_statuses(tmp_path):
+    path = tmp_path / "snapshots.csv"
+    statuses = (DeviceStatus(f"@{i}", "UNKNOWN", "v1", i, 50, 0) for i in range(3))
+    with SnapshotExporter(path, "csv") as exporter:
+        assert exporter.write(statuses, timestamp=1.0) == 3
+
+    assert path.read_text().splitlines()[1] == "1.0,@0,UNKNOWN,v1,0,50,0,unknown"
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="parquet"):
+        SnapshotExporter(tmp_path / "snapshots", "parquet")
+
+
+def test_size_counts_encoded_bytes(tmp_path):
+    path = tmp_path / "snapshots.csv"
+    statuses = [DeviceStatus("@1", "RELAY QS-Ü-S5", "v1", 1, 50, 0)]
+    with SnapshotExporter(path, "csv") as exporter:
+        exporter.write(statuses, timestamp=1.0)
+        assert exporter._writer.size == path.stat().st_size
+
+
+def test_appended_gzip_starts_from_uncompressed_size(tmp_path):
+    path = tmp_path / "snapshots.ndjson.gz"
+    with SnapshotExporter(path, compress=True) as exporter:
+        exporter.write(DeviceStatuses.from_json(RESPONSE), timestamp=1.0)
+    uncompressed = len(gzip.decompress(path.read_bytes()))
+
+    with SnapshotExporter(path, compress=True, append=True) as exporter:
+        exporter.write([], timestamp=2.0)
+        assert exporter._writer.size == uncompressed
@@ -0,0 +1,133 @@
+"""Tests for polling many accounts across worker processes."""
+
+import os
+import signal
+import time
+
+from qwikswitchapi.constants import ChangeType
+from qwikswitchapi.fleet import FleetChange, FleetFailure, FleetPoller
+from qwikswitchapi.keystore import KeyStore
+from qwikswitchapi.testing import MockQSServer
+
+
+class BrokenKeyStore(KeyStore):
+    """A key store whose loads fail with an error the client does not expect."""
+
+    def load(self, email, master_key):
+        """Fail as a buggy key store would."""
+        msg = "key store is broken"
+        raise RuntimeError(msg)
+
+    def save(self, email, master_key, api_keys):
+        """Discard the keys."""
+
+    def delete(self, email, master_key):
+        """Do nothing."""
+
+
+def collect(poller, until, timeout=10):
+    changes = []
+    deadline = time.monotonic() + timeout
+    while not until(changes) and time.monotonic() < deadline:
+        changes.extend(poller.changes(duration=0.2))
+    return changes
+
+
+def test_changes_are_streamed_from_workers():
+    with MockQSServer(device_count=3) as server:
+        poller = FleetPoller(workers=2, interval=0.05)
+        for i in range(4):
+            poller.add_account(f"account-{i}", "email", "master", server.base_uri)
+
+        with poller:
+            initial = collect(poller, lambda changes: len(changes) >= 12)
+            device_id = next(iter(server.devices))
+            server.devices[device_id]["value"] = 42
+            server.devices[device_id]["epoch"] = "1800000000"
+            updates = collect(poller, lambda changes: len(changes) >= 4)
+            stats = poller.stats()
+
+    assert len(initial) == 12
+    assert {change.change_type for change in initial} == {ChangeType.added}
+    assert {change.account_id for change in initial} == {
+        f"account-{i}" for i in range(4)
+    }
+    assert len(updates) == 4
+    assert all(change.change_type is ChangeType.changed for change in updates)
+    assert all(change.value == 42 for change in updates)
+    assert stats["workers"] == 2
+    assert stats["polls"] >= 8
+    assert stats["changes"] >= 16
+    assert stats["polls_per_second"] > 0
+
+
+def test_crashed_worker_is_restarted():
+    with MockQSServer(device_count=1) as server:
+        poller = FleetPoller(workers=1, interval=0.05, emit_initial=True)
+        poller.add_account("account", "email", "master", server.base_uri)
+
+        with poller:
+            assert collect(poller, lambda changes: len(changes) >= 1)
+            os.kill(poller.worker_pids[0], signal.SIGKILL)
+            resynced = collect(poller, lambda changes: len(changes) >= 1)
+            assert poller.stats()["restarts"] == 1
+
+    assert [change.change_type for change in resynced] == [ChangeType.added]
+
+
+def test_changes_read_while_stopping_are_kept():
+    with MockQSServer(device_count=3) as server:
+        poller = FleetPoller(workers=1, interval=0.05)
+        poller.add_account("account", "email", "master", server.base_uri)
+
+        poller.start()
+        deadline = time.monotonic() + 10
+        while server.requests["state"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.2)
+        poller.stop()
+
+    changes = list(poller.changes())
+    assert len(changes) == poller.stats()["changes"] == 3
+    assert list(poller.changes()) == []
+
+
+def test_change_record_round_trip():
+    change = FleetChange.from_record(("account", "@111111", 3, 1736018000, 80, 50))
+
+    assert change.account_id == "account"
+    assert change.device_id == "@111111"
+    assert change.change_type is ChangeType.changed
+    assert (change.epoch, change.rssi, change.value) == (1736018000, 80, 50)
+
+
+def test_start_twice_keeps_the_same_workers():
+    with MockQSServer(device_count=1) as server:
+        poller = FleetPoller(workers=2, interval=0.05)
+        for i in range(2):
+            poller.add_account(f"account-{i}", "email", "master", server.base_uri)
+
+        with poller:
+            pids = poller.worker_pids
+            poller.start()
+            assert poller.worker_pids == pids
+            assert poller.stats()["workers"] == 2
+
+
+def test_unexpected_errors_are_reported_without_restarting_workers():
+    with MockQSServer(device_count=1) as server:
+        poller = FleetPoller(workers=1, interval=0.05, key_store=BrokenKeyStore())
+        poller.add_account("account", "email", "master", server.base_uri)
+
+        with poller:
+            pid = poller.worker_pids[0]
+            failures = collect(poller, lambda changes: len(changes) >= 2)
+            assert poller.worker_pids == [pid]
+            stats = poller.stats()
+
+    assert all(isinstance(failure, FleetFailure) for failure in failures)
+    assert failures[0].account_id == "account"
+    assert failures[0].error == "RuntimeError: key store is broken"
+    assert stats["restarts"] == 0
+    assert stats["errors"] >= 2
+    assert stats["changes"] == 0
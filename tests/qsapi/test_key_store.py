@@ -0,0 +1,149 @@
+"""Tests for persisting API keys between clients."""
+
+import multiprocessing
+import stat
+
+import pytest
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.entities import ApiKeys
+from qwikswitchapi.exceptions import QSApiKeyRejectedError
+from qwikswitchapi.keystore import FileKeyStore, KeyStore, MemoryKeyStore
+from qwikswitchapi.utility import UrlBuilder
+
+GENERATED = {"ok": 1, "r": "aaaa-bbbb-cccc-dddd", "rw": "1111-2222-3333-4444"}
+
+
+@pytest.fixture(params=["memory", "file"])
+def key_store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryKeyStore()
+    return FileKeyStore(tmp_path / "keys.json")
+
+
+def test_store_round_trip(key_store):
+    assert key_store.load("email", "master") is None
+
+    key_store.save("email", "master", ApiKeys("r", "rw"))
+    key_store.save("other", "master", ApiKeys("r2", "rw2"))
+
+    assert key_store.load("email", "master") == ApiKeys("r", "rw")
+    key_store.delete("email", "master")
+    assert key_store.load("email", "master") is None
+    assert key_store.load("other", "master") == ApiKeys("r2", "rw2")
+
+
+def test_file_store_is_private_and_does_not_contain_master_key(tmp_path):
+    path = tmp_path / "keys.json"
+    FileKeyStore(path).save("email", "secret-master", ApiKeys("r", "rw"))
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert "secret-master" not in path.read_text()
+    assert FileKeyStore(path).load("email", "secret-master") == ApiKeys("r", "rw")
+    assert sorted(tmp_path.iterdir()) == [path, tmp_path / "keys.json.lock"]
+
+
+def test_file_store_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "keys.json"
+    path.write_text("{not json")
+
+    assert FileKeyStore(path).load("email", "master") is None
+
+
+def test_client_saves_generated_keys(key_store, mock_request):
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), json=GENERATED)
+
+    QSClient("email", "master", key_store=key_store).generate_api_keys()
+
+    assert key_store.load("email", "master").read_write_key == GENERATED["rw"]
+
+
+def test_client_uses_stored_keys_without_generating(key_store, mock_request):
+    key_store.save("email", "master", ApiKeys("r", "stored-rw"))
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url("stored-rw"),
+        json={"success": True},
+    )
+
+    QSClient("email", "master", key_store=key_store).get_all_device_status()
+
+    assert [r.method for r in mock_request.request_history] == ["GET"]
+
+
+def test_rejected_stored_key_is_regenerated_and_retried(key_store, mock_request):
+    key_store.save("email", "master", ApiKeys("r", "stale-rw"))
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url("stale-rw"),
+        json={"error": "INVALID_API_KEY"},
+    )
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), json=GENERATED)
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url(GENERATED["rw"]),
+        json={"success": True},
+    )
+    client = QSClient("email", "master", key_store=key_store)
+
+    client.get_all_device_status()
+
+    assert [r.method for r in mock_request.request_history] == ["GET", "POST", "GET"]
+    assert client.api_keys.read_write_key == GENERATED["rw"]
+    assert key_store.load("email", "master").read_write_key == GENERATED["rw"]
+
+
+def test_rejected_generated_key_is_not_retried(mock_request):
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), json=GENERATED)
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url(GENERATED["rw"]),
+        json={"error": "INVALID_API_KEY"},
+    )
+
+    with pytest.raises(QSApiKeyRejectedError):
+        QSClient("email", "master").get_all_device_status()
+
+    assert mock_request.call_count == 2
+
+
+def test_delete_api_keys_removes_stored_keys(key_store, mock_request):
+    key_store.save("email", "master", ApiKeys("r", "rw"))
+    mock_request.post(
+        UrlBuilder.build_delete_api_keys_url(), json={"ok": 1, "r": None, "rw": None}
+    )
+
+    QSClient("email", "master", key_store=key_store).delete_api_keys()
+
+    assert key_store.load("email", "master") is None
+
+
+def test_incomplete_key_store_cannot_be_instantiated():
+    class LoadOnlyKeyStore(KeyStore):
+        def load(self, email, master_key):
+            return None
+
+    with pytest.raises(TypeError, match="save"):
+        LoadOnlyKeyStore()
+
+
+def save_accounts(path, worker, count):
+    store = FileKeyStore(path)
+    for i in range(count):
+        store.save(f"user{worker}-{i}", "master", ApiKeys("r", f"rw{worker}-{i}"))
+
+
+def test_concurrent_processes_do_not_lose_entries(tmp_path):
+    path = tmp_path / "keys.json"
+    processes = [
+        multiprocessing.Process(target=save_accounts, args=(path, worker, 20))
+        for worker in range(6)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+
+    store = FileKeyStore(path)
+    assert all(process.exitcode == 0 for process in processes)
+    assert all(
+        store.load(f"user{worker}-{i}", "master") == ApiKeys("r", f"rw{worker}-{i}")
+        for worker in range(6)
+        for i in range(20)
+    )
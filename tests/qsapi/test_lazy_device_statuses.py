@@ -0,0 +1,89 @@
+"""Tests for lazily parsed DeviceStatuses."""
+
+import pytest
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.constants import DeviceClass
+from qwikswitchapi.entities import DeviceStatuses
+from qwikswitchapi.exceptions import QSResponseParseError
+from qwikswitchapi.utility import UrlBuilder
+
+RESPONSE = {
+    "success": True,
+    "@11111a": {
+        "type": "RELAY QS-D-S5",
+        "firmware": "v3.3",
+        "epoch": "1736018165",
+        "rssi": "59%",
+        "value": 0,
+    },
+    "@11111b": {"type": "RELAY QS-R-S5", "rssi": "58%"},
+    "@11111c": {
+        "type": "RELAY QS-R-S5",
+        "firmware": "v3.3",
+        "epoch": "1736018046",
+        "rssi": "57%",
+        "value": 100,
+    },
+}
+
+
+def test_devices_are_parsed_on_access():
+    statuses = DeviceStatuses.from_json(RESPONSE, lazy=True)
+
+    assert statuses.lazy
+    assert len(statuses) == 3
+    assert statuses._by_id == {}
+    assert statuses["@11111a"].rssi == 59
+    assert list(statuses._by_id) == ["@11111a"]
+    assert statuses[2].value == 100
+    assert statuses["@11111a"] is statuses.get("@11111a")
+
+
+def test_membership_does_not_parse():
+    statuses = DeviceStatuses.from_json(RESPONSE, lazy=True)
+
+    assert "@11111b" in statuses
+    assert "success" not in statuses
+    assert "@missing" not in statuses
+    assert statuses.get("@missing") is None
+    with pytest.raises(KeyError):
+        statuses["@missing"]
+    assert statuses._by_id == {}
+
+
+def test_invalid_device_raises_on_access_only():
+    statuses = DeviceStatuses.from_json(RESPONSE, lazy=True)
+
+    assert statuses["@11111c"].value == 100
+    with pytest.raises(QSResponseParseError):
+        statuses["@11111b"]
+    with pytest.raises(QSResponseParseError):
+        _ = statuses.statuses
+
+
+def test_eager_parsing_raises_parse_error_for_invalid_device():
+    with pytest.raises(QSResponseParseError):
+        DeviceStatuses.from_json(RESPONSE)
+
+
+def test_by_class_and_iteration_in_lazy_mode():
+    valid = {k: v for k, v in RESPONSE.items() if k != "@11111b"}
+    statuses = DeviceStatuses.from_json(valid, lazy=True)
+
+    assert [s.device_id for s in statuses] == ["@11111a", "@11111c"]
+    assert [s.device_id for s in statuses.by_class(DeviceClass.relay)] == ["@11111c"]
+
+
+def test_client_lazy_parsing(mock_api_keys, mock_request):
+    client = QSClient("email", "master", lazy_parsing=True)
+    client.api_keys = mock_api_keys
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url(mock_api_keys.read_write_key),
+        json=RESPONSE,
+    )
+
+    statuses = client.get_all_device_status()
+
+    assert statuses.lazy
+    assert statuses["@11111a"].device_class == DeviceClass.dimmer
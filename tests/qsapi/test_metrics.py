@@ -0,0 +1,124 @@
+"""Tests for instrumentation of the Qwikswitch API client."""
+
+import json
+
+import pytest
+import requests
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.entities import ApiKeys
+from qwikswitchapi.exceptions import QSRequestError, QSRequestFailedError
+from qwikswitchapi.metrics import ClientMetrics, Histogram
+from qwikswitchapi.utility import UrlBuilder
+
+CONTROL_RESPONSE = {"success": True, "device": "@111111", "level": 50}
+API_KEYS = ApiKeys("read_key", "read_write_key")
+KEYS_RESPONSE = {"ok": 1, "r": "read_key", "rw": "read_write_key"}
+
+
+@pytest.fixture
+def metrics():
+    return ClientMetrics()
+
+
+@pytest.fixture
+def client(metrics):
+    return QSClient("email", "master", metrics=metrics)
+
+
+def control_url(level=50):
+    return UrlBuilder.build_control_url("read_write_key", "@111111", level)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 2, 3))
+    for value in (0.5, 1, 1.5, 2.5, 10):
+        histogram.observe(value)
+
+    assert histogram.count == 5
+    assert histogram.sum == 15.5
+    assert histogram.buckets() == [(1, 2), (2, 3), (3, 4), (float("inf"), 5)]
+
+
+def test_calls_are_measured(client, metrics, mock_request):
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), json=KEYS_RESPONSE)
+    mock_request.get(control_url(), json=CONTROL_RESPONSE)
+
+    client.control_device("@111111", 50)
+    client.control_device("@111111", 50)
+
+    assert set(metrics.endpoints) == {"generate_api_keys", "control_device"}
+    for name in ("latency", "network", "parse"):
+        assert metrics.histogram("control_device", name).count == 2
+        assert metrics.histogram("generate_api_keys", name).count == 1
+    assert metrics.bytes_received("control_device") == 2 * len(
+        json.dumps(CONTROL_RESPONSE)
+    )
+    assert metrics.errors("control_device") == {}
+
+
+def test_errors_are_counted_by_class(client, metrics, mock_request):
+    client.api_keys = API_KEYS
+    mock_request.get(control_url(50), json={"error": "INVALID LEVEL"})
+    mock_request.get(control_url(60), exc=requests.exceptions.ConnectTimeout)
+
+    with pytest.raises(QSRequestError):
+        client.control_device("@111111", 50)
+    with pytest.raises(QSRequestFailedError):
+        client.control_device("@111111", 60)
+    with pytest.raises(QSRequestFailedError):
+        client.control_device("@111111", 60)
+
+    assert metrics.errors("control_device") == {
+        "QSRequestError": 1,
+        "QSRequestFailedError": 2,
+    }
+    assert metrics.histogram("control_device", "latency").count == 3
+    assert metrics.histogram("control_device", "network").count == 1
+
+
+def test_export_as_plain_data(client, metrics, mock_request):
+    client.api_keys = API_KEYS
+    mock_request.get(control_url(), json=CONTROL_RESPONSE)
+    client.control_device("@111111", 50)
+
+    data = json.loads(json.dumps(metrics.to_dict()))
+
+    assert data["control_device"]["latency"]["count"] == 1
+    assert data["control_device"]["bytes_received"] > 0
+    assert data["control_device"]["errors"] == {}
+
+    metrics.reset()
+    assert metrics.to_dict() == {}
+
+
+def test_prometheus_collector(client, metrics, mock_request):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from qwikswitchapi.prometheus import PrometheusCollector  # noqa: PLC0415
+
+    client.api_keys = API_KEYS
+    mock_request.get(control_url(), json=CONTROL_RESPONSE)
+    mock_request.get(control_url(60), json={"error": "INVALID LEVEL"})
+    client.control_device("@111111", 50)
+    with pytest.raises(QSRequestError):
+        client.control_device("@111111", 60)
+
+    registry = prometheus_client.CollectorRegistry()
+    PrometheusCollector(metrics).register(registry)
+
+    assert (
+        registry.get_sample_value(
+            "qwikswitch_latency_seconds_count", {"endpoint": "control_device"}
+        )
+        == 2
+    )
+    assert (
+        registry.get_sample_value(
+            "qwikswitch_errors_total",
+            {"endpoint": "control_device", "error": "QSRequestError"},
+        )
+        == 1
+    )
+    assert registry.get_sample_value(
+        "qwikswitch_received_bytes_total", {"endpoint": "control_device"}
+    )
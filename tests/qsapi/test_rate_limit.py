@@ -0,0 +1,136 @@
+"""Tests for rate limiting requests to the Qwikswitch API."""
+
+import multiprocessing
+import time
+
+import pytest
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.deadline import Deadline
+from qwikswitchapi.exceptions import QSDeadlineExceededError
+from qwikswitchapi.ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+from qwikswitchapi.utility import UrlBuilder
+
+
+def test_bucket_allows_burst_then_paces(clock):
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    delays = [bucket.acquire() for _ in range(5)]
+
+    assert delays == [0, 0, 0, 0.5, 0.5]
+    assert clock.now == 1.0
+    assert bucket.acquired == 5
+    assert bucket.waits == 2
+    assert bucket.wait_time == 1.0
+    assert bucket.max_wait == 0.5
+
+
+def test_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.now += 10
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 1.0
+
+
+def test_reservations_queue_behind_each_other(clock):
+    sleeps = []
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=sleeps.append)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert sleeps == [1.0, 2.0]
+
+
+def test_wait_beyond_max_wait_takes_no_token(clock):
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+
+    with pytest.raises(QSDeadlineExceededError):
+        bucket.acquire(max_wait=0.5)
+
+    assert bucket.acquire(max_wait=1.0) == 1.0
+    assert bucket.acquired == 2
+
+
+def test_file_bucket_is_shared_by_instances(tmp_path, clock):
+    path = tmp_path / "bucket"
+    first = FileTokenBucket(path, rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+    second = FileTokenBucket(path, rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert first.acquire() == 0
+    assert second.acquire() == 0
+    assert first.acquire() == 1.0
+    assert second.acquire() == 1.0
+
+
+def test_client_waits_on_rate_limiter(authenticated_api_client, mock_request, clock):
+    sleeps = []
+    limiter = TokenBucket(rate=1, capacity=1, clock=clock, sleep=sleeps.append)
+    client = QSClient("email", "master", rate_limiter=limiter)
+    client.api_keys = authenticated_api_client.api_keys
+    mock_request.get(
+        UrlBuilder.build_control_url(client.api_keys.read_write_key, "@111111", 50),
+        json={"success": True, "device": "@111111", "level": 50},
+    )
+
+    for _ in range(3):
+        client.control_device("@111111", 50)
+
+    assert sleeps == [1.0, 2.0]
+    assert mock_request.call_count == 3
+
+
+def test_rate_limit_respects_deadline(authenticated_api_client, mock_request, clock):
+    limiter = TokenBucket(rate=0.1, capacity=1, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    client = QSClient("email", "master", rate_limiter=limiter)
+    client.api_keys = authenticated_api_client.api_keys
+
+    with pytest.raises(QSDeadlineExceededError):
+        client.control_device("@111111", 50, deadline=Deadline(5, clock=clock))
+    assert not mock_request.called
+
+
+def test_rate_limiter_requires_reserve():
+    class UnreservedLimiter(RateLimiter):
+        pass
+
+    with pytest.raises(TypeError, match="_reserve"):
+        UnreservedLimiter(1.0)
+
+
+def acquire_until(path, rate, capacity, end, acquired):
+    bucket = FileTokenBucket(path, rate=rate, capacity=capacity)
+    while time.time() < end:
+        bucket.acquire()
+    acquired.put(bucket.acquired)
+
+
+def test_file_bucket_is_shared_by_processes(tmp_path):
+    path = tmp_path / "bucket"
+    rate, capacity, duration = 50, 5, 1.0
+    acquired = multiprocessing.Queue()
+    start = time.time()
+    processes = [
+        multiprocessing.Process(
+            target=acquire_until,
+            args=(path, rate, capacity, start + duration, acquired),
+        )
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    grants = sum(acquired.get(timeout=30) for _ in processes)
+    for process in processes:
+        process.join(30)
+    elapsed = time.time() - start
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert grants <= rate * elapsed + capacity
+    assert grants >= rate * duration / 2
@@ -0,0 +1,243 @@
+"""Tests for retries and circuit breaking in the Qwikswitch API client."""
+
+import random
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.constants import CircuitState
+from qwikswitchapi.exceptions import (
+    QSCircuitOpenError,
+    QSRequestError,
+    QSRequestFailedError,
+    QSServerError,
+)
+from qwikswitchapi.retry import CircuitBreaker, RetryBudget, RetryPolicy
+from qwikswitchapi.utility import ResponseParser, UrlBuilder
+
+SUCCESS = {"json": {"success": True, "device": "@111111", "level": 50}}
+TIMEOUT = {"exc": requests.exceptions.ConnectTimeout}
+UNAVAILABLE = {"status_code": 503, "text": "Service Unavailable"}
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+def make_client(mock_api_keys, **kwargs):  # noqa: ANN003
+    client = QSClient("email", "master", **kwargs)
+    client.api_keys = mock_api_keys
+    return client
+
+
+def mock_control(mock_request, mock_api_keys, responses):
+    mock_request.get(
+        UrlBuilder.build_control_url(mock_api_keys.read_write_key, "@111111", 50),
+        responses,
+    )
+
+
+def test_failed_request_is_retried(mock_api_keys, mock_request, sleeps):
+    mock_control(mock_request, mock_api_keys, [TIMEOUT, TIMEOUT, SUCCESS])
+    client = make_client(
+        mock_api_keys, retry_policy=RetryPolicy(max_attempts=3, sleep=sleeps.append)
+    )
+
+    assert client.control_device("@111111", 50).level == 50
+    assert mock_request.call_count == 3
+    assert len(sleeps) == 2
+
+
+def test_retries_stop_after_max_attempts(mock_api_keys, mock_request, sleeps):
+    mock_control(mock_request, mock_api_keys, [TIMEOUT, TIMEOUT, SUCCESS])
+    client = make_client(
+        mock_api_keys, retry_policy=RetryPolicy(max_attempts=2, sleep=sleeps.append)
+    )
+
+    with pytest.raises(QSRequestFailedError):
+        client.control_device("@111111", 50)
+    assert mock_request.call_count == 2
+
+
+def test_logical_errors_are_not_retried(mock_api_keys, mock_request, sleeps):
+    mock_control(mock_request, mock_api_keys, [{"json": {"error": "INVALID LEVEL"}}])
+    client = make_client(mock_api_keys, retry_policy=RetryPolicy(sleep=sleeps.append))
+
+    with pytest.raises(QSRequestError):
+        client.control_device("@111111", 50)
+    assert mock_request.call_count == 1
+
+
+@pytest.mark.parametrize("status_code", [429, 502, 503, 504])
+def test_server_errors_are_retried(mock_api_keys, mock_request, sleeps, status_code):
+    error = {"status_code": status_code, "text": "unavailable"}
+    mock_control(mock_request, mock_api_keys, [error, error, SUCCESS])
+    client = make_client(
+        mock_api_keys, retry_policy=RetryPolicy(max_attempts=3, sleep=sleeps.append)
+    )
+
+    assert client.control_device("@111111", 50).level == 50
+    assert mock_request.call_count == 3
+
+
+def test_server_errors_remain_request_errors(mock_api_keys, mock_request):
+    mock_control(mock_request, mock_api_keys, [UNAVAILABLE])
+    client = make_client(mock_api_keys)
+
+    with pytest.raises(QSServerError) as info:
+        client.control_device("@111111", 50)
+    assert isinstance(info.value, QSRequestError)
+
+
+def test_retry_budget_limits_retries(mock_api_keys, mock_request, sleeps):
+    mock_control(mock_request, mock_api_keys, [TIMEOUT])
+    budget = RetryBudget(ratio=0.0, min_tokens=1)
+    client = make_client(
+        mock_api_keys,
+        retry_policy=RetryPolicy(max_attempts=5, budget=budget, sleep=sleeps.append),
+    )
+
+    with pytest.raises(QSRequestFailedError):
+        client.control_device("@111111", 50)
+    assert mock_request.call_count == 2
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, rng=random.Random(1))
+
+    delays = [policy.backoff(attempt) for attempt in range(1, 8)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) == len(delays)
+    assert policy.should_retry(1, remaining=0.0) is None
+
+
+def test_circuit_opens_and_fails_fast(mock_api_keys, mock_request, clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    mock_control(mock_request, mock_api_keys, [TIMEOUT, TIMEOUT, SUCCESS])
+    client = make_client(mock_api_keys, circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(QSRequestFailedError):
+            client.control_device("@111111", 50)
+
+    assert breaker.state is CircuitState.open
+    with pytest.raises(QSCircuitOpenError):
+        client.control_device("@111111", 50)
+    assert mock_request.call_count == 2
+
+    clock.now = 10
+    assert breaker.state is CircuitState.half_open
+    assert client.control_device("@111111", 50).level == 50
+    assert breaker.state is CircuitState.closed
+
+
+def test_server_errors_open_circuit(mock_api_keys, mock_request):
+    breaker = CircuitBreaker(failure_threshold=3)
+    mock_control(mock_request, mock_api_keys, [UNAVAILABLE])
+    client = make_client(mock_api_keys, circuit_breaker=breaker)
+
+    for _ in range(3):
+        with pytest.raises(QSServerError):
+            client.control_device("@111111", 50)
+
+    assert breaker.state is CircuitState.open
+    with pytest.raises(QSCircuitOpenError):
+        client.control_device("@111111", 50)
+    assert mock_request.call_count == 3
+
+
+def test_failed_probe_reopens_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    breaker.before_request()
+    with pytest.raises(QSCircuitOpenError):
+        breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.open
+
+
+def test_open_circuit_is_not_retried(mock_api_keys, mock_request, sleeps):
+    breaker = CircuitBreaker(failure_threshold=1)
+    mock_control(mock_request, mock_api_keys, [TIMEOUT])
+    client = make_client(
+        mock_api_keys,
+        retry_policy=RetryPolicy(max_attempts=5, sleep=sleeps.append),
+        circuit_breaker=breaker,
+    )
+
+    with pytest.raises(QSCircuitOpenError):
+        client.control_device("@111111", 50)
+    assert mock_request.call_count == 1
+
+
+def test_retry_after_is_minimum_backoff(mock_api_keys, mock_request, sleeps):
+    throttled = {
+        "status_code": 429,
+        "text": "slow down",
+        "headers": {"Retry-After": "7"},
+    }
+    mock_control(mock_request, mock_api_keys, [throttled, SUCCESS])
+    client = make_client(
+        mock_api_keys, retry_policy=RetryPolicy(max_attempts=2, sleep=sleeps.append)
+    )
+
+    assert client.control_device("@111111", 50).level == 50
+    assert sleeps == [7.0]
+
+
+def test_retry_after_beyond_deadline_is_not_retried(
+    mock_api_keys, mock_request, sleeps
+):
+    throttled = {
+        "status_code": 429,
+        "text": "slow down",
+        "headers": {"Retry-After": "60"},
+    }
+    mock_control(mock_request, mock_api_keys, [throttled, SUCCESS])
+    client = make_client(mock_api_keys, retry_policy=RetryPolicy(sleep=sleeps.append))
+
+    with pytest.raises(QSServerError) as info:
+        client.control_device("@111111", 50, deadline=5)
+    assert info.value.retry_after == 60.0
+    assert sleeps == []
+
+
+def test_key_generation_outage_is_retried(mock_request, sleeps):
+    mock_request.post(
+        UrlBuilder.build_generate_api_keys_url(),
+        [UNAVAILABLE, {"json": {"ok": 1, "r": "r", "rw": "rw"}}],
+    )
+    client = QSClient(
+        "email", "master", retry_policy=RetryPolicy(max_attempts=2, sleep=sleeps.append)
+    )
+
+    assert client.generate_api_keys().read_write_key == "rw"
+    assert len(sleeps) == 1
+
+
+def test_key_generation_outage_opens_circuit(mock_request):
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), **UNAVAILABLE)
+    breaker = CircuitBreaker(failure_threshold=2)
+    client = QSClient("email", "master", circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(QSServerError):
+            client.generate_api_keys()
+    assert breaker.state is CircuitState.open
+
+
+def test_retry_after_accepts_http_dates():
+    header = formatdate(time.time() + 30, usegmt=True)
+    resp = SimpleNamespace(headers={"Retry-After": header})
+
+    assert 28 <= ResponseParser.get_retry_after(resp) <= 30
+    assert ResponseParser.get_retry_after(SimpleNamespace(headers={})) is None
@@ -0,0 +1,149 @@
+"""Tests for the device status cache of the Qwikswitch API client."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from qwikswitchapi.cache import StatusCache
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.entities import DeviceStatuses
+from qwikswitchapi.exceptions import QSRequestError
+from qwikswitchapi.utility import UrlBuilder
+
+
+class CountingFetch:
+    """A fetch function counting its calls, optionally blocking on a gate."""
+
+    def __init__(self, gate=None) -> None:
+        """Initialize the counter."""
+        self.calls = 0
+        self.gate = gate
+
+    def __call__(self) -> DeviceStatuses:
+        """Return an empty snapshot."""
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait()
+        return DeviceStatuses([])
+
+
+def test_fresh_snapshot_is_served_from_cache(clock):
+    cache = StatusCache(ttl=1.0, clock=clock)
+    fetch = CountingFetch()
+
+    first = cache.get(fetch)
+    clock.now = 0.5
+    second = cache.get(fetch)
+
+    assert first is second
+    assert fetch.calls == 1
+
+
+def test_expired_snapshot_is_refetched(clock):
+    cache = StatusCache(ttl=1.0, clock=clock)
+    fetch = CountingFetch()
+
+    first = cache.get(fetch)
+    clock.now = 1.5
+
+    assert cache.get(fetch) is not first
+    assert fetch.calls == 2
+
+
+def test_concurrent_refreshes_are_coalesced():
+    cache = StatusCache(ttl=10.0)
+    gate = threading.Event()
+    fetch = CountingFetch(gate)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(cache.get, fetch) for _ in range(8)]
+        gate.set()
+        results = {id(f.result()) for f in futures}
+
+    assert fetch.calls == 1
+    assert len(results) == 1
+
+
+def test_stale_snapshot_is_served_while_revalidating(clock):
+    cache = StatusCache(ttl=1.0, stale_ttl=5.0, clock=clock)
+    stale = cache.get(CountingFetch())
+    clock.now = 2.0
+    gate = threading.Event()
+    fetch = CountingFetch(gate)
+
+    assert cache.get(fetch) is stale
+    assert cache.get(fetch) is stale
+    gate.set()
+
+    with cache._condition:
+        cache._condition.wait_for(lambda: not cache._refreshing, timeout=5)
+    assert cache.get(fetch) is not stale
+    assert fetch.calls == 1
+
+
+def test_invalidate_discards_in_flight_refresh(clock):
+    cache = StatusCache(ttl=1.0, stale_ttl=5.0, clock=clock)
+    cache.get(CountingFetch())
+    clock.now = 2.0
+    gate = threading.Event()
+    cache.get(CountingFetch(gate))
+
+    cache.invalidate()
+    gate.set()
+    fetch = CountingFetch()
+    cache.get(fetch)
+
+    assert fetch.calls == 1
+
+
+def test_failed_refresh_is_raised_and_releases_waiters():
+    cache = StatusCache(ttl=1.0)
+
+    def fail():
+        msg = "failed"
+        raise QSRequestError(msg)
+
+    with pytest.raises(QSRequestError):
+        cache.get(fail)
+    assert cache.get(CountingFetch()) is not None
+
+
+def test_failed_revalidation_releases_later_callers(caplog, clock):
+    cache = StatusCache(ttl=1.0, stale_ttl=5.0, clock=clock)
+    stale = cache.get(CountingFetch())
+    clock.now = 2.0
+
+    def fail():
+        msg = "r"
+        raise KeyError(msg)
+
+    assert cache.get(fail) is stale
+    with cache._condition:
+        assert cache._condition.wait_for(lambda: not cache._refreshing, timeout=5)
+
+    clock.now = 10.0
+    fetch = CountingFetch()
+    assert cache.get(fetch) is not stale
+    assert fetch.calls == 1
+    assert "Failed to revalidate" in caplog.text
+
+
+def test_client_invalidates_cache_after_control(mock_api_keys, mock_request):
+    client = QSClient("email", "master", status_cache=StatusCache(ttl=60.0))
+    client.api_keys = mock_api_keys
+    mock_request.get(
+        UrlBuilder.build_get_all_device_status_url(mock_api_keys.read_write_key),
+        json={"success": True},
+    )
+    mock_request.get(
+        UrlBuilder.build_control_url(mock_api_keys.read_write_key, "@111111", 10),
+        json={"success": True, "device": "@111111", "level": 10},
+    )
+
+    client.get_all_device_status()
+    client.get_all_device_status()
+    client.control_device("@111111", 10)
+    client.get_all_device_status()
+
+    assert mock_request.call_count == 3
@@ -0,0 +1,69 @@
+"""Tests for the columnar device status history."""
+
+import pytest
+
+from qwikswitchapi.entities import DeviceStatus
+from qwikswitchapi.history import StatusHistory
+
+
+@pytest.fixture(params=[False, True], ids=["array", "numpy"])
+def history(request):
+    if request.param:
+        pytest.importorskip("numpy")
+    return StatusHistory(capacity=4, use_numpy=request.param)
+
+
+def record(history, timestamp, **devices):  # noqa: ANN003
+    history.record(
+        [
+            DeviceStatus(device_id, "RELAY QS-D-S5", "v3.3", str(epoch), rssi, value)
+            for device_id, (epoch, rssi, value) in devices.items()
+        ],
+        timestamp=timestamp,
+    )
+
+
+def test_records_columns_per_device(history):
+    record(history, 1.0, a=(100, 50, 0), b=(200, 60, 100))
+    record(history, 2.0, a=(101, 40, 10), b=(200, 60, 100))
+
+    assert sorted(history.device_ids) == ["a", "b"]
+    assert history.samples("a") == 2
+    assert list(history.column("a", "epoch")) == [100, 101]
+    assert list(history.column("a", "rssi")) == [50, 40]
+    assert list(history.column("b", "value")) == [100, 100]
+
+
+def test_ring_buffer_keeps_most_recent_samples(history):
+    for i in range(6):
+        record(history, float(i), a=(i, i, i))
+
+    assert history.samples("a") == 4
+    assert list(history.column("a", "timestamp")) == [2.0, 3.0, 4.0, 5.0]
+    assert list(history.column("a", "value")) == [2, 3, 4, 5]
+
+
+def test_rssi_queries_over_window(history):
+    for i, rssi in enumerate([80, 20, 50, 60]):
+        record(history, float(i), a=(i, rssi, 0))
+
+    assert history.mean_rssi("a") == 52.5
+    assert history.min_rssi("a") == 20
+    assert history.mean_rssi("a", since=2.0) == 55
+    assert history.min_rssi("a", since=2.0) == 50
+    assert history.mean_rssi("a", since=10.0) is None
+    assert history.min_rssi("a", since=10.0) is None
+
+
+def test_value_change_count(history):
+    for i, value in enumerate([0, 100, 100, 0, 0, 50]):
+        record(history, float(i), a=(i, 50, value))
+
+    assert history.value_changes("a") == 2
+    assert history.value_changes("a", since=4.0) == 1
+
+
+def test_unknown_device(history):
+    assert history.samples("missing") == 0
+    with pytest.raises(KeyError):
+        history.column("missing", "rssi")
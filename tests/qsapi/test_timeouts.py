@@ -0,0 +1,139 @@
+"""Tests for request timeouts and call deadlines in the Qwikswitch API client."""
+
+import pytest
+import requests
+
+from qwikswitchapi.cache import StatusCache
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.constants import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
+from qwikswitchapi.deadline import Deadline
+from qwikswitchapi.exceptions import QSDeadlineExceededError, QSRequestFailedError
+from qwikswitchapi.retry import RetryPolicy
+from qwikswitchapi.utility import UrlBuilder
+
+SUCCESS = {"success": True, "device": "@111111", "level": 50}
+
+
+def control_url(mock_api_keys):
+    return UrlBuilder.build_control_url(mock_api_keys.read_write_key, "@111111", 50)
+
+
+def test_default_timeouts_are_sent(
+    authenticated_api_client, mock_api_keys, mock_request
+):
+    mock_request.get(control_url(mock_api_keys), json=SUCCESS)
+
+    authenticated_api_client.control_device("@111111", 50)
+
+    assert mock_request.last_request.timeout == (
+        DEFAULT_CONNECT_TIMEOUT,
+        DEFAULT_READ_TIMEOUT,
+    )
+
+
+def test_timeouts_are_configurable(mock_api_keys, mock_request):
+    mock_request.get(control_url(mock_api_keys), json=SUCCESS)
+    client = QSClient("email", "master", connect_timeout=1, read_timeout=2)
+    client.api_keys = mock_api_keys
+
+    client.control_device("@111111", 50)
+    assert mock_request.last_request.timeout == (1, 2)
+
+    client.control_device("@111111", 50, timeout=0.5)
+    assert mock_request.last_request.timeout == 0.5
+
+
+def test_deadline_clamps_timeouts(
+    authenticated_api_client, mock_api_keys, mock_request, clock
+):
+    mock_request.get(control_url(mock_api_keys), json=SUCCESS)
+    deadline = Deadline(3, clock=clock)
+    clock.advance(1)
+
+    authenticated_api_client.control_device("@111111", 50, deadline=deadline)
+
+    assert mock_request.last_request.timeout == (2, 2)
+
+
+def test_expired_deadline_sends_no_request(
+    authenticated_api_client, mock_api_keys, mock_request, clock
+):
+    mock_request.get(control_url(mock_api_keys), json=SUCCESS)
+    deadline = Deadline(1, clock=clock)
+    clock.advance(1)
+
+    with pytest.raises(QSDeadlineExceededError):
+        authenticated_api_client.control_device("@111111", 50, deadline=deadline)
+    assert not mock_request.called
+
+
+def test_deadline_spans_retries(mock_api_keys, mock_request, clock):
+    mock_request.get(control_url(mock_api_keys), exc=requests.exceptions.ReadTimeout)
+    client = QSClient(
+        "email",
+        "master",
+        retry_policy=RetryPolicy(max_attempts=10, base_delay=1, sleep=clock.advance),
+    )
+    client.api_keys = mock_api_keys
+
+    with pytest.raises(QSRequestFailedError):
+        client.control_device("@111111", 50, deadline=Deadline(3, clock=clock))
+
+    assert 1 <= mock_request.call_count < 10
+    assert clock.now < 3
+
+
+def test_deadline_spans_authentication(mock_api_keys, mock_request, clock):
+
+    def generate_keys(_request, _context):
+        clock.advance(2)
+        return {
+            "ok": 1,
+            "r": mock_api_keys.read_key,
+            "rw": mock_api_keys.read_write_key,
+        }
+
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), json=generate_keys)
+    mock_request.get(control_url(mock_api_keys), json=SUCCESS)
+    client = QSClient("email", "master")
+
+    with pytest.raises(QSDeadlineExceededError):
+        client.control_device("@111111", 50, deadline=Deadline(2, clock=clock))
+
+    assert client.api_keys == mock_api_keys
+    assert mock_request.call_count == 1
+
+
+def test_default_deadline_applies_to_each_call(mock_api_keys, mock_request):
+    mock_request.get(control_url(mock_api_keys), json=SUCCESS)
+    client = QSClient("email", "master", deadline=4)
+    client.api_keys = mock_api_keys
+
+    client.control_device("@111111", 50)
+
+    connect, read = mock_request.last_request.timeout
+    assert connect <= 4
+    assert read <= 4
+
+
+def test_deadline_bounds_wait_for_another_authentication(mock_request):
+    client = QSClient("email", "master")
+    client._auth_lock.acquire()
+    try:
+        with pytest.raises(QSDeadlineExceededError, match="API keys"):
+            client.control_device("@111111", 50, deadline=0.05)
+    finally:
+        client._auth_lock.release()
+
+    assert not mock_request.called
+
+
+def test_deadline_bounds_wait_for_another_cache_refresh(mock_api_keys, mock_request):
+    client = QSClient("email", "master", status_cache=StatusCache(ttl=1.0))
+    client.api_keys = mock_api_keys
+    client.status_cache._refreshing = True
+
+    with pytest.raises(QSDeadlineExceededError, match="device statuses"):
+        client.get_all_device_status(deadline=0.05)
+
+    assert not mock_request.called
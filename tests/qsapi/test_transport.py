@@ -0,0 +1,60 @@
+"""Tests for the pooled HTTP transport of the Qwikswitch API client."""
+
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from qwikswitchapi.client import QSClient
+from qwikswitchapi.entities import ApiKeys
+from qwikswitchapi.transport import HttpTransport, Transport
+from qwikswitchapi.utility import UrlBuilder
+
+
+def test_adapter_is_configured_with_pool_settings():
+    transport = HttpTransport(pool_connections=3, pool_maxsize=7, max_retries=2)
+    adapter = transport.session.get_adapter("https://qwikswitch.com/api/v1/")
+
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert adapter.max_retries.total == 2
+
+
+def test_same_session_is_used_for_all_calls(mock_request):
+    session = requests.Session()
+    client = QSClient("email", "master", transport=HttpTransport(session=session))
+    response = {"ok": 1, "r": "aaaa-bbbb-cccc-dddd", "rw": "1111-2222-3333-4444"}
+    mock_request.post(UrlBuilder.build_generate_api_keys_url(), json=response)
+    mock_request.get(
+        UrlBuilder.build_control_url(response["rw"], "@112331", 50),
+        json={"success": True, "device": "@112331", "level": 50},
+    )
+
+    client.control_device("@112331", 50)
+
+    assert client.transport.session is session
+    assert mock_request.call_count == 2
+
+
+def test_client_closes_owned_transport():
+    with QSClient("email", "master") as client:
+        client._transport = MagicMock()
+
+    client._transport.close.assert_called_once()
+
+
+def test_client_does_not_close_injected_transport():
+    transport = MagicMock()
+    with QSClient("email", "master", transport=transport) as client:
+        client.api_keys = ApiKeys("read", "read_write")
+
+    transport.close.assert_not_called()
+
+
+def test_transport_requires_get_and_post():
+    class GetOnlyTransport(Transport):
+        def get(self, url, timeout=None, *, deadline=None):
+            return None
+
+    with pytest.raises(TypeError, match="post"):
+        GetOnlyTransport()